@@ -15,6 +15,7 @@ from django.db import transaction
 
 from wagtail.models import Locale, Page
 from wagtail_localize.models import Translation, TranslationSource
+from wagtail_localize_dashboard.signals import suspend_progress_updates
 
 from home.models import ArticlePage, ProductPage
 
@@ -293,28 +294,30 @@ class Command(BaseCommand):
 
             # Create translations for each target locale
             translations_for_page = 0
-            for locale in target_locales:
-                try:
-                    # Check if translation already exists
-                    translation, created = Translation.objects.get_or_create(
-                        source=translation_source,
-                        target_locale=locale,
-                    )
-
-                    if created:
-                        # Create the translated page instance
-                        translation.save_target(publish=True)
-                        total_translations += 1
-                        translations_for_page += 1
+            # Recalculate progress once per page, not on every signal
+            with suspend_progress_updates():
+                for locale in target_locales:
+                    try:
+                        # Check if translation already exists
+                        translation, created = Translation.objects.get_or_create(
+                            source=translation_source,
+                            target_locale=locale,
+                        )
 
-                except Exception as e:
-                    self.stdout.write(
-                        self.style.WARNING(
-                            f"  Could not create translation for {source_page} to {locale.language_code}: {e}"
+                        if created:
+                            # Create the translated page instance
+                            translation.save_target(publish=True)
+                            total_translations += 1
+                            translations_for_page += 1
+
+                    except Exception as e:
+                        self.stdout.write(
+                            self.style.WARNING(
+                                f"  Could not create translation for {source_page} to {locale.language_code}: {e}"
+                            )
                         )
-                    )
-                    sys.stdout.flush()
-                    continue
+                        sys.stdout.flush()
+                        continue
 
             # Progress reporting - every 5 pages
             if (page_idx + 1) % 5 == 0:
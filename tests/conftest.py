@@ -6,13 +6,31 @@ These fixtures provide reusable test setup for all test files.
 
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
 
 import pytest
 from wagtail.models import Locale, Page, Site
 
+from wagtail_localize_dashboard.calculators import clear_segment_totals_cache
+from wagtail_localize_dashboard.signals import _pending
+
 User = get_user_model()
 
 
+@pytest.fixture(autouse=True)
+def clear_segment_totals():
+    """Start every test without cached segment totals."""
+    clear_segment_totals_cache()
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_pending_updates():
+    """Start every test without progress updates queued by another one."""
+    # Flush hooks captured by another test's mocks may still be alive
+    _pending.__dict__.clear()
+
+
 @pytest.fixture
 def root_page(db):
     """Create and return the Wagtail root page."""
@@ -0,0 +1,458 @@
+"""
+Tests for the progress calculators.
+
+Every calculator runs through the same equivalence suite, which compares it
+with wagtail-localize's own ``Translation.get_progress()``.
+"""
+
+import importlib.util
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+import pytest
+from wagtail.models import Page
+from wagtail_localize.models import (
+    StringSegment,
+    StringTranslation,
+    Translation,
+    TranslationSource,
+)
+from wagtail_localize_dashboard.calculators import (
+    BaseProgressCalculator,
+    DefaultProgressCalculator,
+    NumPyProgressCalculator,
+    SQLAggregateProgressCalculator,
+    clear_segment_totals_cache,
+    get_progress_calculator,
+    get_segment_totals,
+)
+from wagtail_localize_dashboard.models import TranslationProgress
+from wagtail_localize_dashboard.utils import (
+    create_translation_progress,
+    get_original_objects,
+    get_progress_drift,
+    rebuild_all_progress,
+)
+
+pytestmark = [pytest.mark.django_db]
+
+requires_numpy = pytest.mark.skipif(
+    importlib.util.find_spec("numpy") is None, reason="NumPy is not installed"
+)
+
+CALCULATORS = [
+    DefaultProgressCalculator,
+    SQLAggregateProgressCalculator,
+    pytest.param(NumPyProgressCalculator, marks=requires_numpy),
+]
+
+
+@pytest.fixture
+def translations(home_page, locale_en, locale_de, locale_fr):
+    """Create translations with a mix of translated, failed and empty segments."""
+    translations = []
+    for index in range(3):
+        page = Page(
+            title=f"Calculator Page {index}",
+            slug=f"calculator-page-{index}",
+            locale=locale_en,
+        )
+        home_page.add_child(instance=page)
+
+        source, _ = TranslationSource.get_or_create_from_instance(page)
+        for locale in [locale_de, locale_fr]:
+            translations.append(
+                Translation.objects.create(source=source, target_locale=locale)
+            )
+
+        segments = list(source.stringsegment_set.order_by("order"))
+
+        # Translate the first `index` segments into German; the second one
+        # failed validation, so it doesn't count
+        for position, segment in enumerate(segments[:index]):
+            StringTranslation.objects.create(
+                translation_of=segment.string,
+                locale=locale_de,
+                context=segment.context,
+                data=f"Deutsch {index}",
+                has_error=position == 1,
+            )
+
+        # A French translation of the first string, but in another context
+        StringTranslation.objects.create(
+            translation_of=segments[0].string,
+            locale=locale_fr,
+            context=segments[1].context,
+            data=f"Français {index}",
+        )
+
+    return translations
+
+
+@pytest.mark.parametrize("calculator_class", CALCULATORS)
+class TestCalculatorEquivalence:
+    """Equivalence suite every calculator must pass."""
+
+    def test_get_progress_matches_wagtail_localize(
+        self, calculator_class, translations
+    ):
+        """Test that single translations match Translation.get_progress()."""
+        calculator = calculator_class()
+
+        for translation in translations:
+            assert calculator.get_progress(translation) == translation.get_progress()
+
+    def test_batch_matches_wagtail_localize(self, calculator_class, translations):
+        """Test that batches match Translation.get_progress() for every pair."""
+        expected = {
+            (translation.source_id, translation.target_locale_id): (
+                translation.get_progress()
+            )
+            for translation in translations
+        }
+
+        assert calculator_class().get_batch_progress(expected.keys()) == expected
+        assert len(set(expected.values())) > 1
+
+    def test_batch_of_one(self, calculator_class, translations):
+        """Test that a batch of one pair matches the whole batch."""
+        calculator = calculator_class()
+        pairs = [
+            (translation.source_id, translation.target_locale_id)
+            for translation in translations
+        ]
+        batch = calculator.get_batch_progress(pairs)
+
+        for pair in pairs:
+            assert calculator.get_batch_progress([pair]) == {pair: batch[pair]}
+
+    def test_translation_without_context(self, calculator_class, translations):
+        """Test that a StringTranslation whose context was deleted is not counted."""
+        StringTranslation.objects.filter(
+            pk=StringTranslation.objects.filter(has_error=False).first().pk
+        ).update(context=None)
+        expected = {
+            (translation.source_id, translation.target_locale_id): (
+                translation.get_progress()
+            )
+            for translation in translations
+        }
+
+        assert calculator_class().get_batch_progress(expected.keys()) == expected
+
+    def test_source_without_segments(self, calculator_class, translations):
+        """Test that a source with no segments has no segments to translate."""
+        translation = translations[0]
+        translation.source.stringsegment_set.all().delete()
+
+        pair = (translation.source_id, translation.target_locale_id)
+        assert calculator_class().get_batch_progress([pair]) == {pair: (0, 0)}
+
+    def test_empty_batch(self, calculator_class, db):
+        """Test that an empty batch returns nothing and runs no queries."""
+        with CaptureQueriesContext(connection) as queries:
+            assert calculator_class().get_batch_progress([]) == {}
+
+        assert len(queries.captured_queries) == 0
+
+    def test_rebuild_matches_default(self, calculator_class, translations):
+        """Test that a rebuild stores the same records as the default calculator."""
+        rebuild_all_progress()
+        expected = set(
+            TranslationProgress.objects.values_list(
+                "source_page_id",
+                "translated_page_id",
+                "percent_translated",
+                "total_segments",
+                "translated_segments",
+            )
+        )
+
+        TranslationProgress.objects.all().delete()
+        with override_settings(
+            WAGTAIL_LOCALIZE_DASHBOARD_PROGRESS_CALCULATOR=calculator_class
+        ):
+            rebuild_all_progress()
+
+        assert (
+            set(
+                TranslationProgress.objects.values_list(
+                    "source_page_id",
+                    "translated_page_id",
+                    "percent_translated",
+                    "total_segments",
+                    "translated_segments",
+                )
+            )
+            == expected
+        )
+        assert get_original_objects(Page).count() == len(translations) // 2
+
+
+class TestCalculatorQueries:
+    """Tests for the number of queries each calculator runs."""
+
+    @pytest.mark.parametrize(
+        "calculator_class, query_count",
+        [
+            (DefaultProgressCalculator, 2),
+            (SQLAggregateProgressCalculator, 1),
+            pytest.param(NumPyProgressCalculator, 2, marks=requires_numpy),
+        ],
+    )
+    def test_batch_query_count(self, calculator_class, query_count, translations):
+        """Test that a batch takes a fixed number of queries."""
+        pairs = [
+            (translation.source_id, translation.target_locale_id)
+            for translation in translations
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            calculator_class().get_batch_progress(pairs)
+
+        assert len(queries.captured_queries) == query_count
+
+    def test_cached_totals_take_one_query(self, translations):
+        """Test that cached totals leave only the translated segment count."""
+        calculator = DefaultProgressCalculator()
+        pairs = [
+            (translation.source_id, translation.target_locale_id)
+            for translation in translations
+        ]
+        expected = calculator.get_batch_progress(pairs)
+
+        with CaptureQueriesContext(connection) as queries:
+            assert calculator.get_batch_progress(pairs) == expected
+
+        assert len(queries.captured_queries) == 1
+
+
+class TestSegmentTotals:
+    """Tests for the segment totals cache."""
+
+    def get_sources(self, translations):
+        """Map the source ids of the translations to their last_updated_at."""
+        return {
+            translation.source_id: translation.source.last_updated_at
+            for translation in translations
+        }
+
+    def count_queries(self, sources):
+        """Get the segment totals and the number of queries it took."""
+        with CaptureQueriesContext(connection) as queries:
+            totals = get_segment_totals(sources)
+        return totals, len(queries.captured_queries)
+
+    def test_totals_are_cached(self, translations):
+        """Test that totals are counted once and then read from the cache."""
+        sources = self.get_sources(translations)
+
+        totals, query_count = self.count_queries(sources)
+        assert query_count == 1
+        assert totals == {
+            source_id: StringSegment.objects.filter(source_id=source_id).count()
+            for source_id in sources
+        }
+        assert self.count_queries(sources) == (totals, 0)
+
+        # Nothing is kept in process by default
+        cache.clear()
+        assert self.count_queries(sources) == (totals, 1)
+
+    @override_settings(WAGTAIL_LOCALIZE_DASHBOARD_SEGMENT_TOTALS_CACHE_SIZE=10)
+    def test_lru_in_front_of_cache(self, translations):
+        """Test that totals are read from the in-process LRU, then from the cache."""
+        sources = self.get_sources(translations)
+        totals, _ = self.count_queries(sources)
+
+        cache.clear()
+        assert self.count_queries(sources) == (totals, 0)
+        clear_segment_totals_cache()
+        assert self.count_queries(sources) == (totals, 1)
+
+    def test_resynced_source_is_recounted(self, translations):
+        """Test that a new last_updated_at is never served an old total."""
+        source = translations[0].source
+        get_segment_totals({source.pk: source.last_updated_at})
+
+        source.stringsegment_set.order_by("order").first().delete()
+        source.last_updated_at = timezone.now()
+        source.save()
+
+        totals, query_count = self.count_queries({source.pk: source.last_updated_at})
+        assert query_count == 1
+        assert totals == {source.pk: source.stringsegment_set.count()}
+
+    def test_segments_refreshed_after_resync(
+        self, translations, django_capture_on_commit_callbacks
+    ):
+        """Test a total counted between saving a source and refreshing its segments."""
+        source = translations[0].source
+        segment = source.stringsegment_set.order_by("order").first()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            # wagtail-localize saves the new last_updated_at first
+            source.last_updated_at = timezone.now()
+            source.save()
+            sources = {source.pk: source.last_updated_at}
+            get_segment_totals(sources)
+
+            StringSegment.objects.create(
+                source=source, string=segment.string, context=segment.context, order=100
+            )
+
+        assert self.count_queries(sources) == (
+            {source.pk: source.stringsegment_set.count()},
+            1,
+        )
+
+    def test_source_without_segments(self, translations):
+        """Test that a source with no segments is cached with a total of 0."""
+        source = translations[0].source
+        source.stringsegment_set.all().delete()
+
+        assert self.count_queries({source.pk: source.last_updated_at}) == (
+            {source.pk: 0},
+            1,
+        )
+        assert self.count_queries({source.pk: source.last_updated_at}) == (
+            {source.pk: 0},
+            0,
+        )
+
+    @override_settings(
+        WAGTAIL_LOCALIZE_DASHBOARD_SEGMENT_TOTALS_CACHE=None,
+        WAGTAIL_LOCALIZE_DASHBOARD_SEGMENT_TOTALS_CACHE_SIZE=1,
+    )
+    def test_lru_size(self, translations):
+        """Test that the LRU only keeps the most recently used totals."""
+        first, second = list(self.get_sources(translations).items())[:2]
+
+        for source, query_count in [(first, 1), (first, 0), (second, 1), (first, 1)]:
+            assert self.count_queries(dict([source]))[1] == query_count
+
+    @override_settings(
+        WAGTAIL_LOCALIZE_DASHBOARD_SEGMENT_TOTALS_CACHE=None,
+        WAGTAIL_LOCALIZE_DASHBOARD_SEGMENT_TOTALS_CACHE_SIZE=0,
+    )
+    def test_disabled(self, translations):
+        """Test that totals are always counted without any cache."""
+        sources = self.get_sources(translations)
+
+        for _ in range(2):
+            assert self.count_queries(sources)[1] == 1
+
+
+class TestGetProgressCalculator:
+    """Tests for get_progress_calculator."""
+
+    def test_default(self, db):
+        """Test that the default calculator is used by default."""
+        assert isinstance(get_progress_calculator(), DefaultProgressCalculator)
+
+    @override_settings(
+        WAGTAIL_LOCALIZE_DASHBOARD_PROGRESS_CALCULATOR=(
+            "wagtail_localize_dashboard.calculators.SQLAggregateProgressCalculator"
+        )
+    )
+    def test_dotted_path(self, db):
+        """Test that the setting can be a dotted path."""
+        assert isinstance(get_progress_calculator(), SQLAggregateProgressCalculator)
+
+    @override_settings(
+        WAGTAIL_LOCALIZE_DASHBOARD_PROGRESS_CALCULATOR=SQLAggregateProgressCalculator
+    )
+    def test_class(self, db):
+        """Test that the setting can be a class."""
+        assert isinstance(get_progress_calculator(), SQLAggregateProgressCalculator)
+
+    def test_numpy_must_be_installed(self, db):
+        """Test that the NumPy calculator explains how to install NumPy."""
+        with patch.dict("sys.modules", {"numpy": None}):
+            with pytest.raises(ImproperlyConfigured, match=r"\[numpy\]"):
+                NumPyProgressCalculator()
+
+    @override_settings(
+        WAGTAIL_LOCALIZE_DASHBOARD_REBUILD_PROGRESS_CALCULATOR=(
+            SQLAggregateProgressCalculator
+        )
+    )
+    def test_rebuild_setting(self, db):
+        """Test that a setting name can be given, falling back to the default."""
+        assert isinstance(
+            get_progress_calculator("REBUILD_PROGRESS_CALCULATOR"),
+            SQLAggregateProgressCalculator,
+        )
+        assert isinstance(get_progress_calculator(), DefaultProgressCalculator)
+
+        with override_settings(
+            WAGTAIL_LOCALIZE_DASHBOARD_REBUILD_PROGRESS_CALCULATOR=None
+        ):
+            assert isinstance(
+                get_progress_calculator("REBUILD_PROGRESS_CALCULATOR"),
+                DefaultProgressCalculator,
+            )
+
+    def test_base_requires_batch_progress(self, db):
+        """Test that subclasses must implement get_batch_progress."""
+        with pytest.raises(NotImplementedError):
+            BaseProgressCalculator().get_batch_progress([(1, 1)])
+
+
+class RecordingCalculator(DefaultProgressCalculator):
+    """Default calculator that records the pairs of every batch."""
+
+    batches = []
+
+    def get_batch_progress(self, translation_pairs):
+        translation_pairs = set(translation_pairs)
+        self.batches.append(translation_pairs)
+        return super().get_batch_progress(translation_pairs)
+
+
+class TestRebuildProgressCalculator:
+    """Tests for the calculator used by rebuilds."""
+
+    @pytest.fixture(autouse=True)
+    def rebuild_calculator(self, settings):
+        """Rebuild with the recording calculator."""
+        settings.WAGTAIL_LOCALIZE_DASHBOARD_REBUILD_PROGRESS_CALCULATOR = (
+            RecordingCalculator
+        )
+        RecordingCalculator.batches.clear()
+
+    def test_rebuild_uses_rebuild_calculator(self, translations):
+        """Test that rebuilds count segments with REBUILD_PROGRESS_CALCULATOR."""
+        for translation in translations:
+            translation.save_target(publish=True)
+        RecordingCalculator.batches.clear()
+
+        rebuild_all_progress()
+
+        assert set().union(*RecordingCalculator.batches) == {
+            (translation.source_id, translation.target_locale_id)
+            for translation in translations
+        }
+
+    def test_drift_uses_rebuild_calculator(self, translations):
+        """Test that drift reports calculate like the rebuild they preview."""
+        get_progress_drift()
+
+        assert RecordingCalculator.batches
+
+    def test_single_pages_use_progress_calculator(self, translations):
+        """Test that other updates keep using PROGRESS_CALCULATOR."""
+        for translation in translations:
+            translation.save_target(publish=True)
+        RecordingCalculator.batches.clear()
+
+        create_translation_progress(translations[0].source.get_source_instance())
+
+        assert TranslationProgress.objects.exists()
+        assert not RecordingCalculator.batches
@@ -0,0 +1,271 @@
+"""Tests for the progress update executors."""
+
+import threading
+from unittest.mock import patch
+
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+import pytest
+from wagtail.models import Locale, Page
+from wagtail_localize.models import StringSegment, Translation, TranslationSource
+from wagtail_localize_dashboard.executors import (
+    BaseProgressUpdateExecutor,
+    QueueTableProgressUpdateExecutor,
+    SynchronousProgressUpdateExecutor,
+    ThreadPoolProgressUpdateExecutor,
+    get_progress_update_executor,
+)
+from wagtail_localize_dashboard.models import (
+    TranslationProgress,
+    TranslationProgressQueue,
+)
+from wagtail_localize_dashboard.signals import (
+    flush_progress_updates,
+    queue_progress_update,
+)
+
+UPDATES = {"relink": set(), "progress": {"key": None}, "strings": set()}
+
+
+class RecordingExecutor(BaseProgressUpdateExecutor):
+    """Executor standing in for a task backend, recording what it is given."""
+
+    submitted = []
+
+    def submit(self, updates):
+        self.submitted.append(updates)
+
+
+@pytest.fixture
+def thread_pool(settings):
+    """Create a thread pool executor with one worker and room for one update."""
+    settings.WAGTAIL_LOCALIZE_DASHBOARD_PROGRESS_UPDATE_WORKERS = 1
+    settings.WAGTAIL_LOCALIZE_DASHBOARD_PROGRESS_UPDATE_QUEUE_SIZE = 1
+    executor = ThreadPoolProgressUpdateExecutor()
+    yield executor
+    executor.pool.shutdown(wait=True)
+
+
+class TestGetProgressUpdateExecutor:
+    """Tests for selecting the executor."""
+
+    def test_default_is_synchronous(self):
+        """Test that updates are applied in the request by default."""
+        assert isinstance(
+            get_progress_update_executor(), SynchronousProgressUpdateExecutor
+        )
+
+    def test_executor_is_shared(self, settings):
+        """Test that every flush uses the same executor, and thread pool."""
+        settings.WAGTAIL_LOCALIZE_DASHBOARD_PROGRESS_UPDATE_EXECUTOR = (
+            "wagtail_localize_dashboard.executors.ThreadPoolProgressUpdateExecutor"
+        )
+
+        executor = get_progress_update_executor()
+
+        assert isinstance(executor, ThreadPoolProgressUpdateExecutor)
+        assert get_progress_update_executor() is executor
+
+    @pytest.mark.django_db
+    def test_custom_executor_receives_flushed_updates(self, settings):
+        """Test that a custom executor is given the queued updates."""
+        settings.WAGTAIL_LOCALIZE_DASHBOARD_PROGRESS_UPDATE_EXECUTOR = (
+            "tests.test_executors.RecordingExecutor"
+        )
+        RecordingExecutor.submitted.clear()
+
+        # The test transaction never commits, so the queue is flushed by hand
+        queue_progress_update("key", locale_id=1)
+        queue_progress_update("other", relink=True)
+        flush_progress_updates()
+
+        assert RecordingExecutor.submitted == [
+            {
+                "relink": {"other"},
+                "progress": {"key": {1}, "other": None},
+                "strings": set(),
+            }
+        ]
+
+
+class TestSynchronousProgressUpdateExecutor:
+    """Tests for applying updates in the committing thread."""
+
+    @patch("wagtail_localize_dashboard.executors.apply_progress_updates")
+    def test_applies_updates_before_returning(self, apply_updates):
+        """Test that the updates are applied before submit returns."""
+        assert SynchronousProgressUpdateExecutor().submit(UPDATES) is None
+
+        apply_updates.assert_called_once_with(UPDATES)
+
+    @patch.object(transaction, "on_commit", side_effect=lambda func: func())
+    def test_stores_progress(self, _mock_on_commit, db):
+        """Test that saving a translation stores its progress before returning."""
+        en_locale, _ = Locale.objects.get_or_create(language_code="en")
+        de_locale, _ = Locale.objects.get_or_create(language_code="de")
+        # Only pages below the home pages are tracked
+        home = Page(title="Test Home", slug="test-home", locale=en_locale)
+        Page.objects.get(depth=1).add_child(instance=home)
+        home.copy_for_translation(de_locale).save()
+        page = Page(title="Test Page", slug="test-page", locale=en_locale)
+        home.add_child(instance=page)
+
+        source, _ = TranslationSource.get_or_create_from_instance(page)
+        Translation.objects.create(
+            source=source, target_locale=de_locale, enabled=True
+        ).save_target(user=None, publish=True)
+
+        assert TranslationProgress.objects.filter(source_page=page).exists()
+
+
+class TestThreadPoolProgressUpdateExecutor:
+    """Tests for applying updates in background threads."""
+
+    @patch("wagtail_localize_dashboard.executors.apply_progress_updates")
+    def test_applies_updates_in_worker_thread(self, apply_updates, thread_pool):
+        """Test that the updates are applied off the calling thread."""
+        threads = []
+        apply_updates.side_effect = lambda updates: threads.append(
+            threading.current_thread()
+        )
+
+        future = thread_pool.submit(UPDATES)
+        future.result()
+
+        apply_updates.assert_called_once_with(UPDATES)
+        assert threads[0] is not threading.current_thread()
+        assert threads[0].name.startswith("wagtail-localize-dashboard")
+
+    @patch("wagtail_localize_dashboard.executors.apply_progress_updates")
+    def test_full_pool_applies_updates_in_caller_thread(
+        self, apply_updates, thread_pool
+    ):
+        """Test that updates beyond the queue size are not queued."""
+        started = threading.Event()
+        release = threading.Event()
+        threads = []
+
+        def apply(updates):
+            threads.append(threading.current_thread())
+            if len(threads) == 1:
+                started.set()
+                release.wait(5)
+
+        apply_updates.side_effect = apply
+
+        future = thread_pool.submit(UPDATES)
+        started.wait(5)
+        assert thread_pool.submit(UPDATES) is None
+        assert threads[1] is threading.current_thread()
+
+        release.set()
+        future.result()
+
+        # The slot is free again once the worker is done
+        thread_pool.submit(UPDATES).result()
+        assert threads[2] is not threading.current_thread()
+
+    @patch("wagtail_localize_dashboard.executors.apply_progress_updates")
+    def test_errors_are_logged(self, apply_updates, thread_pool, caplog):
+        """Test that a failed update is logged and frees its slot."""
+        apply_updates.side_effect = [RuntimeError("boom"), None]
+
+        thread_pool.submit(UPDATES).result()
+
+        assert "Error applying progress updates: boom" in caplog.text
+        assert thread_pool.submit(UPDATES) is not None
+
+
+@pytest.mark.django_db
+class TestQueueTableProgressUpdateExecutor:
+    """Tests for leaving updates to the queue processor."""
+
+    @pytest.fixture(autouse=True)
+    def queue_table(self, settings):
+        """Select the queue table executor."""
+        settings.WAGTAIL_LOCALIZE_DASHBOARD_PROGRESS_UPDATE_EXECUTOR = (
+            "wagtail_localize_dashboard.executors.QueueTableProgressUpdateExecutor"
+        )
+
+    def create_translated_page(self):
+        """Create and translate a page, returning the page."""
+        en_locale, _ = Locale.objects.get_or_create(language_code="en")
+        de_locale, _ = Locale.objects.get_or_create(language_code="de")
+        page = Page(title="Test Page", slug="test-page", locale=en_locale)
+        Page.objects.get(depth=1).add_child(instance=page)
+
+        source, _ = TranslationSource.get_or_create_from_instance(page)
+        Translation.objects.create(
+            source=source, target_locale=de_locale, enabled=True
+        ).save_target(user=None, publish=True)
+        return page
+
+    def test_saves_only_queue_markers(self, django_capture_on_commit_callbacks):
+        """Test that saving a translation queues its page instead of calculating."""
+        with django_capture_on_commit_callbacks(execute=True):
+            page = self.create_translated_page()
+
+        assert not TranslationProgress.objects.exists()
+        assert set(
+            TranslationProgressQueue.objects.values_list("translation_key", flat=True)
+        ) == {page.translation_key}
+
+    def test_markers_are_written_once_on_commit(
+        self, django_capture_on_commit_callbacks
+    ):
+        """Test that the markers of a transaction are written with one insert."""
+        page = self.create_translated_page()
+        TranslationProgressQueue.objects.all().delete()
+        segments = list(
+            StringSegment.objects.filter(source__object_id=page.translation_key)
+        )
+        locale_id = page.get_translations().get().locale_id
+
+        with CaptureQueriesContext(connection) as queries:
+            with django_capture_on_commit_callbacks(execute=True):
+                queue_progress_update(page.translation_key, relink=True)
+                queue_progress_update(page.translation_key, locale_id=locale_id)
+                for segment in segments:
+                    queue_progress_update(
+                        string_translation=(
+                            segment.string_id,
+                            segment.context_id,
+                            locale_id,
+                        )
+                    )
+
+                assert not TranslationProgressQueue.objects.exists()
+
+        assert len(queries.captured_queries) == 2
+        assert TranslationProgressQueue.objects.count() == 1 + len(segments)
+
+    def test_rollback_drops_markers(self, django_capture_on_commit_callbacks):
+        """Test that a rolled back transaction queues nothing."""
+        with django_capture_on_commit_callbacks(execute=True):
+            with pytest.raises(RuntimeError):
+                with transaction.atomic():
+                    self.create_translated_page()
+                    raise RuntimeError("rollback")
+
+        assert not TranslationProgressQueue.objects.exists()
+
+    @patch(
+        "wagtail_localize_dashboard.executors.queue_translation_progress",
+        side_effect=RuntimeError("boom"),
+    )
+    def test_failed_write_is_logged(
+        self, _queue_progress, caplog, django_capture_on_commit_callbacks
+    ):
+        """Test that markers which could not be written are logged."""
+        with django_capture_on_commit_callbacks(execute=True):
+            queue_progress_update("key", locale_id=1)
+
+        assert "Error in flush_progress_updates: boom" in caplog.text
+
+    @patch("wagtail_localize_dashboard.executors.queue_translation_progress")
+    def test_submit_queues_updates(self, queue_progress):
+        """Test that the updates are written as markers."""
+        assert QueueTableProgressUpdateExecutor().submit(UPDATES) is None
+
+        queue_progress.assert_called_once_with(UPDATES)
@@ -2,12 +2,19 @@
 Tests for management commands.
 """
 
+import json
 from io import StringIO
+from unittest.mock import ANY, patch
 
-from django.core.management import call_command
+from django.core.management import CommandError, call_command
 
 import pytest
-from wagtail_localize_dashboard.models import TranslationProgress
+from wagtail_localize_dashboard.models import (
+    RebuildCheckpoint,
+    TranslationProgress,
+    TranslationProgressQueue,
+)
+from wagtail_localize_dashboard.utils import queue_translation_progress
 
 
 @pytest.mark.django_db
@@ -77,6 +84,7 @@ class TestRebuildTranslationProgress:
         output = out.getvalue()
         # Should complete without error (may show "0 orphaned records deleted")
         assert "Successfully rebuilt" in output or "successfully rebuilt" in output
+        assert "0 orphaned records deleted" in output
 
     def test_command_without_clean_orphans_flag(self, test_page):
         """Test that command works without --clean-orphans flag.
@@ -185,3 +193,403 @@ class TestRebuildTranslationProgress:
 
         # Count should be stable
         assert initial_count == final_count
+
+    def test_command_with_workers(self, test_page_with_translations):
+        """Test that --workers uses the parallel rebuild."""
+        out = StringIO()
+        with patch(
+            "wagtail_localize_dashboard.management.commands."
+            "rebuild_translation_progress.rebuild_all_progress_parallel",
+            return_value={"pages": 3, "errors": 0},
+        ) as mock_parallel:
+            call_command("rebuild_translation_progress", workers=4, stdout=out)
+
+        mock_parallel.assert_called_once_with(
+            4,
+            batch_size=None,
+            checkpoint="rebuild_translation_progress",
+            resume=False,
+            progress_callback=ANY,
+            since=None,
+            stale_only=False,
+            locale=None,
+            root_page=None,
+            translation_key=None,
+        )
+        output = out.getvalue()
+        assert "with 4 workers" in output
+        assert "Pages processed: 3" in output
+
+    def test_command_resume_without_checkpoint(self, test_page_with_translations):
+        """Test that --resume without a checkpoint runs a full rebuild."""
+        TranslationProgress.objects.all().delete()
+
+        out = StringIO()
+        call_command("rebuild_translation_progress", resume=True, stdout=out)
+
+        output = out.getvalue()
+        assert "No checkpoint found" in output
+        assert TranslationProgress.objects.filter(
+            source_page_id=test_page_with_translations.id
+        ).exists()
+        assert RebuildCheckpoint.objects.count() == 0
+
+    def test_command_resume_from_checkpoint(self, test_page_with_translations):
+        """Test that --resume skips pages before the checkpoint."""
+        TranslationProgress.objects.all().delete()
+        RebuildCheckpoint.objects.create(
+            name="rebuild_translation_progress",
+            last_page_id=test_page_with_translations.id,
+        )
+
+        out = StringIO()
+        call_command("rebuild_translation_progress", resume=True, stdout=out)
+
+        output = out.getvalue()
+        assert f"from page {test_page_with_translations.id + 1}" in output
+        assert "Pages processed: 0" in output
+        assert TranslationProgress.objects.count() == 0
+        assert RebuildCheckpoint.objects.count() == 0
+
+    def test_command_resume_worker_checkpoints(self, test_page_with_translations):
+        """Test that unfinished worker ranges are resumed in parallel."""
+        RebuildCheckpoint.objects.create(
+            name="rebuild_translation_progress:0",
+            min_page_id=test_page_with_translations.id,
+            max_page_id=test_page_with_translations.id,
+        )
+
+        with patch(
+            "wagtail_localize_dashboard.management.commands."
+            "rebuild_translation_progress.rebuild_all_progress_parallel",
+            return_value={"pages": 1, "errors": 0},
+        ) as mock_parallel:
+            call_command("rebuild_translation_progress", resume=True, stdout=StringIO())
+
+        mock_parallel.assert_called_once_with(
+            1,
+            batch_size=None,
+            checkpoint="rebuild_translation_progress",
+            resume=True,
+            progress_callback=ANY,
+            since=None,
+            stale_only=False,
+            locale=None,
+            root_page=None,
+            translation_key=None,
+        )
+
+    def test_command_scoped_run_keeps_full_checkpoint(
+        self, test_page_with_translations
+    ):
+        """Test that a run with filters neither resumes nor resets a full run."""
+        RebuildCheckpoint.objects.create(
+            name="rebuild_translation_progress",
+            last_page_id=test_page_with_translations.id,
+        )
+
+        out = StringIO()
+        call_command(
+            "rebuild_translation_progress", "--stale-only", "--resume", stdout=out
+        )
+
+        output = out.getvalue()
+        assert "No checkpoint found" in output
+        assert "An interrupted rebuild with other filters can be resumed: " in output
+        checkpoint = RebuildCheckpoint.objects.get()
+        assert checkpoint.name == "rebuild_translation_progress"
+        assert checkpoint.last_page_id == test_page_with_translations.id
+
+    def test_command_mismatched_checkpoint(self, test_page_with_translations):
+        """Test that a checkpoint recorded with other filters is an error."""
+        RebuildCheckpoint.objects.create(
+            name="rebuild_translation_progress", scope={"locale": "fr"}
+        )
+
+        with pytest.raises(CommandError, match="other filters"):
+            call_command("rebuild_translation_progress", resume=True, stdout=StringIO())
+
+    def test_command_stale_only(self, test_page_with_translations):
+        """Test that --stale-only skips pages that are up to date."""
+        call_command("rebuild_translation_progress", stdout=StringIO())
+
+        out = StringIO()
+        call_command("rebuild_translation_progress", "--stale-only", stdout=out)
+
+        assert "Pages processed: 0" in out.getvalue()
+
+    def test_command_since(self, test_page_with_translations):
+        """Test that --since accepts a date and rebuilds changed pages."""
+        out = StringIO()
+        call_command(
+            "rebuild_translation_progress", "--since", "2000-01-01", stdout=out
+        )
+
+        assert "Pages processed: 1" in out.getvalue()
+
+    def test_command_since_invalid(self, db):
+        """Test that an invalid --since value is rejected."""
+        with pytest.raises(CommandError):
+            call_command(
+                "rebuild_translation_progress",
+                "--since",
+                "yesterday",
+                stdout=StringIO(),
+            )
+
+    def test_command_clean_orphans_deletes_records(self, test_page_with_translations):
+        """Test that --clean-orphans reports and deletes orphaned records."""
+        de_page = test_page_with_translations.get_translations().first()
+        TranslationProgress.objects.create(
+            source_page=de_page, translated_page=test_page_with_translations
+        )
+
+        out = StringIO()
+        call_command("rebuild_translation_progress", clean_orphans=True, stdout=out)
+
+        assert "1 orphaned records deleted" in out.getvalue()
+        assert not TranslationProgress.objects.filter(source_page=de_page).exists()
+
+    def test_command_reports_peak_memory(self, test_page_with_translations):
+        """Test that the peak memory is reported and checked."""
+        out = StringIO()
+        with patch(
+            "wagtail_localize_dashboard.management.commands."
+            "rebuild_translation_progress.get_peak_memory_mb",
+            return_value=300.0,
+        ):
+            call_command("rebuild_translation_progress", max_memory=256, stdout=out)
+
+        output = out.getvalue()
+        assert "Peak memory: 300.0 MB" in output
+        assert "exceeded --max-memory (256.0 MB)" in output
+
+    def test_command_with_locale(self, test_page_with_translations, locale_de):
+        """Test that --locale only rebuilds translations in that locale."""
+        TranslationProgress.objects.all().delete()
+
+        out = StringIO()
+        call_command("rebuild_translation_progress", locale="de", stdout=out)
+
+        assert "Pages processed: 1" in out.getvalue()
+        assert set(
+            TranslationProgress.objects.values_list(
+                "translated_page__locale__language_code", flat=True
+            )
+        ) == {"de"}
+
+    def test_command_with_unknown_locale(self, db):
+        """Test that an unknown --locale is rejected."""
+        with pytest.raises(CommandError, match="does not exist"):
+            call_command("rebuild_translation_progress", locale="xx", stdout=StringIO())
+
+    def test_command_with_root_page(self, test_page_with_translations, home_page):
+        """Test that --root-page limits the rebuild to a subtree."""
+        out = StringIO()
+        call_command(
+            "rebuild_translation_progress",
+            root_page=test_page_with_translations.id,
+            stdout=out,
+        )
+
+        assert "Pages processed: 1" in out.getvalue()
+
+    def test_command_with_translation_key(self, test_page_with_translations):
+        """Test that --translation-key limits the rebuild to one page."""
+        out = StringIO()
+        call_command(
+            "rebuild_translation_progress",
+            "--translation-key",
+            str(test_page_with_translations.translation_key),
+            stdout=out,
+        )
+
+        assert "Pages processed: 1" in out.getvalue()
+
+    def test_command_dry_run(self, test_page_with_translations):
+        """Test that --dry-run reports drift without writing."""
+        out = StringIO()
+        call_command("rebuild_translation_progress", dry_run=True, stdout=out)
+
+        output = out.getvalue()
+        assert "Dry run" in output
+        assert "Missing records: 2" in output
+        assert "Progress cache has drifted" in output
+        assert not TranslationProgress.objects.exists()
+
+    def test_command_dry_run_diff(self, test_page_with_translations):
+        """Test that --diff lists stale records and a delta histogram."""
+        call_command("rebuild_translation_progress", stdout=StringIO())
+        progress = TranslationProgress.objects.order_by("id").first()
+        fresh = progress.percent_translated
+        progress.percent_translated = fresh + 30 if fresh < 70 else fresh - 30
+        progress.save()
+
+        out = StringIO()
+        call_command(
+            "rebuild_translation_progress", dry_run=True, diff=True, stdout=out
+        )
+
+        output = out.getvalue()
+        assert (
+            f"stale    source={progress.source_page_id} "
+            f"translated={progress.translated_page_id}" in output
+        )
+        assert "Stale records: 1" in output
+        assert " 26-50        1 " in output
+        assert TranslationProgress.objects.get(id=progress.id).percent_translated != (
+            fresh
+        )
+
+    def test_command_dry_run_up_to_date(self, test_page_with_translations):
+        """Test that an up to date cache is reported as such."""
+        call_command("rebuild_translation_progress", stdout=StringIO())
+
+        out = StringIO()
+        call_command("rebuild_translation_progress", dry_run=True, stdout=out)
+
+        assert "Progress cache is up to date!" in out.getvalue()
+
+    def test_command_diff_requires_dry_run(self, db):
+        """Test that --diff is rejected without --dry-run."""
+        with pytest.raises(CommandError, match="--dry-run"):
+            call_command("rebuild_translation_progress", diff=True, stdout=StringIO())
+
+    def test_command_reports_batch_progress(self, test_page_with_translations):
+        """Test that a progress line with throughput and ETA is written per batch."""
+        out = StringIO()
+        call_command("rebuild_translation_progress", batch_size=1, stdout=out)
+
+        output = out.getvalue()
+        assert "1 pages to rebuild" in output
+        assert "1/1 pages (100.0%)" in output
+        assert "pages/s" in output
+        assert "rows/s" in output
+        assert "queries/page" in output
+        assert "ETA 0:00:00" in output
+
+    def test_command_json(self, test_page_with_translations):
+        """Test that --json writes only the final stats to stdout."""
+        out = StringIO()
+        err = StringIO()
+        call_command("rebuild_translation_progress", json=True, stdout=out, stderr=err)
+
+        stats = json.loads(out.getvalue())
+        assert stats["pages"] == 1
+        assert stats["errors"] == 0
+        assert stats["total_pages"] == 1
+        assert stats["rows_written"] == 2
+        assert stats["queries"] > 0
+        assert stats["workers"] == 1
+        assert set(stats["timings"]) == {
+            "clean_orphans",
+            "select",
+            "calculate",
+            "write",
+            "total",
+        }
+        for key in ["pages_per_second", "rows_per_second", "queries_per_page"]:
+            assert key in stats
+        assert "Pages processed: 1" in err.getvalue()
+
+    def test_command_dry_run_json(self, test_page_with_translations):
+        """Test that --dry-run --json writes the drift counts."""
+        out = StringIO()
+        call_command(
+            "rebuild_translation_progress",
+            dry_run=True,
+            json=True,
+            stdout=out,
+            stderr=StringIO(),
+        )
+
+        stats = json.loads(out.getvalue())
+        assert stats["dry_run"] is True
+        assert stats["missing"] == 2
+        assert stats["stale"] == 0
+
+
+@pytest.mark.django_db
+class TestProcessTranslationProgressQueue:
+    """Tests for the process_translation_progress_queue management command."""
+
+    def queue(self, page):
+        """Queue a page for every locale."""
+        queue_translation_progress(
+            {
+                "relink": set(),
+                "progress": {page.translation_key: None},
+                "strings": set(),
+            }
+        )
+
+    def test_command_processes_queue(self, test_page_with_translations):
+        """Test that the queued pages get progress and the queue is emptied."""
+        TranslationProgress.objects.all().delete()
+        self.queue(test_page_with_translations)
+
+        out = StringIO()
+        call_command("process_translation_progress_queue", stdout=out)
+
+        output = out.getvalue()
+        assert "Markers processed: 1" in output
+        assert "Successfully processed the progress queue" in output
+        assert not TranslationProgressQueue.objects.exists()
+        assert TranslationProgress.objects.filter(
+            source_page=test_page_with_translations
+        ).exists()
+
+    def test_command_runs_batches_until_empty(self):
+        """Test that a one-shot run processes every batch, then exits."""
+        with patch(
+            "wagtail_localize_dashboard.management.commands."
+            "process_translation_progress_queue.process_translation_progress_queue",
+            side_effect=[2, 2, 1, 0],
+        ) as process:
+            out = StringIO()
+            call_command(
+                "process_translation_progress_queue", "--batch-size", "2", stdout=out
+            )
+
+        assert process.call_count == 4
+        process.assert_called_with(2)
+        assert "Markers processed: 5" in out.getvalue()
+        assert "Batches: 3" in out.getvalue()
+
+    def test_command_loop_waits_for_markers(self):
+        """Test that --loop sleeps when the queue is empty instead of exiting."""
+        with (
+            patch(
+                "wagtail_localize_dashboard.management.commands."
+                "process_translation_progress_queue.process_translation_progress_queue",
+                side_effect=[1, 0, 3, KeyboardInterrupt],
+            ),
+            patch("time.sleep") as sleep,
+        ):
+            out = StringIO()
+            call_command(
+                "process_translation_progress_queue",
+                "--loop",
+                "--interval",
+                "0.5",
+                stdout=out,
+            )
+
+        sleep.assert_called_once_with(0.5)
+        assert "Markers processed: 4" in out.getvalue()
+
+    def test_command_reports_failed_batches(self, test_page_with_translations):
+        """Test that a failed batch is reported and stays queued."""
+        self.queue(test_page_with_translations)
+
+        with patch(
+            "wagtail_localize_dashboard.utils.update_translation_keys_progress",
+            side_effect=RuntimeError("boom"),
+        ):
+            out = StringIO()
+            err = StringIO()
+            call_command("process_translation_progress_queue", stdout=out, stderr=err)
+
+        assert "Error processing queue: boom" in err.getvalue()
+        assert "Completed with 1 errors" in out.getvalue()
+        assert TranslationProgressQueue.objects.count() == 1
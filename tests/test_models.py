@@ -1,9 +1,14 @@
 """Tests for models in wagtail-localize-dashboard."""
 
+from uuid import uuid4
+
 from django.urls import reverse
 
 import pytest
-from wagtail_localize_dashboard.models import TranslationProgress
+from wagtail_localize_dashboard.models import (
+    TranslationProgress,
+    TranslationProgressQueue,
+)
 
 pytestmark = [pytest.mark.django_db]
 
@@ -36,6 +41,8 @@ class TestTranslationProgress:
             source_page=test_page,
             translated_page=de_page,
             percent_translated=75,
+            total_segments=4,
+            translated_segments=3,
         )
 
         result = progress.to_dict()
@@ -43,6 +50,8 @@ class TestTranslationProgress:
         assert isinstance(result, dict)
         assert result["locale"] == "de"
         assert result["percent_translated"] == 75
+        assert result["total_segments"] == 4
+        assert result["translated_segments"] == 3
         assert result["edit_url"] == reverse(
             "wagtailadmin_pages:edit", args=[de_page.id]
         )
@@ -135,3 +144,28 @@ class TestTranslationProgress:
         # Most recent should be first
         assert records[0].id == progress2.id
         assert records[1].id == progress1.id
+
+
+class TestTranslationProgressQueue:
+    """Tests for the TranslationProgressQueue model."""
+
+    def test_get_dedupe_key(self):
+        """Test that keys and strings get distinct keys per locale."""
+        translation_key = uuid4()
+
+        assert (
+            TranslationProgressQueue(translation_key=translation_key).get_dedupe_key()
+            == f"key:{translation_key}:"
+        )
+        assert (
+            TranslationProgressQueue(
+                translation_key=translation_key, locale_id=2
+            ).get_dedupe_key()
+            == f"key:{translation_key}:2"
+        )
+        assert (
+            TranslationProgressQueue(
+                string_id=5, context_id=7, locale_id=2
+            ).get_dedupe_key()
+            == "string:5:7:2"
+        )
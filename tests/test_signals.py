@@ -1,5 +1,6 @@
 """Tests for signal handlers in wagtail-localize-dashboard."""
 
+import threading
 from unittest.mock import patch
 
 import polib
@@ -8,14 +9,36 @@ from django.contrib.auth import get_user_model
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.core.management import call_command
 from django.db import transaction
+from django.db.models.deletion import Collector
+from django.db.models.signals import post_save
 from django.test import override_settings
 from django.urls import reverse
 from django.utils import timezone
-from wagtail.models import Locale, Page
-from wagtail_localize.models import StringTranslation, Translation, TranslationSource
+from wagtail.models import Locale, Page, get_page_models
+from wagtail_localize.models import (
+    StringSegment,
+    StringTranslation,
+    Translation,
+    TranslationSource,
+)
 
 from tests.models import SampleSnippet
-from wagtail_localize_dashboard.models import TranslationProgress
+from wagtail_localize_dashboard.models import (
+    TranslationProgress,
+    TranslationSourceLink,
+)
+from wagtail_localize_dashboard.signals import (
+    connect_page_signals,
+    flush_progress_updates,
+    get_pending_updates,
+    page_saved_handler,
+    queue_progress_update,
+    suspend_progress_updates,
+)
+from wagtail_localize_dashboard.utils import (
+    calculate_percent,
+    create_translation_progress,
+)
 
 pytestmark = [
     pytest.mark.django_db,
@@ -39,19 +62,26 @@ def page_with_translation(db):
     # Get root page
     root = Page.objects.get(depth=1)
 
+    # Create a home page at depth=2, translated into every locale the tests
+    # translate into, as only the pages below it are tracked
+    home = Page(title="Test Home", slug="test-home", locale=en_locale)
+    root.add_child(instance=home)
+    for locale in [de_locale, Locale.objects.get_or_create(language_code="fr")[0]]:
+        home.copy_for_translation(locale).save()
+
     # Create a test page
     page = Page(
         title="Test Page",
         slug="test-page",
         locale=en_locale,
     )
-    root.add_child(instance=page)
+    home.add_child(instance=page)
 
     return {
         "en_page": page,
         "en_locale": en_locale,
         "de_locale": de_locale,
-        "root": root,
+        "home": home,
     }
 
 
@@ -184,6 +214,353 @@ def test_deleting_string_translation_updates_progress(
     assert progress.percent_translated <= percent_before
 
 
+@pytest.fixture
+def shared_string(page_with_translation):
+    """Translate two pages into German, the second reusing a segment of the first."""
+    de_locale = page_with_translation["de_locale"]
+    pages = [page_with_translation["en_page"]]
+    pages.append(
+        page_with_translation["home"].add_child(
+            instance=Page(
+                title="Other Page",
+                slug="other-page",
+                locale=page_with_translation["en_locale"],
+            )
+        )
+    )
+
+    sources = []
+    for page in pages:
+        source, _ = TranslationSource.get_or_create_from_instance(page)
+        translation = Translation.objects.create(
+            source=source, target_locale=de_locale, enabled=True
+        )
+        translation.save_target(user=None, publish=True)
+        sources.append(source)
+
+    # The same string and context in both sources, and twice in the second
+    segment = sources[0].stringsegment_set.order_by("order").first()
+    for order in [100, 101]:
+        StringSegment.objects.create(
+            source=sources[1],
+            string=segment.string,
+            context=segment.context,
+            order=order,
+        )
+
+    return {"pages": pages, "segment": segment, "de_locale": de_locale}
+
+
+def get_progress(pages):
+    """Get the stored (percent, total, translated) of each page's translation."""
+    return {
+        progress.source_page_id: (
+            progress.percent_translated,
+            progress.total_segments,
+            progress.translated_segments,
+        )
+        for progress in TranslationProgress.objects.filter(source_page__in=pages)
+    }
+
+
+@patch.object(transaction, "on_commit", side_effect=lambda func: func())
+def test_translating_shared_string_updates_every_page(_mock_on_commit, shared_string):
+    """Test that a string used by several pages updates all of them."""
+    en_page, other_page = shared_string["pages"]
+    segment = shared_string["segment"]
+    create_translation_progress(en_page)
+    create_translation_progress(other_page)
+    before = get_progress([en_page, other_page])
+
+    string_translation = StringTranslation.objects.create(
+        translation_of=segment.string,
+        locale=shared_string["de_locale"],
+        context=segment.context,
+        data="Geteilter Inhalt",
+    )
+
+    after = get_progress([en_page, other_page])
+    assert after[en_page.id][2] == before[en_page.id][2] + 1
+    assert after[other_page.id][2] == before[other_page.id][2] + 2
+
+    string_translation.delete()
+
+    assert get_progress([en_page, other_page]) == before
+
+
+@patch.object(transaction, "on_commit", side_effect=lambda func: func())
+def test_shared_string_updates_pages_in_one_batch(_mock_on_commit, shared_string):
+    """Test that the affected pages are updated together."""
+    segment = shared_string["segment"]
+    # Apply what the fixture queued, as its transaction never commits
+    flush_progress_updates()
+
+    with patch(
+        "wagtail_localize_dashboard.utils.get_batch_progress", return_value={}
+    ) as get_batch_progress:
+        StringTranslation.objects.create(
+            translation_of=segment.string,
+            locale=shared_string["de_locale"],
+            context=segment.context,
+            data="Geteilter Inhalt",
+        )
+
+    get_batch_progress.assert_called_once()
+    (pages,) = get_batch_progress.call_args.args
+    assert {page.id for page in pages} == {page.id for page in shared_string["pages"]}
+    assert [locale.pk for locale in get_batch_progress.call_args.kwargs["locales"]] == [
+        shared_string["de_locale"].pk
+    ]
+
+
+def test_transaction_recalculates_each_page_once(
+    page_with_translation, django_capture_on_commit_callbacks
+):
+    """Test that the signals of one transaction are applied together."""
+    en_page = page_with_translation["en_page"]
+    de_locale = page_with_translation["de_locale"]
+    translation_source, _ = TranslationSource.get_or_create_from_instance(en_page)
+    translation = Translation.objects.create(
+        source=translation_source, target_locale=de_locale, enabled=True
+    )
+    translation.save_target(user=None, publish=True)
+    flush_progress_updates()
+
+    with patch(
+        "wagtail_localize_dashboard.utils.update_translation_keys_progress"
+    ) as update_progress:
+        with django_capture_on_commit_callbacks(execute=True):
+            en_page.save()
+            translation.save()
+            for segment in translation_source.stringsegment_set.all()[:2]:
+                StringTranslation.objects.create(
+                    translation_of=segment.string,
+                    locale=de_locale,
+                    context=segment.context,
+                    data="Deutscher Inhalt",
+                )
+
+    update_progress.assert_called_once_with({en_page.translation_key: None})
+
+
+def test_transaction_stores_progress_once_committed(
+    page_with_translation, django_capture_on_commit_callbacks
+):
+    """Test that the coalesced update stores the final progress."""
+    en_page = page_with_translation["en_page"]
+    de_locale = page_with_translation["de_locale"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        translation_source, _ = TranslationSource.get_or_create_from_instance(en_page)
+        translation = Translation.objects.create(
+            source=translation_source, target_locale=de_locale, enabled=True
+        )
+        translation.save_target(user=None, publish=True)
+        segment = translation_source.stringsegment_set.first()
+        StringTranslation.objects.create(
+            translation_of=segment.string,
+            locale=de_locale,
+            context=segment.context,
+            data="Deutscher Inhalt",
+        )
+
+        # Nothing is recalculated before the commit
+        assert not TranslationProgress.objects.exists()
+
+    progress = TranslationProgress.objects.get(source_page=en_page)
+    assert progress.translated_segments == 1
+    assert progress.total_segments == translation_source.stringsegment_set.count()
+
+
+def test_string_translations_only_recalculate_their_locale(
+    page_with_translation, django_capture_on_commit_callbacks
+):
+    """Test that translated strings limit the update to their locale."""
+    en_page = page_with_translation["en_page"]
+    de_locale = page_with_translation["de_locale"]
+    translation_source, _ = TranslationSource.get_or_create_from_instance(en_page)
+    Translation.objects.create(
+        source=translation_source, target_locale=de_locale, enabled=True
+    ).save_target(user=None, publish=True)
+    flush_progress_updates()
+
+    with patch(
+        "wagtail_localize_dashboard.utils.update_translation_keys_progress"
+    ) as update_progress:
+        with django_capture_on_commit_callbacks(execute=True):
+            for segment in translation_source.stringsegment_set.all()[:2]:
+                StringTranslation.objects.create(
+                    translation_of=segment.string,
+                    locale=de_locale,
+                    context=segment.context,
+                    data="Deutscher Inhalt",
+                )
+
+    update_progress.assert_called_once_with({en_page.translation_key: {de_locale.pk}})
+
+
+def test_queued_locales_merge(db):
+    """Test that queueing every locale of a key overrides single locales."""
+    queue_progress_update("key", locale_id=1)
+    queue_progress_update("key", locale_id=2)
+    queue_progress_update("other", locale_id=1)
+    assert get_pending_updates()["progress"] == {"key": {1, 2}, "other": {1}}
+
+    queue_progress_update("key")
+    queue_progress_update("key", locale_id=3)
+    assert get_pending_updates()["progress"] == {"key": None, "other": {1}}
+
+
+def test_flushing_again_does_nothing(db):
+    """Test that only the first flush of a transaction does the work."""
+    queue_progress_update("key")
+
+    with patch(
+        "wagtail_localize_dashboard.utils.update_translation_keys_progress"
+    ) as update_progress:
+        flush_progress_updates()
+        flush_progress_updates()
+
+    update_progress.assert_called_once_with({"key": None})
+
+
+def test_rolled_back_updates_are_dropped(db):
+    """Test that updates queued by a rolled back transaction are not applied."""
+    with pytest.raises(RuntimeError), transaction.atomic():
+        queue_progress_update("rolled-back")
+        raise RuntimeError
+
+    queue_progress_update("committed")
+
+    assert get_pending_updates()["progress"] == {"committed": None}
+
+
+def test_savepoint_rollback_keeps_earlier_updates(db):
+    """Test that a rolled back savepoint keeps the updates of its transaction."""
+    queue_progress_update("earlier")
+    with pytest.raises(RuntimeError), transaction.atomic():
+        queue_progress_update("rolled-back")
+        raise RuntimeError
+
+    queue_progress_update("later")
+
+    # The flush registered before the savepoint still waits for the commit
+    assert set(get_pending_updates()["progress"]) == {
+        "earlier",
+        "rolled-back",
+        "later",
+    }
+
+
+@patch.object(transaction, "on_commit", side_effect=lambda func: func())
+def test_suspend_recalculates_once_on_exit(_mock_on_commit, page_with_translation):
+    """Test that suspended updates are applied together when the block exits."""
+    en_page = page_with_translation["en_page"]
+    de_locale = page_with_translation["de_locale"]
+    flush_progress_updates()
+
+    with patch(
+        "wagtail_localize_dashboard.utils.update_translation_keys_progress"
+    ) as update_progress:
+        with suspend_progress_updates():
+            translation_source, _ = TranslationSource.get_or_create_from_instance(
+                en_page
+            )
+            translation = Translation.objects.create(
+                source=translation_source, target_locale=de_locale, enabled=True
+            )
+            translation.save_target(user=None, publish=True)
+            segment = translation_source.stringsegment_set.first()
+            StringTranslation.objects.create(
+                translation_of=segment.string,
+                locale=de_locale,
+                context=segment.context,
+                data="Deutscher Inhalt",
+            )
+
+            update_progress.assert_not_called()
+
+    update_progress.assert_called_once_with({en_page.translation_key: None})
+
+
+@patch.object(transaction, "on_commit", side_effect=lambda func: func())
+def test_suspend_stores_progress_on_exit(_mock_on_commit, page_with_translation):
+    """Test that the batched update stores the final progress."""
+    en_page = page_with_translation["en_page"]
+    de_locale = page_with_translation["de_locale"]
+
+    with suspend_progress_updates():
+        translation_source, _ = TranslationSource.get_or_create_from_instance(en_page)
+        Translation.objects.create(
+            source=translation_source, target_locale=de_locale, enabled=True
+        ).save_target(user=None, publish=True)
+        assert not TranslationProgress.objects.exists()
+
+    progress = TranslationProgress.objects.get(source_page=en_page)
+    assert progress.total_segments == translation_source.stringsegment_set.count()
+
+
+@patch.object(transaction, "on_commit", side_effect=lambda func: func())
+@patch("wagtail_localize_dashboard.utils.update_translation_keys_progress")
+def test_nested_suspend_waits_for_outermost_block(update_progress, _mock_on_commit):
+    """Test that only leaving the outermost block applies the updates."""
+    with suspend_progress_updates():
+        queue_progress_update("outer")
+        with suspend_progress_updates():
+            queue_progress_update("inner", locale_id=1)
+
+        update_progress.assert_not_called()
+
+    update_progress.assert_called_once_with({"outer": None, "inner": {1}})
+
+
+@patch.object(transaction, "on_commit", side_effect=lambda func: func())
+@patch("wagtail_localize_dashboard.utils.update_translation_keys_progress")
+def test_suspend_as_decorator(update_progress, _mock_on_commit):
+    """Test that the context manager also works as a decorator."""
+
+    @suspend_progress_updates()
+    def import_pages():
+        queue_progress_update("first")
+        queue_progress_update("second")
+        return update_progress.call_count
+
+    # Each call of the decorated function applies its own updates
+    assert import_pages() == 0
+    assert import_pages() == 1
+
+    assert update_progress.call_count == 2
+    update_progress.assert_called_with({"first": None, "second": None})
+
+
+@patch.object(transaction, "on_commit", side_effect=lambda func: func())
+@patch("wagtail_localize_dashboard.utils.update_translation_keys_progress")
+def test_suspend_only_affects_current_thread(update_progress, _mock_on_commit):
+    """Test that other threads keep updating while one is suspended."""
+    with suspend_progress_updates():
+        queue_progress_update("suspended")
+        thread = threading.Thread(target=queue_progress_update, args=["other"])
+        thread.start()
+        thread.join()
+
+        update_progress.assert_called_once_with({"other": None})
+
+    update_progress.assert_called_with({"suspended": None})
+
+
+@patch.object(transaction, "on_commit", side_effect=lambda func: func())
+@patch("wagtail_localize_dashboard.utils.update_translation_keys_progress")
+def test_suspend_applies_updates_after_error(update_progress, _mock_on_commit):
+    """Test that updates queued before an error are still applied."""
+    with pytest.raises(RuntimeError), suspend_progress_updates():
+        queue_progress_update("key")
+        raise RuntimeError
+
+    update_progress.assert_called_once_with({"key": None})
+    queue_progress_update("after")
+    update_progress.assert_called_with({"after": None})
+
+
 @patch.object(transaction, "on_commit", side_effect=lambda func: func())
 def test_deleting_translation_of_page_deletes_progress(
     _mock_on_commit, client, page_with_translation
@@ -297,6 +674,68 @@ def test_saving_page_creates_progress(_mock_on_commit, page_with_translation):
     assert progress.source_page == en_page
 
 
+@pytest.mark.parametrize(
+    "save",
+    [
+        lambda page: page.save_revision(),
+        lambda page: page.save(update_fields=["locked"]),
+        lambda page: page.save(update_fields=["draft_title", "latest_revision"]),
+    ],
+    ids=["save_revision", "lock", "draft_title"],
+)
+def test_saving_unrelated_page_fields_skips_progress(save, page_with_translation):
+    """Test that saves limited to fields progress doesn't use are skipped."""
+    en_page = page_with_translation["en_page"]
+    flush_progress_updates()
+
+    with patch(
+        "wagtail_localize_dashboard.signals.queue_progress_update"
+    ) as queue_update:
+        save(en_page)
+
+    queue_update.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "update_fields", [None, ["locale"], ["title", "alias_of"]], ids=str
+)
+def test_saving_progress_page_fields_queues_progress(
+    update_fields, page_with_translation
+):
+    """Test that full saves and saves of fields progress uses are processed."""
+    en_page = page_with_translation["en_page"]
+    flush_progress_updates()
+
+    with patch(
+        "wagtail_localize_dashboard.signals.queue_progress_update"
+    ) as queue_update:
+        en_page.save(update_fields=update_fields)
+
+    queue_update.assert_called_once_with(en_page.translation_key, relink=False)
+
+
+def test_page_saved_handler_connected_to_page_models():
+    """Test that page_saved_handler only listens to page models."""
+    with patch.object(post_save, "connect") as connect:
+        connect_page_signals()
+
+    senders = [call.kwargs["sender"] for call in connect.call_args_list]
+    assert set(senders) == set(get_page_models())
+    assert Page in senders
+    assert SampleSnippet not in senders
+    for call in connect.call_args_list:
+        assert call.args == (page_saved_handler,)
+
+
+def test_string_segments_can_be_fast_deleted(page_with_translation):
+    """Test that no handler listens to segments, so they are deleted in bulk."""
+    source, _ = TranslationSource.get_or_create_from_instance(
+        page_with_translation["en_page"]
+    )
+
+    assert Collector(using="default").can_fast_delete(source.stringsegment_set.all())
+
+
 @patch.object(transaction, "on_commit", side_effect=lambda func: func())
 def test_translation_chain_creates_correct_progress(
     _mock_on_commit, page_with_translation
@@ -347,12 +786,138 @@ def test_translation_chain_creates_correct_progress(
     assert fr_progress is not None
 
 
+@pytest.fixture
+def translation_chain(page_with_translation):
+    """Translate the page into German, and the German page into French."""
+    en_page = page_with_translation["en_page"]
+    de_locale = page_with_translation["de_locale"]
+    fr_locale, _ = Locale.objects.get_or_create(language_code="fr")
+
+    with patch.object(transaction, "on_commit", side_effect=lambda func: func()):
+        en_source, _ = TranslationSource.get_or_create_from_instance(en_page)
+        translation_de = Translation.objects.create(
+            source=en_source, target_locale=de_locale, enabled=True
+        )
+        translation_de.save_target(user=None, publish=True)
+        de_page = translation_de.get_target_instance()
+
+        de_source, _ = TranslationSource.get_or_create_from_instance(de_page)
+        translation_fr = Translation.objects.create(
+            source=de_source, target_locale=fr_locale, enabled=True
+        )
+        translation_fr.save_target(user=None, publish=True)
+        fr_page = translation_fr.get_target_instance()
+
+    return {
+        "en_page": en_page,
+        "de_page": de_page,
+        "fr_page": fr_page,
+        "en_source": en_source,
+        "fr_locale": fr_locale,
+        "translation_de": translation_de,
+        "translation_fr": translation_fr,
+    }
+
+
+def get_links():
+    """Get the TranslationSourceLink rows as {translated_page_id: translation_id}."""
+    return dict(
+        TranslationSourceLink.objects.values_list(
+            "translated_page_id", "translation_id"
+        )
+    )
+
+
+def test_translation_chain_links_pages(translation_chain):
+    """Test that each translated page is linked to the Translation it came from."""
+    assert get_links() == {
+        translation_chain["de_page"].id: translation_chain["translation_de"].id,
+        translation_chain["fr_page"].id: translation_chain["translation_fr"].id,
+    }
+
+
+@patch.object(transaction, "on_commit", side_effect=lambda func: func())
+def test_translations_relink_pages(_mock_on_commit, translation_chain):
+    """Test that creating and deleting Translations keeps the links current."""
+    fr_page = translation_chain["fr_page"]
+
+    # A Translation from the original is preferred
+    translation = Translation.objects.create(
+        source=translation_chain["en_source"],
+        target_locale=translation_chain["fr_locale"],
+    )
+    assert get_links()[fr_page.id] == translation.id
+
+    # Without it, the page goes back to the German source
+    translation.delete()
+    assert get_links()[fr_page.id] == translation_chain["translation_fr"].id
+
+
+@patch.object(transaction, "on_commit", side_effect=lambda func: func())
+def test_deleting_translation_updates_progress(_mock_on_commit, translation_chain):
+    """Test that progress is recalculated from the Translation a page is relinked to."""
+    fr_page = translation_chain["fr_page"]
+    en_page = translation_chain["en_page"]
+    translation = Translation.objects.create(
+        source=translation_chain["en_source"],
+        target_locale=translation_chain["fr_locale"],
+    )
+    fr_progress = TranslationProgress.objects.get(
+        source_page=en_page, translated_page=fr_page
+    )
+    # Make the progress from the original differ from the German source's
+    TranslationProgress.objects.filter(pk=fr_progress.pk).update(
+        percent_translated=55, total_segments=99, translated_segments=55
+    )
+
+    translation.delete()
+
+    fr_progress.refresh_from_db()
+    assert (fr_progress.total_segments, fr_progress.percent_translated) == (
+        translation_chain["translation_fr"].get_progress()[0],
+        calculate_percent(*translation_chain["translation_fr"].get_progress()),
+    )
+
+
+@patch.object(transaction, "on_commit", side_effect=lambda func: func())
+def test_deleting_original_page_creates_progress_of_new_original(
+    _mock_on_commit, translation_chain
+):
+    """Test that the new original page gets progress records for its translations."""
+    de_page = translation_chain["de_page"]
+    fr_page = translation_chain["fr_page"]
+
+    translation_chain["en_page"].delete()
+
+    assert list(
+        TranslationProgress.objects.values_list(
+            "source_page_id", "translated_page_id", "percent_translated"
+        )
+    ) == [
+        (
+            de_page.id,
+            fr_page.id,
+            calculate_percent(*translation_chain["translation_fr"].get_progress()),
+        )
+    ]
+
+
+@patch.object(transaction, "on_commit", side_effect=lambda func: func())
+def test_deleting_original_page_relinks_pages(_mock_on_commit, translation_chain):
+    """Test that the new original page is no longer linked as a translation."""
+    translation_chain["en_page"].delete()
+
+    assert get_links() == {
+        translation_chain["fr_page"].id: translation_chain["translation_fr"].id,
+    }
+
+
 @patch.object(transaction, "on_commit", side_effect=lambda func: func())
 def test_page_with_no_translations_creates_no_progress(
     _mock_on_commit, page_with_translation
 ):
     """Test that a page with no translations creates no TranslationProgress."""
-    root = page_with_translation["root"]
+    home = page_with_translation["home"]
     en_locale = page_with_translation["en_locale"]
 
     # Create a standalone page
@@ -361,7 +926,7 @@ def test_page_with_no_translations_creates_no_progress(
         slug="standalone",
         locale=en_locale,
     )
-    root.add_child(instance=standalone_page)
+    home.add_child(instance=standalone_page)
     standalone_page.save()
 
     # Verify no TranslationProgress was created
@@ -1,18 +1,56 @@
 """Tests for utility functions in wagtail-localize-dashboard."""
 
-from unittest.mock import Mock, patch
+import copy
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from unittest.mock import patch
 
+from django.db import connection
 from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
 import pytest
 from wagtail.models import Locale, Page
-from wagtail_localize.models import Translation, TranslationSource
-from wagtail_localize_dashboard.models import TranslationProgress
+from wagtail_localize.models import (
+    String,
+    StringSegment,
+    StringTranslation,
+    Translation,
+    TranslationSource,
+)
+from wagtail_localize.strings import StringValue
+from wagtail_localize_dashboard.models import (
+    RebuildCheckpoint,
+    TranslationProgress,
+    TranslationProgressQueue,
+    TranslationSourceLink,
+)
 from wagtail_localize_dashboard.utils import (
+    calculate_percent,
+    clean_orphaned_progress,
     create_translation_progress,
+    get_batch_progress,
+    get_original_objects,
+    get_original_page_ranges,
+    get_pages_for_strings,
+    get_pages_to_rebuild,
+    get_peak_memory_mb,
+    get_progress_drift,
+    get_rebuild_checkpoints,
+    get_stale_original_pages,
     get_translation_percentages,
+    get_translation_percentages_bulk,
+    get_translation_source_links,
+    process_translation_progress_queue,
+    queue_translation_progress,
     rebuild_all_progress,
+    rebuild_all_progress_parallel,
+    save_batch_progress,
+    update_translation_keys_progress,
+    update_translation_source_links,
 )
+from wagtail_localize_dashboard.workers import init_rebuild_worker
 
 pytestmark = [pytest.mark.django_db]
 
@@ -62,6 +100,102 @@ def page_with_translations(db):
     }
 
 
+@pytest.fixture
+def translated_pages(page_with_translations):
+    """Create several translated pages with partially translated strings."""
+    en_page = page_with_translations["en_page"]
+    de_locale = page_with_translations["de_locale"]
+    fr_locale = page_with_translations["fr_locale"]
+    section = en_page.get_parent()
+
+    pages = []
+    for index in range(3):
+        page = Page(
+            title=f"Batch Page {index}",
+            slug=f"batch-page-{index}",
+            locale=en_page.locale,
+        )
+        section.add_child(instance=page)
+
+        source, _ = TranslationSource.get_or_create_from_instance(page)
+        for locale in [de_locale, fr_locale]:
+            translation = Translation.objects.create(
+                source=source, target_locale=locale, enabled=True
+            )
+            translation.save_target(publish=True)
+
+        # Translate the first `index` segments into German
+        for segment in source.stringsegment_set.order_by("order")[:index]:
+            StringTranslation.objects.create(
+                translation_of=segment.string,
+                locale=de_locale,
+                context=segment.context,
+                data=f"Deutsch {index}",
+            )
+
+        pages.append(page)
+
+    return pages
+
+
+def expected_progress(source_pages):
+    """
+    Calculate progress one (page, locale) pair at a time.
+
+    Reference for the set-based calculations: every translation is looked
+    up with get_translation_percentages, falling back to the other
+    translations as its source.
+    """
+    progress = {}
+    for source_page in source_pages:
+        translations = list(source_page.get_translations().order_by("id"))
+        for translated_page in translations:
+            percent = get_translation_percentages(source_page, translated_page.locale)
+            if percent is None:
+                for other_page in translations:
+                    if other_page.id == translated_page.id:
+                        continue
+                    percent = get_translation_percentages(
+                        other_page, translated_page.locale
+                    )
+                    if percent is not None:
+                        break
+            progress[(source_page.id, translated_page.id)] = percent or 0
+    return progress
+
+
+def worker_is_ready():
+    """Run inside a real worker process, after ``init_rebuild_worker``."""
+    from django.apps import apps
+
+    from wagtail_localize_dashboard.utils import rebuild_all_progress
+
+    return apps.ready and callable(rebuild_all_progress)
+
+
+class SynchronousExecutor:
+    """Stand-in for ProcessPoolExecutor that runs submitted work inline."""
+
+    def __init__(self, max_workers=None, initializer=None):
+        self.max_workers = max_workers
+        if initializer:
+            initializer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
 class TestGetTranslationPercentages:
     """Tests for get_translation_percentages function."""
 
@@ -135,6 +269,57 @@ class TestGetTranslationPercentages:
         assert percent is None
 
 
+class TestGetTranslationPercentagesBulk:
+    """Tests for get_translation_percentages_bulk function."""
+
+    def test_matches_get_translation_percentages(self, translated_pages):
+        """Test that every pair matches get_translation_percentages."""
+        pages = list(Page.objects.filter(depth__gt=2))
+        locales = list(Locale.objects.all())
+
+        percentages = get_translation_percentages_bulk(pages, locales)
+
+        assert percentages == {
+            (page.id, locale.id): get_translation_percentages(page, locale)
+            for page in pages
+            for locale in locales
+        }
+        assert any(percent is None for percent in percentages.values())
+        assert len(set(percentages.values()) - {None}) > 1
+
+    def test_query_count_does_not_depend_on_input_size(
+        self, translated_pages, page_with_translations
+    ):
+        """Test that one page and many pages take the same number of queries."""
+        pages = list(Page.objects.filter(depth__gt=2))
+        locales = list(Locale.objects.all())
+
+        with CaptureQueriesContext(connection) as single:
+            get_translation_percentages_bulk(
+                [translated_pages[1]], [page_with_translations["de_locale"]]
+            )
+        with CaptureQueriesContext(connection) as many:
+            get_translation_percentages_bulk(pages, locales)
+
+        assert len(single.captured_queries) == 4
+        assert len(many.captured_queries) == 4
+
+    def test_empty_input(self, page_with_translations):
+        """Test that no pages or no locales returns an empty mapping."""
+        locales = list(Locale.objects.all())
+
+        with CaptureQueriesContext(connection) as queries:
+            assert get_translation_percentages_bulk([], locales) == {}
+            assert (
+                get_translation_percentages_bulk(
+                    [page_with_translations["en_page"]], []
+                )
+                == {}
+            )
+
+        assert len(queries.captured_queries) == 0
+
+
 class TestCreateTranslationProgress:
     """Tests for create_translation_progress function."""
 
@@ -226,9 +411,10 @@ class TestCreateTranslationProgress:
         initial_progress = TranslationProgress.objects.first()
         initial_id = initial_progress.id
 
-        # Update translation progress with mocked get_progress
+        # Update translation progress with mocked segment counts
         with patch(
-            "wagtail_localize.models.Translation.get_progress", return_value=(10, 10)
+            "wagtail_localize_dashboard.utils.get_segment_counts",
+            side_effect=lambda pairs, **kwargs: {pair: (10, 10) for pair in pairs},
         ):
             create_translation_progress(en_page)
 
@@ -341,42 +527,40 @@ class TestCreateTranslationProgress:
         for progress in TranslationProgress.objects.all():
             assert progress.source_page_id == en_page.id
 
-    @patch(
-        "wagtail_localize_dashboard.utils.TranslationSource.objects.get_for_instance"
-    )
-    @patch("wagtail_localize_dashboard.utils.Translation.objects.get")
     def test_create_translation_progress_fallback_to_nested_search(
-        self, mock_translation_get, mock_translation_source_get, page_with_translations
+        self, page_with_translations
     ):
         """Test the fallback logic when translation is from another translation."""
-        mock_translation_record = Mock()
-        mock_translation_record.get_progress.return_value = (8, 6)  # 75% translated
-
-        mock_translation_source_get.side_effect = [
-            TranslationSource.DoesNotExist(),
-            Mock(),
-            TranslationSource.DoesNotExist(),
-            Mock(),
-        ]
-        mock_translation_get.side_effect = [
-            Translation.DoesNotExist(),  # First call (direct translation) should fail
-            mock_translation_record,  # Second call (translation of a translation) should succeed
-        ]
+        en_page = page_with_translations["en_page"]
+        de_page = page_with_translations["de_page"]
+        fr_page = page_with_translations["fr_page"]
 
-        en_homepage = page_with_translations["en_page"]
+        # French is only translated from German
+        TranslationSource.get_or_create_from_instance(en_page)
+        de_source, _ = TranslationSource.get_or_create_from_instance(de_page)
+        Translation.objects.create(
+            source=de_source, target_locale=fr_page.locale, enabled=True
+        )
 
         # Make sure there are currently no TranslationProgress objects.
         TranslationProgress.objects.all().delete()
 
-        create_translation_progress(en_homepage)
+        with patch(
+            "wagtail_localize_dashboard.utils.get_segment_counts",
+            side_effect=lambda pairs, **kwargs: {pair: (8, 6) for pair in pairs},
+        ):
+            create_translation_progress(en_page)
 
-        # Should find translations via the fallback method
+        # Should find the French translation via the fallback method
         assert TranslationProgress.objects.count() == 2
-        # At least one translation should have 75% progress from the nested search
-        progress_values = {
-            td.percent_translated for td in TranslationProgress.objects.all()
-        }
-        assert 75 in progress_values
+        assert (
+            TranslationProgress.objects.get(translated_page=fr_page).percent_translated
+            == 75
+        )
+        assert (
+            TranslationProgress.objects.get(translated_page=de_page).percent_translated
+            == 0
+        )
 
     def test_create_translation_progress_handles_value_error(
         self, page_with_translations
@@ -387,9 +571,10 @@ class TestCreateTranslationProgress:
         # Make sure there are currently no TranslationProgress objects.
         TranslationProgress.objects.all().delete()
 
-        # Mock get_translations to raise ValueError
-        with patch.object(
-            Page, "get_translations", side_effect=ValueError("Test error")
+        # Mock the progress calculation to raise ValueError
+        with patch(
+            "wagtail_localize_dashboard.utils.get_batch_progress",
+            side_effect=ValueError("Test error"),
         ):
             create_translation_progress(en_page)
 
@@ -406,9 +591,10 @@ class TestCreateTranslationProgress:
         # Make sure there are currently no TranslationProgress objects.
         TranslationProgress.objects.all().delete()
 
-        # Mock specific property to raise AttributeError
-        with patch.object(
-            Page, "get_translations", side_effect=AttributeError("Test error")
+        # Mock the progress calculation to raise AttributeError
+        with patch(
+            "wagtail_localize_dashboard.utils.get_batch_progress",
+            side_effect=AttributeError("Test error"),
         ):
             create_translation_progress(en_homepage)
 
@@ -421,6 +607,206 @@ class TestCreateTranslationProgress:
             assert "Test error" in log_message
             assert "Error creating translation progress" in log_message
 
+    @override_settings(
+        WAGTAIL_LOCALIZE_DASHBOARD_SEGMENT_TOTALS_CACHE=None,
+        WAGTAIL_LOCALIZE_DASHBOARD_SEGMENT_TOTALS_CACHE_SIZE=0,
+    )
+    def test_unchanged_progress_is_not_written(self, translated_pages):
+        """Test that saving a page whose counts did not change writes nothing."""
+        rebuild_all_progress()
+
+        with CaptureQueriesContext(connection) as queries:
+            for page in translated_pages:
+                create_translation_progress(page)
+
+        assert not any(
+            query["sql"].startswith(("INSERT", "UPDATE"))
+            for query in queries.captured_queries
+        )
+
+    def test_create_translation_progress_query_budget(
+        self, page_with_translations, settings
+    ):
+        """Test that the number of queries does not depend on the locale count."""
+        # Count the segments both times, rather than reading cached totals
+        settings.WAGTAIL_LOCALIZE_DASHBOARD_SEGMENT_TOTALS_CACHE = None
+        settings.WAGTAIL_LOCALIZE_DASHBOARD_SEGMENT_TOTALS_CACHE_SIZE = 0
+        en_page = page_with_translations["en_page"]
+        section = en_page.get_parent()
+        source, _ = TranslationSource.get_or_create_from_instance(en_page)
+        de_source, _ = TranslationSource.get_or_create_from_instance(
+            page_with_translations["de_page"]
+        )
+        Translation.objects.create(
+            source=source, target_locale=page_with_translations["de_locale"]
+        )
+        Translation.objects.create(
+            source=de_source, target_locale=page_with_translations["fr_locale"]
+        )
+
+        def count_queries():
+            TranslationProgress.objects.all().delete()
+            with CaptureQueriesContext(connection) as queries:
+                create_translation_progress(en_page)
+            return len(queries.captured_queries)
+
+        few_locales = count_queries()
+
+        # 40 translations: half translated from the original, half from
+        # the German translation so every one of them takes the fallback
+        translations = []
+        for index in range(40):
+            locale = Locale.objects.create(language_code=f"x{index:02d}")
+            section.add_child(
+                instance=Page(
+                    title=f"Test Page {index}",
+                    slug=f"test-page-{index}",
+                    locale=locale,
+                    translation_key=en_page.translation_key,
+                )
+            )
+            translations.append(
+                Translation(
+                    source=source if index % 2 else de_source, target_locale=locale
+                )
+            )
+        Translation.objects.bulk_create(translations)
+
+        many_locales = count_queries()
+
+        assert TranslationProgress.objects.count() == 42
+        assert many_locales == few_locales
+        assert many_locales <= 10
+
+
+class TestTranslationSourceLinks:
+    """Tests for the TranslationSourceLink index."""
+
+    @pytest.fixture
+    def chain(self, page_with_translations):
+        """Translate English to German, and German to French."""
+        en_page = page_with_translations["en_page"]
+        de_page = page_with_translations["de_page"]
+        fr_page = page_with_translations["fr_page"]
+        en_source, _ = TranslationSource.get_or_create_from_instance(en_page)
+        de_source, _ = TranslationSource.get_or_create_from_instance(de_page)
+        return {
+            "en_page": en_page,
+            "de_page": de_page,
+            "fr_page": fr_page,
+            "en_source": en_source,
+            "to_de": Translation.objects.create(
+                source=en_source, target_locale=de_page.locale
+            ),
+            "to_fr": Translation.objects.create(
+                source=de_source, target_locale=fr_page.locale
+            ),
+        }
+
+    def test_links_translation_chain(self, chain):
+        """Test that pages link to the Translation they were produced from."""
+        links = get_translation_source_links([chain["en_page"].translation_key])
+
+        assert links == {
+            chain["de_page"].id: chain["to_de"].id,
+            chain["fr_page"].id: chain["to_fr"].id,
+        }
+
+    def test_prefers_translation_from_original(self, chain):
+        """Test that a Translation from the original page wins."""
+        direct = Translation.objects.create(
+            source=chain["en_source"], target_locale=chain["fr_page"].locale
+        )
+
+        links = get_translation_source_links([chain["en_page"].translation_key])
+
+        assert links[chain["fr_page"].id] == direct.id
+
+    def test_update_creates_changes_and_deletes_links(self, chain):
+        """Test that update_translation_source_links keeps the rows current."""
+        translation_key = chain["en_page"].translation_key
+        TranslationSourceLink.objects.all().delete()
+
+        assert update_translation_source_links([translation_key]) == 2
+        assert update_translation_source_links([translation_key]) == 0
+
+        direct = Translation.objects.create(
+            source=chain["en_source"], target_locale=chain["fr_page"].locale
+        )
+        assert update_translation_source_links([translation_key]) == 1
+        assert (
+            TranslationSourceLink.objects.get(
+                translated_page=chain["fr_page"]
+            ).translation
+            == direct
+        )
+
+        Translation.objects.filter(source=chain["en_source"]).delete()
+        update_translation_source_links([translation_key])
+        assert dict(
+            TranslationSourceLink.objects.values_list(
+                "translated_page_id", "translation_id"
+            )
+        ) == {chain["fr_page"].id: chain["to_fr"].id}
+
+    @override_settings(
+        WAGTAIL_LOCALIZE_DASHBOARD_SEGMENT_TOTALS_CACHE=None,
+        WAGTAIL_LOCALIZE_DASHBOARD_SEGMENT_TOTALS_CACHE_SIZE=0,
+    )
+    def test_batch_progress_joins_through_links(self, translated_pages):
+        """Test that linked pages skip the source search."""
+        original_pages = list(get_original_objects(Page))
+        expected = expected_progress(original_pages)
+        TranslationSourceLink.objects.all().delete()
+
+        with CaptureQueriesContext(connection) as searched:
+            assert get_batch_progress(translated_pages) == {
+                key: percent
+                for key, percent in expected.items()
+                if key[0] in {page.id for page in translated_pages}
+            }
+
+        update_translation_source_links(
+            {page.translation_key for page in translated_pages}
+        )
+        with CaptureQueriesContext(connection) as joined:
+            progress = get_batch_progress(translated_pages)
+
+        assert progress == {
+            key: percent
+            for key, percent in expected.items()
+            if key[0] in {page.id for page in translated_pages}
+        }
+        assert len(joined.captured_queries) == len(searched.captured_queries) - 2
+
+    def test_batch_progress_ignores_links_for_other_sources(self, chain):
+        """Test that links are only used when the source page is the original."""
+        # French is linked to the Translation from the original page
+        Translation.objects.create(
+            source=chain["en_source"], target_locale=chain["fr_page"].locale
+        )
+        update_translation_source_links([chain["en_page"].translation_key])
+
+        with patch(
+            "wagtail_localize_dashboard.utils.get_segment_counts",
+            side_effect=lambda pairs, **kwargs: {
+                pair: (4, 3 if pair[0] == chain["en_source"].id else 1)
+                for pair in pairs
+            },
+        ):
+            progress = get_batch_progress([chain["de_page"]])
+
+        # From the German page, French is translated from German
+        assert progress[(chain["de_page"].id, chain["fr_page"].id)] == 25
+
+    def test_rebuild_refreshes_links(self, translated_pages):
+        """Test that a rebuild heals a missing index."""
+        TranslationSourceLink.objects.all().delete()
+
+        rebuild_all_progress()
+
+        assert TranslationSourceLink.objects.count() == 2 * len(translated_pages)
+
 
 class TestRebuildAllProgress:
     """Tests for rebuild_all_progress function."""
@@ -460,3 +846,1372 @@ class TestRebuildAllProgress:
 
         # Should have created progress
         assert TranslationProgress.objects.count() >= 1
+
+    def test_rebuild_all_progress_in_batches(self, translated_pages):
+        """Test that small batches produce the same records as one batch."""
+        original_pages = list(get_original_objects(Page))
+        expected = expected_progress(original_pages)
+
+        TranslationProgress.objects.all().delete()
+        stats = rebuild_all_progress(batch_size=2)
+
+        assert stats == {"pages": len(original_pages), "errors": 0}
+        assert {
+            (progress.source_page_id, progress.translated_page_id): (
+                progress.percent_translated
+            )
+            for progress in TranslationProgress.objects.all()
+        } == expected
+
+    def test_rebuild_all_progress_retries_failed_batch_per_page(self, translated_pages):
+        """Test that a failing batch falls back to per-page processing."""
+        original_pages = list(get_original_objects(Page))
+
+        def fail_for_batches(batch, **kwargs):
+            if len(batch) > 1:
+                raise ValueError("Batch error")
+            return get_batch_progress(batch, **kwargs)
+
+        with patch(
+            "wagtail_localize_dashboard.utils.get_batch_progress",
+            side_effect=fail_for_batches,
+        ):
+            stats = rebuild_all_progress()
+
+        assert stats == {"pages": len(original_pages), "errors": 0}
+        assert TranslationProgress.objects.count() == 2 * len(translated_pages) + 2
+
+    def test_retried_pages_keep_locale_and_recalculate(self, translated_pages):
+        """Test that per-page retries keep the locale scope and recalculate."""
+        de_locale = Locale.objects.get(language_code="de")
+        rebuild_all_progress()
+        TranslationProgress.objects.update(percent_translated=1)
+
+        def fail_for_batches(batch, **kwargs):
+            if len(batch) > 1:
+                raise ValueError("Batch error")
+            return get_batch_progress(batch, **kwargs)
+
+        with patch(
+            "wagtail_localize_dashboard.utils.get_batch_progress",
+            side_effect=fail_for_batches,
+        ):
+            stats = rebuild_all_progress(locale=de_locale)
+
+        assert stats["errors"] == 0
+        assert set(
+            TranslationProgress.objects.exclude(percent_translated=1).values_list(
+                "translated_page__locale", flat=True
+            )
+        ) == {de_locale.pk}
+
+
+class TestRebuildCheckpoints:
+    """Tests for checkpointed and resumed rebuilds."""
+
+    def interrupt_after_batches(self, count):
+        """Patch get_batch_progress to kill the run after `count` batches."""
+        calls = []
+
+        def get_batch_progress_then_die(batch, **kwargs):
+            if len(calls) == count:
+                raise KeyboardInterrupt
+            calls.append(batch)
+            return get_batch_progress(batch, **kwargs)
+
+        return patch(
+            "wagtail_localize_dashboard.utils.get_batch_progress",
+            side_effect=get_batch_progress_then_die,
+        )
+
+    def test_checkpoint_removed_after_complete_run(self, translated_pages):
+        """Test that a completed run leaves no checkpoint behind."""
+        stats = rebuild_all_progress(checkpoint="test")
+
+        assert stats["pages"] == get_original_objects(Page).count()
+        assert RebuildCheckpoint.objects.count() == 0
+
+    def test_interrupted_run_records_last_committed_page(self, translated_pages):
+        """Test that the checkpoint points at the last committed batch."""
+        original_ids = sorted(get_original_objects(Page).values_list("id", flat=True))
+        TranslationProgress.objects.all().delete()
+
+        with self.interrupt_after_batches(1), pytest.raises(KeyboardInterrupt):
+            rebuild_all_progress(batch_size=2, checkpoint="test")
+
+        checkpoint = RebuildCheckpoint.objects.get(name="test")
+        assert checkpoint.last_page_id == original_ids[1]
+        assert checkpoint.next_page_id == original_ids[1] + 1
+        assert set(
+            TranslationProgress.objects.values_list("source_page_id", flat=True)
+        ) == set(original_ids[:2])
+
+    def test_resume_continues_after_checkpoint(self, translated_pages):
+        """Test that resuming only processes the remaining pages."""
+        original_pages = list(get_original_objects(Page))
+        expected = expected_progress(original_pages)
+        TranslationProgress.objects.all().delete()
+
+        with self.interrupt_after_batches(1), pytest.raises(KeyboardInterrupt):
+            rebuild_all_progress(batch_size=2, checkpoint="test")
+
+        stats = rebuild_all_progress(batch_size=2, checkpoint="test", resume=True)
+
+        assert stats == {"pages": len(original_pages) - 2, "errors": 0}
+        assert RebuildCheckpoint.objects.count() == 0
+        assert {
+            (progress.source_page_id, progress.translated_page_id): (
+                progress.percent_translated
+            )
+            for progress in TranslationProgress.objects.all()
+        } == expected
+
+    def test_without_resume_starts_over(self, translated_pages):
+        """Test that an existing checkpoint is ignored without resume."""
+        RebuildCheckpoint.objects.create(name="test", last_page_id=10**6)
+
+        stats = rebuild_all_progress(checkpoint="test")
+
+        assert stats["pages"] == get_original_objects(Page).count()
+        assert RebuildCheckpoint.objects.count() == 0
+
+    def test_checkpoint_records_scope(self, translated_pages):
+        """Test that an interrupted run stores the filters it was run with."""
+        de_locale = Locale.objects.get(language_code="de")
+
+        with self.interrupt_after_batches(0), pytest.raises(KeyboardInterrupt):
+            rebuild_all_progress(checkpoint="test", stale_only=True, locale=de_locale)
+
+        assert RebuildCheckpoint.objects.get(name="test").scope == {
+            "stale_only": True,
+            "locale": "de",
+        }
+
+    def test_resume_with_other_filters_is_refused(self, translated_pages):
+        """Test that a checkpoint is not resumed with other filters."""
+        de_locale = Locale.objects.get(language_code="de")
+        TranslationProgress.objects.all().delete()
+
+        with self.interrupt_after_batches(1), pytest.raises(KeyboardInterrupt):
+            rebuild_all_progress(batch_size=2, checkpoint="test")
+        checkpoint = RebuildCheckpoint.objects.get(name="test")
+
+        for resume in [True, False]:
+            with pytest.raises(ValueError, match="other filters"):
+                rebuild_all_progress(checkpoint="test", resume=resume, locale=de_locale)
+
+        assert RebuildCheckpoint.objects.get(name="test").last_page_id == (
+            checkpoint.last_page_id
+        )
+
+    @patch("wagtail_localize_dashboard.utils.ProcessPoolExecutor", SynchronousExecutor)
+    def test_parallel_resume_with_other_filters_is_refused(self, translated_pages):
+        """Test that worker checkpoints are not resumed or replaced with other filters."""
+        RebuildCheckpoint.objects.create(name="test:0", scope={"locale": "fr"})
+
+        for resume in [True, False]:
+            with pytest.raises(ValueError, match="other filters"):
+                rebuild_all_progress_parallel(
+                    workers=2, checkpoint="test", resume=resume
+                )
+
+        assert list(get_rebuild_checkpoints("test").values_list("name", flat=True)) == [
+            "test:0"
+        ]
+
+    @patch("wagtail_localize_dashboard.utils.ProcessPoolExecutor", SynchronousExecutor)
+    def test_parallel_resume_continues_worker_ranges(self, translated_pages):
+        """Test that a parallel resume continues each unfinished range."""
+        original_ids = sorted(get_original_objects(Page).values_list("id", flat=True))
+        TranslationProgress.objects.all().delete()
+        RebuildCheckpoint.objects.create(
+            name="test:0",
+            min_page_id=original_ids[0],
+            max_page_id=original_ids[1],
+            last_page_id=original_ids[0],
+        )
+        RebuildCheckpoint.objects.create(
+            name="test:1",
+            min_page_id=original_ids[2],
+            max_page_id=original_ids[-1],
+            last_page_id=original_ids[-1],
+        )
+
+        stats = rebuild_all_progress_parallel(workers=2, checkpoint="test", resume=True)
+
+        assert stats == {"pages": 1, "errors": 0}
+        assert get_rebuild_checkpoints("test").count() == 0
+        assert set(
+            TranslationProgress.objects.values_list("source_page_id", flat=True)
+        ) == {original_ids[1]}
+
+    @patch("wagtail_localize_dashboard.utils.ProcessPoolExecutor", SynchronousExecutor)
+    def test_parallel_resume_splits_single_process_checkpoint(self, translated_pages):
+        """Test that a parallel resume splits what is left of a single run."""
+        original_ids = sorted(get_original_objects(Page).values_list("id", flat=True))
+        TranslationProgress.objects.all().delete()
+        RebuildCheckpoint.objects.create(name="test", last_page_id=original_ids[0])
+
+        stats = rebuild_all_progress_parallel(workers=2, checkpoint="test", resume=True)
+
+        assert stats == {"pages": len(original_ids) - 1, "errors": 0}
+        assert get_rebuild_checkpoints("test").count() == 0
+
+
+class TestStaleRebuild:
+    """Tests for the incremental since/stale-only rebuild modes."""
+
+    def translate_segment(self, page, locale, data="Übersetzt"):
+        """Translate the first untranslated segment of a page."""
+        source = TranslationSource.objects.get_for_instance(page)
+        segment = source.stringsegment_set.exclude(
+            string__translations__locale=locale
+        ).first()
+        return StringTranslation.objects.create(
+            translation_of=segment.string,
+            locale=locale,
+            context=segment.context,
+            data=data,
+        )
+
+    def test_nothing_stale_after_rebuild(self, translated_pages):
+        """Test that no page is stale right after a full rebuild."""
+        rebuild_all_progress()
+
+        assert not get_stale_original_pages().exists()
+        assert rebuild_all_progress(stale_only=True) == {"pages": 0, "errors": 0}
+
+    def test_pages_without_progress_are_stale(self, translated_pages):
+        """Test that translations without a progress record are stale."""
+        rebuild_all_progress()
+        TranslationProgress.objects.filter(source_page=translated_pages[0]).delete()
+
+        assert list(get_stale_original_pages()) == [translated_pages[0]]
+
+    def test_string_translation_makes_page_stale(
+        self, translated_pages, page_with_translations
+    ):
+        """Test that a new StringTranslation only marks its own page stale."""
+        de_locale = page_with_translations["de_locale"]
+        rebuild_all_progress()
+        progress = TranslationProgress.objects.get(
+            source_page=translated_pages[0], translated_page__locale=de_locale
+        )
+
+        self.translate_segment(translated_pages[0], de_locale)
+
+        assert list(get_stale_original_pages()) == [translated_pages[0]]
+        assert rebuild_all_progress(stale_only=True) == {"pages": 1, "errors": 0}
+        progress.refresh_from_db()
+        assert progress.percent_translated > 0
+
+    def test_page_not_stale_after_stale_rebuild(
+        self, translated_pages, page_with_translations
+    ):
+        """Test that a stale rebuild also clears the translations it left as is."""
+        de_locale = page_with_translations["de_locale"]
+        rebuild_all_progress()
+        fr_progress = TranslationProgress.objects.get(
+            source_page=translated_pages[0], translated_page__locale__language_code="fr"
+        )
+
+        self.translate_segment(translated_pages[0], de_locale)
+
+        assert rebuild_all_progress(stale_only=True) == {"pages": 1, "errors": 0}
+        # The French record did not change, so it was only marked as checked
+        refreshed = TranslationProgress.objects.get(pk=fr_progress.pk)
+        assert refreshed.last_updated == fr_progress.last_updated
+        assert refreshed.checked_at > fr_progress.checked_at
+        assert not get_stale_original_pages().exists()
+        assert rebuild_all_progress(stale_only=True) == {"pages": 0, "errors": 0}
+
+    def test_locale_rebuild_only_checks_its_locale(
+        self, translated_pages, page_with_translations
+    ):
+        """Test that a locale-scoped rebuild leaves other locales stale."""
+        de_locale = page_with_translations["de_locale"]
+        rebuild_all_progress()
+
+        self.translate_segment(translated_pages[0], de_locale)
+        rebuild_all_progress(stale_only=True, locale=de_locale)
+
+        assert list(get_stale_original_pages()) == [translated_pages[0]]
+
+    def test_translation_sync_makes_page_stale(self, translated_pages):
+        """Test that syncing a Translation marks its page stale."""
+        rebuild_all_progress()
+
+        Translation.objects.filter(
+            source__object_id=translated_pages[1].translation_key
+        ).update(translations_last_updated_at=timezone.now())
+
+        assert list(get_stale_original_pages()) == [translated_pages[1]]
+
+    def test_source_update_makes_page_stale(self, translated_pages):
+        """Test that updating a TranslationSource marks its page stale."""
+        rebuild_all_progress()
+
+        TranslationSource.objects.filter(
+            object_id=translated_pages[2].translation_key
+        ).update(last_updated_at=timezone.now())
+
+        assert list(get_stale_original_pages()) == [translated_pages[2]]
+
+    def test_since_uses_fixed_cut_off(self, translated_pages, page_with_translations):
+        """Test that since compares inputs with a fixed time."""
+        de_locale = page_with_translations["de_locale"]
+        rebuild_all_progress()
+        since = timezone.now()
+
+        assert not get_stale_original_pages(since).exists()
+
+        self.translate_segment(translated_pages[1], de_locale)
+
+        assert list(get_stale_original_pages(since)) == [translated_pages[1]]
+        assert rebuild_all_progress(since=since) == {"pages": 1, "errors": 0}
+        # Everything changed after a cut-off in the past
+        assert get_stale_original_pages(since.replace(year=2000)).count() == len(
+            translated_pages
+        )
+
+
+class TestSaveBatchProgress:
+    """Tests for the bulk upsert in save_batch_progress."""
+
+    def test_creates_and_updates_with_one_write(self, page_with_translations):
+        """Test that new and changed records are written in one statement."""
+        en_page = page_with_translations["en_page"]
+        de_page = page_with_translations["de_page"]
+        fr_page = page_with_translations["fr_page"]
+        TranslationProgress.objects.all().delete()
+        existing = TranslationProgress.objects.create(
+            source_page=en_page, translated_page=de_page, percent_translated=10
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            written = save_batch_progress(
+                {(en_page.id, de_page.id): 50, (en_page.id, fr_page.id): 20}
+            )
+
+        assert written == 2
+        writes = [
+            query
+            for query in queries.captured_queries
+            if query["sql"].startswith("INSERT")
+        ]
+        assert len(writes) == 1
+        existing.refresh_from_db()
+        assert existing.percent_translated == 50
+        assert existing.last_updated > existing.created_at
+        assert (
+            TranslationProgress.objects.get(translated_page=fr_page).percent_translated
+            == 20
+        )
+
+    def test_skips_unchanged_records(self, page_with_translations):
+        """Test that records with the same percentage are not rewritten."""
+        en_page = page_with_translations["en_page"]
+        de_page = page_with_translations["de_page"]
+        TranslationProgress.objects.all().delete()
+        existing = TranslationProgress.objects.create(
+            source_page=en_page, translated_page=de_page, percent_translated=10
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            written = save_batch_progress({(en_page.id, de_page.id): 10})
+
+        assert written == 0
+        assert len(queries.captured_queries) == 1  # Only reads existing records
+        last_updated = existing.last_updated
+        existing.refresh_from_db()
+        assert existing.last_updated == last_updated
+
+    def test_stores_segment_counts(self, page_with_translations):
+        """Test that (percent, total, translated) tuples store the counts."""
+        en_page = page_with_translations["en_page"]
+        de_page = page_with_translations["de_page"]
+        fr_page = page_with_translations["fr_page"]
+        TranslationProgress.objects.all().delete()
+        TranslationProgress.objects.create(
+            source_page=en_page,
+            translated_page=de_page,
+            percent_translated=50,
+            total_segments=4,
+            translated_segments=2,
+        )
+
+        written = save_batch_progress(
+            {
+                # Same percentage, but the counts changed
+                (en_page.id, de_page.id): (50, 8, 4),
+                (en_page.id, fr_page.id): (33, 3, 1),
+            }
+        )
+
+        assert written == 2
+        assert set(
+            TranslationProgress.objects.values_list(
+                "translated_page_id",
+                "percent_translated",
+                "total_segments",
+                "translated_segments",
+            )
+        ) == {(de_page.id, 50, 8, 4), (fr_page.id, 33, 3, 1)}
+        assert save_batch_progress({(en_page.id, fr_page.id): (33, 3, 1)}) == 0
+
+    def test_percent_only_keeps_segment_counts(self, page_with_translations):
+        """Test that a plain percentage leaves the stored counts alone."""
+        en_page = page_with_translations["en_page"]
+        de_page = page_with_translations["de_page"]
+        TranslationProgress.objects.all().delete()
+        existing = TranslationProgress.objects.create(
+            source_page=en_page,
+            translated_page=de_page,
+            percent_translated=50,
+            total_segments=4,
+            translated_segments=2,
+        )
+
+        assert save_batch_progress({(en_page.id, de_page.id): 75}) == 1
+
+        existing.refresh_from_db()
+        assert existing.percent_translated == 75
+        assert (existing.total_segments, existing.translated_segments) == (4, 2)
+
+    def test_empty_progress(self, db):
+        """Test that nothing is queried for empty progress."""
+        with CaptureQueriesContext(connection) as queries:
+            assert save_batch_progress({}) == 0
+
+        assert len(queries.captured_queries) == 0
+
+
+class TestCleanOrphanedProgress:
+    """Tests for clean_orphaned_progress."""
+
+    @pytest.fixture
+    def orphans(self, translated_pages, page_with_translations):
+        """Build valid progress records plus a few orphaned ones."""
+        en_page = page_with_translations["en_page"]
+        de_page = page_with_translations["de_page"]
+        fr_page = page_with_translations["fr_page"]
+        rebuild_all_progress()
+        valid_ids = set(TranslationProgress.objects.values_list("id", flat=True))
+
+        orphans = [
+            # Source is a translation, not the original
+            TranslationProgress.objects.create(
+                source_page=de_page, translated_page=fr_page
+            ),
+            # Translated page belongs to another translation_key
+            TranslationProgress.objects.create(
+                source_page=en_page, translated_page=translated_pages[0]
+            ),
+            # Source and translation are the same page
+            TranslationProgress.objects.create(
+                source_page=en_page, translated_page=en_page
+            ),
+        ]
+        return valid_ids, orphans
+
+    def test_deletes_orphans_only(self, orphans):
+        """Test that only orphaned records are deleted."""
+        valid_ids, orphan_records = orphans
+
+        deleted = clean_orphaned_progress()
+
+        assert deleted == len(orphan_records)
+        assert set(TranslationProgress.objects.values_list("id", flat=True)) == (
+            valid_ids
+        )
+
+    def test_deletes_in_chunks(self, orphans):
+        """Test that orphans are deleted with one DELETE per chunk."""
+        valid_ids, orphan_records = orphans
+
+        with CaptureQueriesContext(connection) as queries:
+            deleted = clean_orphaned_progress(chunk_size=2)
+
+        assert deleted == len(orphan_records)
+        deletes = [
+            query
+            for query in queries.captured_queries
+            if query["sql"].startswith("DELETE")
+        ]
+        assert len(deletes) == 2
+
+        # The next chunk starts after the last id of the previous one
+        second_chunk_start = sorted(record.id for record in orphan_records)[1]
+        assert any(
+            f'."id" > {second_chunk_start}' in query["sql"]
+            for query in queries.captured_queries
+        )
+
+    def test_page_no_longer_original(self, page_with_translations):
+        """Test that records from a page that is no longer the original go."""
+        en_page = page_with_translations["en_page"]
+        de_page = page_with_translations["de_page"]
+        create_translation_progress(en_page)
+        create_translation_progress(de_page)
+
+        assert clean_orphaned_progress() == 2
+        assert set(
+            TranslationProgress.objects.values_list("source_page_id", flat=True)
+        ) == {en_page.id}
+
+
+class TestGetProgressDrift:
+    """Tests for get_progress_drift."""
+
+    def test_no_drift_after_rebuild(self, translated_pages):
+        """Test that a fresh rebuild reports no drift."""
+        rebuild_all_progress()
+
+        drift = get_progress_drift()
+
+        assert drift == {
+            "pages": get_original_objects(Page).count(),
+            "missing": [],
+            "stale": [],
+            "extra": [],
+        }
+
+    def test_translated_home_page_is_not_tracked(
+        self,
+        translated_pages,
+        page_with_translations,
+        django_capture_on_commit_callbacks,
+    ):
+        """Test that home pages get no records, so none are reported as extra."""
+        en_home = page_with_translations["en_page"].get_parent()
+        with django_capture_on_commit_callbacks(execute=True):
+            source, _ = TranslationSource.get_or_create_from_instance(en_home)
+            Translation.objects.create(
+                source=source,
+                target_locale=page_with_translations["de_locale"],
+                enabled=True,
+            ).save_target(publish=True)
+        rebuild_all_progress()
+
+        assert not TranslationProgress.objects.filter(source_page=en_home).exists()
+        assert get_progress_drift()["extra"] == []
+        assert clean_orphaned_progress() == 0
+
+    def test_reports_missing_stale_and_extra(
+        self, translated_pages, page_with_translations
+    ):
+        """Test that each kind of drift is reported."""
+        de_page = page_with_translations["de_page"]
+        fr_page = page_with_translations["fr_page"]
+        expected = expected_progress(get_original_objects(Page))
+        rebuild_all_progress()
+        missing = TranslationProgress.objects.order_by("id")[0]
+        stale = TranslationProgress.objects.order_by("id")[1]
+        missing.delete()
+        stale.percent_translated = (
+            expected[(stale.source_page_id, stale.translated_page_id)] + 7
+        )
+        stale.save()
+        extra = TranslationProgress.objects.create(
+            source_page=de_page, translated_page=fr_page, percent_translated=12
+        )
+
+        drift = get_progress_drift(batch_size=2)
+
+        missing_key = (missing.source_page_id, missing.translated_page_id)
+        stale_key = (stale.source_page_id, stale.translated_page_id)
+        assert drift["missing"] == [(*missing_key, expected[missing_key])]
+        assert drift["stale"] == [
+            (*stale_key, expected[stale_key] + 7, expected[stale_key])
+        ]
+        assert drift["extra"] == [
+            (extra.source_page_id, extra.translated_page_id, extra.percent_translated)
+        ]
+
+    def test_does_not_write(self, translated_pages):
+        """Test that nothing is written to the progress table."""
+        TranslationProgress.objects.all().delete()
+
+        drift = get_progress_drift()
+
+        assert drift["missing"]
+        assert not TranslationProgress.objects.exists()
+
+    def test_scoped_to_locale(self, translated_pages, page_with_translations):
+        """Test that a locale-scoped comparison ignores other locales."""
+        de_locale = page_with_translations["de_locale"]
+        fr_locale = page_with_translations["fr_locale"]
+        rebuild_all_progress()
+        TranslationProgress.objects.filter(translated_page__locale=fr_locale).delete()
+
+        assert get_progress_drift(locale=de_locale)["missing"] == []
+        assert (
+            len(get_progress_drift(locale=fr_locale)["missing"])
+            == len(translated_pages) + 1
+        )
+
+    @override_settings(
+        WAGTAIL_LOCALIZE_DASHBOARD_TRACK_PAGES=False,
+        WAGTAIL_LOCALIZE_DASHBOARD_REBUILD_PROGRESS_CALCULATOR="missing.Calculator",
+    )
+    def test_untracked_pages_skip_calculator(self, translated_pages):
+        """Test that the calculator is not loaded when pages are not tracked."""
+        assert get_progress_drift() == {
+            "pages": 0,
+            "missing": [],
+            "stale": [],
+            "extra": [],
+        }
+
+
+class TestGetBatchProgress:
+    """Tests for the set-based get_batch_progress function."""
+
+    def test_matches_get_progress(self, translated_pages):
+        """Test that batch percentages match Translation.get_progress()."""
+        expected = expected_progress(translated_pages)
+
+        progress = get_batch_progress(translated_pages)
+
+        assert progress == expected
+        # The partially translated German pages are not all 0%
+        assert len(set(progress.values())) > 1
+
+    def test_matches_translation_chain(self, page_with_translations):
+        """Test translation chain (A→B→C) uses the fallback source."""
+        en_page = page_with_translations["en_page"]
+        de_page = page_with_translations["de_page"]
+        fr_page = page_with_translations["fr_page"]
+
+        source_en, _ = TranslationSource.get_or_create_from_instance(en_page)
+        Translation.objects.create(
+            source=source_en, target_locale=de_page.locale, enabled=True
+        )
+        source_de, _ = TranslationSource.get_or_create_from_instance(de_page)
+        Translation.objects.create(
+            source=source_de, target_locale=fr_page.locale, enabled=True
+        )
+        segment = source_de.stringsegment_set.first()
+        StringTranslation.objects.create(
+            translation_of=segment.string,
+            locale=fr_page.locale,
+            context=segment.context,
+            data="Français",
+        )
+
+        expected = expected_progress([en_page])
+
+        assert get_batch_progress([en_page]) == expected
+        assert expected[(en_page.id, fr_page.id)] > 0
+
+    def test_ignores_strings_with_errors(self, translated_pages):
+        """Test that StringTranslations with has_error are not counted."""
+        StringTranslation.objects.update(has_error=True)
+
+        progress = get_batch_progress(translated_pages)
+
+        assert set(progress.values()) == {0}
+        assert progress == expected_progress(translated_pages)
+
+    def test_query_count_does_not_depend_on_batch_size(self, translated_pages):
+        """Test that the number of queries is fixed per batch."""
+        with CaptureQueriesContext(connection) as one_page:
+            get_batch_progress(translated_pages[:1])
+        with CaptureQueriesContext(connection) as all_pages:
+            get_batch_progress(translated_pages)
+
+        assert len(one_page.captured_queries) == len(all_pages.captured_queries)
+
+    def test_empty_batch(self, db):
+        """Test that an empty batch runs no queries."""
+        with CaptureQueriesContext(connection) as queries:
+            assert get_batch_progress([]) == {}
+
+        assert len(queries.captured_queries) == 0
+
+
+class TestSegmentCounts:
+    """Tests for the segment counts stored with each percentage."""
+
+    def test_batch_progress_with_counts(self, translated_pages):
+        """Test that with_counts returns the counts behind each percentage."""
+        percents = get_batch_progress(translated_pages)
+
+        progress = get_batch_progress(translated_pages, with_counts=True)
+
+        assert progress.keys() == percents.keys()
+        for key, (percent, total, translated) in progress.items():
+            assert percent == percents[key]
+            assert calculate_percent(total, translated) == percent
+            assert total > 0
+        assert {translated for _, _, translated in progress.values()} == {0, 1, 2}
+
+    def test_page_without_translation_has_no_segments(self, page_with_translations):
+        """Test that a page with no Translation gets 0% of 0 segments."""
+        en_page = page_with_translations["en_page"]
+
+        progress = get_batch_progress([en_page], with_counts=True)
+
+        assert set(progress.values()) == {(0, 0, 0)}
+
+    def test_every_path_stores_counts(self, translated_pages):
+        """Test that rebuilds and single-page updates store the counts."""
+        expected = get_batch_progress(translated_pages, with_counts=True)
+
+        for update in [
+            lambda: rebuild_all_progress(),
+            lambda: [create_translation_progress(page) for page in translated_pages],
+        ]:
+            TranslationProgress.objects.all().delete()
+            update()
+
+            assert {
+                (source_page_id, translated_page_id): (percent, total, translated)
+                for (
+                    source_page_id,
+                    translated_page_id,
+                    percent,
+                    total,
+                    translated,
+                ) in TranslationProgress.objects.filter(
+                    source_page__in=translated_pages
+                ).values_list(
+                    "source_page_id",
+                    "translated_page_id",
+                    "percent_translated",
+                    "total_segments",
+                    "translated_segments",
+                )
+            } == expected
+
+
+class TestAliasPages:
+    """Tests for the progress of alias pages."""
+
+    @pytest.fixture
+    def alias_page(self, page_with_translations):
+        """Alias a new English page into German, like wagtail-localize's synctree."""
+        en_page = page_with_translations["en_page"]
+        de_locale = page_with_translations["de_locale"]
+        page = en_page.get_parent().add_child(
+            instance=Page(
+                title="Aliased Page", slug="aliased-page", locale=en_page.locale
+            )
+        )
+        alias = page.create_alias(
+            parent=page_with_translations["de_page"].get_parent(),
+            update_locale=de_locale,
+            reset_translation_key=False,
+        )
+        return {"page": page, "alias": alias}
+
+    def test_alias_is_complete_without_counting(self, alias_page):
+        """Test that aliases are 100% translated without any source search."""
+        page, alias = alias_page["page"], alias_page["alias"]
+
+        with patch(
+            "wagtail_localize_dashboard.utils._get_translation_graph"
+        ) as get_translation_graph:
+            with CaptureQueriesContext(connection) as queries:
+                progress = get_batch_progress([page], with_counts=True)
+
+        assert progress == {(page.id, alias.id): (100, 0, 0)}
+        assert get_batch_progress([page]) == {(page.id, alias.id): 100}
+        get_translation_graph.assert_not_called()
+        assert len(queries.captured_queries) == 2
+
+    def test_alias_is_marked(self, alias_page):
+        """Test that every path stores aliases with the alias marker."""
+        page, alias = alias_page["page"], alias_page["alias"]
+
+        for update in [lambda: create_translation_progress(page), rebuild_all_progress]:
+            TranslationProgress.objects.all().delete()
+            update()
+
+            progress = TranslationProgress.objects.get(translated_page=alias)
+            assert progress.is_alias
+            assert progress.percent_translated == 100
+            assert progress.to_dict()["is_alias"]
+            assert not TranslationProgress.objects.filter(is_alias=True).exclude(
+                translated_page=alias
+            )
+
+    def test_unchanged_alias_is_not_written(self, alias_page):
+        """Test that an alias that is still an alias is not written again."""
+        page = alias_page["page"]
+        create_translation_progress(page)
+
+        assert save_batch_progress(get_batch_progress([page], with_counts=True)) == 0
+
+    def test_converted_alias_is_recalculated(self, alias_page, page_with_translations):
+        """Test that an alias turned into a translation loses the marker."""
+        page, alias = alias_page["page"], alias_page["alias"]
+        create_translation_progress(page)
+
+        # wagtail-localize converts the alias when it is first translated
+        alias.alias_of = None
+        alias.save(update_fields=["alias_of"])
+        source, _ = TranslationSource.get_or_create_from_instance(page)
+        Translation.objects.create(
+            source=source, target_locale=page_with_translations["de_locale"]
+        )
+        create_translation_progress(page)
+
+        progress = TranslationProgress.objects.get(translated_page=alias)
+        assert not progress.is_alias
+        assert progress.percent_translated == 0
+        assert progress.total_segments > 0
+
+
+class TestGetPagesForStrings:
+    """Tests for finding the pages that use translated strings."""
+
+    def test_finds_original_pages_in_two_queries(self, translated_pages):
+        """Test that the original page of every source is found with two queries."""
+        strings = [
+            (segment.string_id, segment.context_id)
+            for segment in StringSegment.objects.filter(
+                source__object_id__in=[
+                    page.translation_key for page in translated_pages
+                ]
+            )
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            pages = list(get_pages_for_strings(strings))
+
+        assert len(queries.captured_queries) == 2
+        assert sorted(page.id for page in pages) == sorted(
+            page.id for page in translated_pages
+        )
+
+    def test_context_must_match(self, translated_pages):
+        """Test that a string in another context does not match."""
+        first, second = StringSegment.objects.filter(
+            source__object_id=translated_pages[0].translation_key
+        ).order_by("order")[:2]
+
+        assert list(get_pages_for_strings([(first.string_id, second.context_id)])) == []
+        assert list(get_pages_for_strings([])) == []
+
+    def test_many_strings(self, translated_pages):
+        """Test that a few hundred strings are looked up in chunks."""
+        page = translated_pages[0]
+        segment = StringSegment.objects.filter(
+            source__object_id=page.translation_key
+        ).first()
+        strings = []
+        for index in range(600):
+            string = String.from_value(
+                page.locale, StringValue.from_plaintext(f"Shared string {index}")
+            )
+            StringSegment.objects.create(
+                source=segment.source,
+                string=string,
+                context=segment.context,
+                order=1000 + index,
+            )
+            strings.append((string.pk, segment.context_id))
+
+        with CaptureQueriesContext(connection) as queries:
+            pages = list(get_pages_for_strings(strings))
+
+        assert [page.id for page in pages] == [page.id]
+        # Two chunks of strings, then the pages
+        assert len(queries.captured_queries) == 3
+
+
+class TestTranslationProgressQueue:
+    """Tests for queueing progress updates in TranslationProgressQueue."""
+
+    def get_markers(self):
+        """Get the queued (translation_key, string_id, locale_id) markers."""
+        return sorted(
+            TranslationProgressQueue.objects.values_list(
+                "translation_key", "string_id", "locale_id"
+            ),
+            key=str,
+        )
+
+    def test_queue_writes_one_marker_per_locale(self, translated_pages):
+        """Test that every key and locale, and every string, is queued once."""
+        first, second, third = translated_pages
+        de_locale = Locale.objects.get(language_code="de")
+        fr_locale = Locale.objects.get(language_code="fr")
+        segment = StringSegment.objects.filter(
+            source__object_id=third.translation_key
+        ).first()
+
+        with CaptureQueriesContext(connection) as queries:
+            count = queue_translation_progress(
+                {
+                    "relink": {second.translation_key},
+                    "progress": {
+                        first.translation_key: {de_locale.pk, fr_locale.pk},
+                        second.translation_key: {de_locale.pk},
+                    },
+                    "strings": {
+                        (segment.string_id, segment.context_id, fr_locale.pk),
+                        (segment.string_id, None, fr_locale.pk),
+                    },
+                }
+            )
+
+        # Strings are not resolved to their pages until processed
+        assert len(queries.captured_queries) == 1
+
+        # Relinked keys are recalculated for every locale
+        assert count == 4
+        assert self.get_markers() == sorted(
+            [
+                (first.translation_key, None, de_locale.pk),
+                (first.translation_key, None, fr_locale.pk),
+                (second.translation_key, None, None),
+                (None, segment.string_id, fr_locale.pk),
+            ],
+            key=str,
+        )
+
+    def test_queueing_again_keeps_one_marker(self, translated_pages):
+        """Test that a key, or a string, queued twice keeps its first marker."""
+        page = translated_pages[0]
+        de_locale = Locale.objects.get(language_code="de")
+        segment = StringSegment.objects.filter(
+            source__object_id=page.translation_key
+        ).first()
+
+        for locale_ids in [{de_locale.pk}, None]:
+            updates = {
+                "relink": set(),
+                "progress": {page.translation_key: locale_ids},
+                "strings": {(segment.string_id, segment.context_id, de_locale.pk)},
+            }
+            queue_translation_progress(updates)
+            marker_ids = set(TranslationProgressQueue.objects.values_list("pk"))
+            queue_translation_progress(updates)
+
+            assert set(TranslationProgressQueue.objects.values_list("pk")) == (
+                marker_ids
+            )
+
+        assert TranslationProgressQueue.objects.count() == 3
+
+    def test_process_recalculates_and_removes_markers(self, translated_pages):
+        """Test that processing stores progress and empties the queue."""
+        TranslationProgress.objects.all().delete()
+        queue_translation_progress(
+            {
+                "relink": set(),
+                "progress": {page.translation_key: None for page in translated_pages},
+                "strings": set(),
+            }
+        )
+
+        assert process_translation_progress_queue() == 3
+        assert not TranslationProgressQueue.objects.exists()
+        assert process_translation_progress_queue() == 0
+
+        assert {
+            (progress.source_page_id, progress.translated_page_id): (
+                progress.percent_translated
+            )
+            for progress in TranslationProgress.objects.all()
+        } == expected_progress(translated_pages)
+
+    def test_process_limits_batch_size(self, translated_pages):
+        """Test that the oldest markers are processed first, in batches."""
+        for page in translated_pages:
+            queue_translation_progress(
+                {
+                    "relink": set(),
+                    "progress": {page.translation_key: None},
+                    "strings": set(),
+                }
+            )
+
+        assert process_translation_progress_queue(batch_size=2) == 2
+        assert self.get_markers() == [(translated_pages[2].translation_key, None, None)]
+
+    def test_process_merges_markers_of_a_key(self, translated_pages):
+        """Test that the markers of one key are recalculated together."""
+        page = translated_pages[0]
+        de_locale = Locale.objects.get(language_code="de")
+        for locale_ids in [{de_locale.pk}, None]:
+            queue_translation_progress(
+                {
+                    "relink": set(),
+                    "progress": {page.translation_key: locale_ids},
+                    "strings": set(),
+                }
+            )
+
+        with patch(
+            "wagtail_localize_dashboard.utils.apply_progress_updates"
+        ) as apply_updates:
+            assert process_translation_progress_queue() == 2
+
+        apply_updates.assert_called_once_with(
+            {
+                "relink": {page.translation_key},
+                "progress": {page.translation_key: None},
+                "strings": set(),
+            }
+        )
+
+    def test_process_resolves_strings(self, translated_pages):
+        """Test that queued strings recalculate the pages using them."""
+        page = translated_pages[0]
+        fr_locale = Locale.objects.get(language_code="fr")
+        segment = StringSegment.objects.filter(
+            source__object_id=page.translation_key
+        ).first()
+        queue_translation_progress(
+            {
+                "relink": set(),
+                "progress": {},
+                "strings": {(segment.string_id, segment.context_id, fr_locale.pk)},
+            }
+        )
+
+        with patch(
+            "wagtail_localize_dashboard.utils.update_translation_keys_progress"
+        ) as update_progress:
+            assert process_translation_progress_queue() == 1
+
+        update_progress.assert_called_once_with({page.translation_key: {fr_locale.pk}})
+        assert not TranslationProgressQueue.objects.exists()
+
+    def test_failed_batch_stays_queued(self, translated_pages):
+        """Test that markers are kept when their batch fails."""
+        page = translated_pages[0]
+        queue_translation_progress(
+            {
+                "relink": set(),
+                "progress": {page.translation_key: None},
+                "strings": set(),
+            }
+        )
+
+        with patch(
+            "wagtail_localize_dashboard.utils.update_translation_keys_progress",
+            side_effect=RuntimeError("boom"),
+        ):
+            with pytest.raises(RuntimeError):
+                process_translation_progress_queue()
+
+        assert self.get_markers() == [(page.translation_key, None, None)]
+
+    def test_key_queued_again_during_processing_stays_queued(self, translated_pages):
+        """Test that a key queued while its batch is processed is not lost."""
+        page = translated_pages[0]
+        updates = {
+            "relink": set(),
+            "progress": {page.translation_key: None},
+            "strings": set(),
+        }
+        queue_translation_progress(updates)
+
+        def requeue(progress):
+            # The key's page changes again after its marker was claimed
+            queue_translation_progress(updates)
+            return update_translation_keys_progress(progress)
+
+        with patch(
+            "wagtail_localize_dashboard.utils.update_translation_keys_progress",
+            side_effect=requeue,
+        ):
+            assert process_translation_progress_queue() == 1
+
+        assert self.get_markers() == [(page.translation_key, None, None)]
+        assert process_translation_progress_queue() == 1
+        assert not TranslationProgressQueue.objects.exists()
+
+    def test_process_claims_markers_with_skip_locked(self, translated_pages):
+        """Test that concurrent processors skip each other's markers."""
+        if not connection.features.has_select_for_update_skip_locked:
+            pytest.skip("The database does not support SKIP LOCKED")
+
+        queue_translation_progress(
+            {
+                "relink": set(),
+                "progress": {translated_pages[0].translation_key: None},
+                "strings": set(),
+            }
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            process_translation_progress_queue()
+
+        assert any("SKIP LOCKED" in query["sql"] for query in queries.captured_queries)
+
+
+class TestScopedRebuild:
+    """Tests for rebuilds scoped by locale, subtree or translation key."""
+
+    def test_translation_key(self, translated_pages):
+        """Test that translation_key selects a single original page."""
+        page = translated_pages[1]
+
+        pages = get_pages_to_rebuild(translation_key=page.translation_key)
+
+        assert list(pages) == [page]
+
+    def test_root_page(self, translated_pages, page_with_translations):
+        """Test that root_page selects originals with a version in the subtree."""
+        en_page = page_with_translations["en_page"]
+        de_page = page_with_translations["de_page"]
+
+        # The original itself is in the subtree
+        assert list(get_pages_to_rebuild(root_page=translated_pages[0])) == [
+            translated_pages[0]
+        ]
+        # Only a translation is in the subtree
+        assert list(get_pages_to_rebuild(root_page=de_page)) == [en_page]
+        # Every original is under the section
+        assert (
+            get_pages_to_rebuild(root_page=en_page.get_parent()).count()
+            == get_original_objects(Page).count()
+        )
+
+    def test_locale(self, translated_pages, page_with_translations):
+        """Test that locale selects originals translated into that locale."""
+        de_locale = page_with_translations["de_locale"]
+        en_locale = page_with_translations["en_locale"]
+        translated_pages[0].get_translation(de_locale).delete()
+
+        pages = get_pages_to_rebuild(locale=de_locale)
+
+        assert translated_pages[0] not in pages
+        assert pages.count() == get_original_objects(Page).count() - 1
+        assert not get_pages_to_rebuild(locale=en_locale).exists()
+
+    def test_locale_only_writes_that_locale(
+        self, translated_pages, page_with_translations
+    ):
+        """Test that a locale rebuild leaves other locales alone."""
+        de_locale = page_with_translations["de_locale"]
+        fr_locale = page_with_translations["fr_locale"]
+        original_pages = list(get_original_objects(Page))
+        expected = expected_progress(original_pages)
+        TranslationProgress.objects.filter(translated_page__locale=fr_locale).update(
+            percent_translated=55
+        )
+        TranslationProgress.objects.filter(translated_page__locale=de_locale).delete()
+
+        stats = rebuild_all_progress(locale=de_locale)
+
+        assert stats == {"pages": len(original_pages), "errors": 0}
+        for progress in TranslationProgress.objects.select_related("translated_page"):
+            key = (progress.source_page_id, progress.translated_page_id)
+            if progress.translated_page.locale_id == de_locale.id:
+                assert progress.percent_translated == expected[key]
+            else:
+                assert progress.percent_translated == 55
+
+    def test_batch_progress_for_locales(self, translated_pages, page_with_translations):
+        """Test that get_batch_progress can be limited to some locales."""
+        de_locale = page_with_translations["de_locale"]
+        expected = get_batch_progress(translated_pages)
+
+        progress = get_batch_progress(translated_pages, locales=[de_locale])
+
+        assert progress == {
+            key: percent
+            for key, percent in expected.items()
+            if Page.objects.get(id=key[1]).locale_id == de_locale.id
+        }
+        assert progress
+
+
+class TestStreamingRebuild:
+    """Tests for the bounded-memory behaviour of rebuild_all_progress."""
+
+    def test_batches_only_load_needed_columns(self, translated_pages):
+        """Test that batches hold deferred pages with the needed columns."""
+        batches = []
+
+        def record_batch(batch, **kwargs):
+            batches.append(batch)
+            return get_batch_progress(batch, **kwargs)
+
+        with patch(
+            "wagtail_localize_dashboard.utils.get_batch_progress",
+            side_effect=record_batch,
+        ):
+            stats = rebuild_all_progress(batch_size=2)
+
+        assert [len(batch) for batch in batches] == [2, 2]
+        assert stats == {"pages": 4, "errors": 0}
+        for page in batches[0]:
+            assert "title" in page.get_deferred_fields()
+            assert "translation_key" not in page.get_deferred_fields()
+            assert "locale_id" not in page.get_deferred_fields()
+
+    def test_pages_deleted_during_run_are_skipped(self, translated_pages):
+        """Test that pages deleted after the ids were read are skipped."""
+        original_count = get_original_objects(Page).count()
+
+        def delete_page_then_calculate(batch, **kwargs):
+            Page.objects.filter(id=translated_pages[-1].id).delete()
+            return get_batch_progress(batch, **kwargs)
+
+        with patch(
+            "wagtail_localize_dashboard.utils.get_batch_progress",
+            side_effect=delete_page_then_calculate,
+        ):
+            stats = rebuild_all_progress(batch_size=original_count - 1)
+
+        assert stats == {"pages": original_count - 1, "errors": 0}
+
+    def test_get_peak_memory_mb(self):
+        """Test that the peak memory is reported in megabytes."""
+        peak_memory = get_peak_memory_mb()
+
+        assert peak_memory is None or 1 < peak_memory < 1024 * 1024
+
+
+class TestRebuildProgressReports:
+    """Tests for the progress_callback of the rebuild functions."""
+
+    def test_reports_every_batch(self, translated_pages):
+        """Test that the callback gets a report after selecting and per batch."""
+        original_count = get_original_objects(Page).count()
+        TranslationProgress.objects.all().delete()
+        reports = []
+
+        with CaptureQueriesContext(connection) as queries:
+            rebuild_all_progress(
+                batch_size=2,
+                progress_callback=lambda report: reports.append(copy.deepcopy(report)),
+            )
+
+        assert [report["pages"] for report in reports] == [0, 2, 4]
+        assert all(report["total"] == original_count for report in reports)
+        assert reports[-1]["errors"] == 0
+        assert reports[-1]["rows"] == TranslationProgress.objects.count()
+        assert reports[-1]["queries"] == len(queries.captured_queries)
+        assert set(reports[-1]["timings"]) == {"select", "calculate", "write"}
+        assert reports[0]["timings"]["calculate"] == 0
+        assert all(seconds >= 0 for seconds in reports[-1]["timings"].values())
+
+    def test_reports_unchanged_rows_as_not_written(self, translated_pages):
+        """Test that only rows that were written are counted."""
+        rebuild_all_progress()
+        reports = []
+
+        rebuild_all_progress(progress_callback=reports.append)
+
+        assert reports[-1]["rows"] == 0
+
+    @patch("wagtail_localize_dashboard.utils.ProcessPoolExecutor", SynchronousExecutor)
+    def test_parallel_merges_worker_reports(self, translated_pages):
+        """Test that the parallel rebuild reports the merged worker reports."""
+        original_count = get_original_objects(Page).count()
+        TranslationProgress.objects.all().delete()
+        reports = []
+
+        rebuild_all_progress_parallel(
+            workers=2,
+            progress_callback=lambda report: reports.append(copy.deepcopy(report)),
+        )
+
+        assert len(reports) == 2
+        assert reports[-1]["pages"] == original_count
+        assert reports[-1]["total"] == original_count
+        assert reports[-1]["rows"] == TranslationProgress.objects.count()
+        assert reports[-1]["queries"] > 0
+
+
+class TestRebuildAllProgressParallel:
+    """Tests for rebuild_all_progress_parallel and its page ranges."""
+
+    def test_get_original_page_ranges(self, translated_pages):
+        """Test that ranges cover every original page exactly once."""
+        original_ids = sorted(get_original_objects(Page).values_list("id", flat=True))
+
+        ranges = get_original_page_ranges(3)
+
+        assert len(ranges) == 3
+        assert sum(count for _, _, count in ranges) == len(original_ids)
+        assert ranges[0][0] == original_ids[0]
+        assert ranges[-1][1] == original_ids[-1]
+        for (_, previous_max, _), (next_min, _, _) in zip(ranges, ranges[1:]):
+            assert previous_max < next_min
+
+    def test_get_original_page_ranges_more_parts_than_pages(self, translated_pages):
+        """Test that no empty ranges are returned."""
+        original_count = get_original_objects(Page).count()
+
+        ranges = get_original_page_ranges(100)
+
+        assert len(ranges) == original_count
+        assert all(count == 1 for _, _, count in ranges)
+
+    def test_rebuild_all_progress_by_page_range(self, translated_pages):
+        """Test that min_page_id and max_page_id limit the rebuilt pages."""
+        TranslationProgress.objects.all().delete()
+
+        stats = rebuild_all_progress(
+            min_page_id=translated_pages[1].id, max_page_id=translated_pages[2].id
+        )
+
+        assert stats == {"pages": 2, "errors": 0}
+        assert set(
+            TranslationProgress.objects.values_list("source_page_id", flat=True)
+        ) == {translated_pages[1].id, translated_pages[2].id}
+
+    @patch("wagtail_localize_dashboard.utils.ProcessPoolExecutor", SynchronousExecutor)
+    def test_rebuild_all_progress_parallel_merges_stats(self, translated_pages):
+        """Test that stats from every worker are merged."""
+        original_pages = list(get_original_objects(Page))
+        expected = expected_progress(original_pages)
+        TranslationProgress.objects.all().delete()
+
+        stats = rebuild_all_progress_parallel(workers=2, batch_size=1)
+
+        assert stats == {"pages": len(original_pages), "errors": 0}
+        assert {
+            (progress.source_page_id, progress.translated_page_id): (
+                progress.percent_translated
+            )
+            for progress in TranslationProgress.objects.all()
+        } == expected
+
+    @patch("wagtail_localize_dashboard.utils.ProcessPoolExecutor", SynchronousExecutor)
+    def test_rebuild_all_progress_parallel_counts_failed_worker(self, translated_pages):
+        """Test that a crashed worker counts its whole range as errors."""
+        original_count = get_original_objects(Page).count()
+
+        with patch(
+            "wagtail_localize_dashboard.utils.rebuild_all_progress",
+            side_effect=RuntimeError("Worker died"),
+        ):
+            stats = rebuild_all_progress_parallel(workers=2)
+
+        assert stats == {"pages": 0, "errors": original_count}
+
+    @pytest.mark.parametrize(
+        "start_method",
+        [
+            method
+            for method in ("fork", "forkserver", "spawn")
+            if method in multiprocessing.get_all_start_methods()
+        ],
+    )
+    def test_worker_process_starts(self, start_method):
+        """Test that a real worker process sets Django up under every start method."""
+        with ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context(start_method),
+            initializer=init_rebuild_worker,
+        ) as executor:
+            assert executor.submit(worker_is_ready).result(timeout=60) is True
+
+    @override_settings(WAGTAIL_LOCALIZE_DASHBOARD_TRACK_PAGES=False)
+    def test_rebuild_all_progress_parallel_respects_track_pages(self, translated_pages):
+        """Test that no workers are started when TRACK_PAGES is False."""
+        with patch("wagtail_localize_dashboard.utils.ProcessPoolExecutor") as pool:
+            stats = rebuild_all_progress_parallel(workers=2)
+
+        assert stats == {"pages": 0, "errors": 0}
+        pool.assert_not_called()
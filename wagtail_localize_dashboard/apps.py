@@ -15,7 +15,7 @@ class DashboardConfig(AppConfig):
         Called when Django starts.
 
         - Check wagtail-localize is installed
-        - Import signal handlers
+        - Import signal handlers and connect them to the page models
         - Import wagtail hooks
         """
         # Check dependencies
@@ -27,7 +27,9 @@ class DashboardConfig(AppConfig):
             )
 
         # Import signal handlers (registers them)
-        from . import signals  # noqa
+        from . import signals
+
+        signals.connect_page_signals()
 
         # Import wagtail hooks (registers menu items)
         from . import wagtail_hooks  # noqa
@@ -0,0 +1,409 @@
+"""
+Progress calculators for wagtail-localize-dashboard.
+
+A calculator counts the total and translated segments of translations.
+The one in use is selected with the WAGTAIL_LOCALIZE_DASHBOARD_PROGRESS_CALCULATOR
+setting, as a dotted path to a ``BaseProgressCalculator`` subclass.
+
+The total number of segments of a TranslationSource only changes when it is
+re-synced, so ``get_segment_totals`` caches it per ``last_updated_at``.
+"""
+
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from itertools import chain
+from typing import TYPE_CHECKING, Dict, Iterable, Tuple
+
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import Count, Exists, F, OuterRef, Q, QuerySet
+from django.utils.module_loading import import_string
+
+from wagtail_localize.models import (
+    StringSegment,
+    StringTranslation,
+    Translation,
+    TranslationSource,
+)
+
+from .settings import get_setting
+
+if TYPE_CHECKING:
+    import numpy
+
+SEGMENT_TOTALS_KEY_PREFIX = "wagtail_localize_dashboard:segment_totals"
+
+# Optional in-process LRU in front of the Django cache, keyed like the cache
+_segment_totals = OrderedDict()
+_segment_totals_lock = threading.Lock()
+
+
+def _get_segment_totals_key(source_id: int, last_updated_at: datetime) -> str:
+    """Get the cache key of a source's segment total as of a sync."""
+    return f"{SEGMENT_TOTALS_KEY_PREFIX}:{source_id}:{last_updated_at.isoformat()}"
+
+
+def get_segment_totals(sources: Dict[int, datetime]) -> Dict[int, int]:
+    """
+    Get the total number of segments of many TranslationSources.
+
+    Totals are read from the Django cache selected by SEGMENT_TOTALS_CACHE,
+    and the ones missing are counted with one grouped query and stored.
+    Entries are keyed on the source's ``last_updated_at``, so a re-synced
+    source is recounted in every process without any invalidation.
+    SEGMENT_TOTALS_CACHE_SIZE adds an in-process LRU in front of the cache,
+    which ``invalidate_segment_totals`` can only clear in the current process.
+
+    Args:
+        sources: dict mapping TranslationSource ids to their ``last_updated_at``
+
+    Returns:
+        dict mapping each source id to its number of segments
+
+    Example:
+        >>> get_segment_totals({source.pk: source.last_updated_at})
+        {12: 34}
+    """
+    lru_size = get_setting("SEGMENT_TOTALS_CACHE_SIZE")
+    cache_alias = get_setting("SEGMENT_TOTALS_CACHE")
+    keys = {
+        _get_segment_totals_key(source_id, last_updated_at): source_id
+        for source_id, last_updated_at in sources.items()
+    }
+
+    totals = {}
+    if lru_size:
+        with _segment_totals_lock:
+            for key, source_id in keys.items():
+                if key in _segment_totals:
+                    _segment_totals.move_to_end(key)
+                    totals[source_id] = _segment_totals[key]
+
+    missing = [key for key, source_id in keys.items() if source_id not in totals]
+    cached = {}
+    if missing and cache_alias:
+        cached = caches[cache_alias].get_many(missing)
+        totals.update({keys[key]: total for key, total in cached.items()})
+
+    uncounted = [key for key in missing if key not in cached]
+    if uncounted:
+        counts = dict(
+            StringSegment.objects.filter(source_id__in=[keys[key] for key in uncounted])
+            .order_by()
+            .values("source_id")
+            .annotate(total=Count("pk"))
+            .values_list("source_id", "total")
+        )
+        # Sources without segments are cached with a total of 0
+        counted = {key: counts.get(keys[key], 0) for key in uncounted}
+        totals.update({keys[key]: total for key, total in counted.items()})
+        if cache_alias:
+            caches[cache_alias].set_many(counted)
+
+    if lru_size:
+        with _segment_totals_lock:
+            for key in missing:
+                _segment_totals[key] = totals[keys[key]]
+                _segment_totals.move_to_end(key)
+            while len(_segment_totals) > lru_size:
+                _segment_totals.popitem(last=False)
+
+    return totals
+
+
+def invalidate_segment_totals(source_id: int, last_updated_at: datetime) -> None:
+    """
+    Drop the cached segment total of a TranslationSource as of a sync.
+
+    wagtail-localize saves a re-synced source before refreshing its
+    segments, so a total counted in between would otherwise stay cached
+    under the new ``last_updated_at``. Called once per source when the
+    transaction that saved it commits.
+
+    Args:
+        source_id: Id of the re-synced TranslationSource
+        last_updated_at: The ``last_updated_at`` it was saved with
+    """
+    key = _get_segment_totals_key(source_id, last_updated_at)
+    with _segment_totals_lock:
+        _segment_totals.pop(key, None)
+
+    cache_alias = get_setting("SEGMENT_TOTALS_CACHE")
+    if cache_alias:
+        caches[cache_alias].delete(key)
+
+
+def clear_segment_totals_cache() -> None:
+    """Empty the in-process LRU of segment totals."""
+    with _segment_totals_lock:
+        _segment_totals.clear()
+
+
+class BaseProgressCalculator:
+    """
+    Base class for progress calculators.
+
+    Subclasses implement ``get_batch_progress``. ``get_progress`` calculates
+    a single Translation through it, and can be overridden when a cheaper
+    way exists for one translation.
+    """
+
+    def get_progress(self, translation: Translation) -> Tuple[int, int]:
+        """
+        Count the segments of one Translation.
+
+        Args:
+            translation: The Translation to count
+
+        Returns:
+            tuple: (total_segments, translated_segments)
+        """
+        pair = (translation.source_id, translation.target_locale_id)
+        return self.get_batch_progress([pair])[pair]
+
+    def get_batch_progress(
+        self, translation_pairs: Iterable[Tuple[int, int]]
+    ) -> Dict[Tuple[int, int], Tuple[int, int]]:
+        """
+        Count the segments of many translations at once.
+
+        Args:
+            translation_pairs: Iterable of (translation_source_id, locale_id)
+                tuples
+
+        Returns:
+            dict mapping each pair to a (total_segments, translated_segments)
+            tuple
+        """
+        raise NotImplementedError
+
+
+class DefaultProgressCalculator(BaseProgressCalculator):
+    """
+    Calculate progress the way wagtail-localize does.
+
+    Single translations use ``Translation.get_progress()``. Batches count
+    the translated segments of every pair with one grouped query, which
+    also reads the sources' ``last_updated_at`` so their totals can come
+    from ``get_segment_totals``. Only the totals missing from the cache
+    take a second query.
+    """
+
+    def get_progress(self, translation: Translation) -> Tuple[int, int]:
+        """Count the segments of one Translation with wagtail-localize."""
+        return translation.get_progress()
+
+    def get_batch_progress(
+        self, translation_pairs: Iterable[Tuple[int, int]]
+    ) -> Dict[Tuple[int, int], Tuple[int, int]]:
+        """Count the segments of many translations with cached totals."""
+        translation_pairs = set(translation_pairs)
+        if not translation_pairs:
+            return {}
+
+        source_ids = {source_id for source_id, _ in translation_pairs}
+        locale_ids = sorted({locale_id for _, locale_id in translation_pairs})
+
+        # Translated segments per source and locale. A StringTranslation is
+        # unique per (locale, string, context), so each segment matches at
+        # most once per locale, mirroring the Exists() subquery used by
+        # get_progress().
+        translated_counts = {
+            f"translated_{locale_id}": Count(
+                "stringsegment",
+                filter=Q(
+                    stringsegment__string__translations__locale_id=locale_id,
+                    stringsegment__string__translations__context_id=F(
+                        "stringsegment__context_id"
+                    ),
+                    stringsegment__string__translations__has_error=False,
+                ),
+            )
+            for locale_id in locale_ids
+        }
+        sources = {
+            row["pk"]: row
+            for row in TranslationSource.objects.filter(pk__in=source_ids)
+            .order_by()
+            .values("pk", "last_updated_at")
+            .annotate(**translated_counts)
+        }
+
+        totals = get_segment_totals(
+            {source_id: row["last_updated_at"] for source_id, row in sources.items()}
+        )
+
+        progress = {}
+        for source_id, locale_id in translation_pairs:
+            row = sources.get(source_id)
+            progress[(source_id, locale_id)] = (
+                (totals[source_id], row[f"translated_{locale_id}"]) if row else (0, 0)
+            )
+        return progress
+
+
+class SQLAggregateProgressCalculator(BaseProgressCalculator):
+    """
+    Calculate progress with a single aggregate query.
+
+    Every count, for single translations and batches, comes from one
+    grouped query over the segments. The query has a conditional count per
+    target locale, using the same ``Exists()`` subquery as
+    ``Translation.get_progress()``.
+    """
+
+    def get_batch_progress(
+        self, translation_pairs: Iterable[Tuple[int, int]]
+    ) -> Dict[Tuple[int, int], Tuple[int, int]]:
+        """Count the segments of many translations with one grouped query."""
+        translation_pairs = set(translation_pairs)
+        if not translation_pairs:
+            return {}
+
+        source_ids = {source_id for source_id, _ in translation_pairs}
+        locale_ids = sorted({locale_id for _, locale_id in translation_pairs})
+
+        translated_counts = {
+            f"translated_{locale_id}": Count(
+                "pk",
+                filter=Q(
+                    Exists(
+                        StringTranslation.objects.filter(
+                            translation_of_id=OuterRef("string_id"),
+                            context_id=OuterRef("context_id"),
+                            locale_id=locale_id,
+                            has_error=False,
+                        )
+                    )
+                ),
+            )
+            for locale_id in locale_ids
+        }
+        counts = {
+            row["source_id"]: row
+            for row in StringSegment.objects.filter(source_id__in=source_ids)
+            .order_by()
+            .values("source_id")
+            .annotate(total=Count("pk"), **translated_counts)
+        }
+
+        progress = {}
+        for source_id, locale_id in translation_pairs:
+            row = counts.get(source_id)
+            progress[(source_id, locale_id)] = (
+                (row["total"], row[f"translated_{locale_id}"]) if row else (0, 0)
+            )
+        return progress
+
+
+class NumPyProgressCalculator(BaseProgressCalculator):
+    """
+    Calculate progress with NumPy, for full rebuilds of large sites.
+
+    A batch reads its segments and their error-free translations as two
+    flat integer columns, and counts every pair with ``numpy.bincount``
+    instead of aggregating in the database. Requires the ``numpy`` extra.
+    """
+
+    def __init__(self) -> None:
+        try:
+            import numpy
+        except ImportError as e:
+            raise ImproperlyConfigured(
+                "NumPyProgressCalculator requires NumPy. Install it with: "
+                "pip install wagtail-localize-dashboard[numpy]"
+            ) from e
+        self.numpy = numpy
+
+    def get_batch_progress(
+        self, translation_pairs: Iterable[Tuple[int, int]]
+    ) -> Dict[Tuple[int, int], Tuple[int, int]]:
+        """Count the segments of many translations with two columnar reads."""
+        np = self.numpy
+        translation_pairs = set(translation_pairs)
+        if not translation_pairs:
+            return {}
+
+        source_ids = np.array(
+            sorted({source_id for source_id, _ in translation_pairs}), dtype=np.int64
+        )
+        locale_ids = {locale_id for _, locale_id in translation_pairs}
+
+        segments = StringSegment.objects.filter(source_id__in=source_ids.tolist())
+        segment_rows = self.read_columns(
+            segments.values_list("source_id", "string_id", "context_id"), 3
+        )
+        # Translations whose context was deleted never match a segment, and
+        # their NULL context can't be read as an integer
+        translation_rows = self.read_columns(
+            StringTranslation.objects.filter(
+                translation_of_id__in=segments.values("string_id"),
+                locale_id__in=locale_ids,
+                context__isnull=False,
+                has_error=False,
+            ).values_list("locale_id", "translation_of_id", "context_id"),
+            3,
+        )
+
+        # Segments are counted per position of their source in source_ids
+        positions = np.searchsorted(source_ids, segment_rows[:, 0])
+        totals = np.bincount(positions, minlength=len(source_ids))
+
+        # A StringTranslation is unique per (locale, string, context), so a
+        # segment is translated when its (string, context) is in the locale
+        segment_keys = self.combine(segment_rows[:, 1], segment_rows[:, 2])
+        translation_keys = self.combine(translation_rows[:, 1], translation_rows[:, 2])
+        translated = {}
+        for locale_id in locale_ids:
+            is_translated = np.isin(
+                segment_keys, translation_keys[translation_rows[:, 0] == locale_id]
+            )
+            translated[locale_id] = np.bincount(
+                positions, weights=is_translated, minlength=len(source_ids)
+            )
+
+        progress = {}
+        for source_id, locale_id in translation_pairs:
+            position = np.searchsorted(source_ids, source_id)
+            progress[(source_id, locale_id)] = (
+                int(totals[position]),
+                int(translated[locale_id][position]),
+            )
+        return progress
+
+    def read_columns(self, rows: QuerySet, width: int) -> "numpy.ndarray":
+        """Read a values_list() query into a 2D integer array."""
+        np = self.numpy
+        return np.fromiter(
+            chain.from_iterable(rows.iterator()), dtype=np.int64
+        ).reshape(-1, width)
+
+    def combine(
+        self, string_ids: "numpy.ndarray", context_ids: "numpy.ndarray"
+    ) -> "numpy.ndarray":
+        """Combine (string id, context id) columns into one key per row."""
+        return string_ids << 32 | context_ids
+
+
+def get_progress_calculator(
+    setting: str = "PROGRESS_CALCULATOR",
+) -> BaseProgressCalculator:
+    """
+    Get the calculator selected by the PROGRESS_CALCULATOR setting.
+
+    Args:
+        setting: Name of the setting to read instead, such as
+            REBUILD_PROGRESS_CALCULATOR. When it is None, PROGRESS_CALCULATOR
+            is used.
+
+    Returns:
+        An instance of the configured calculator class
+
+    Example:
+        >>> total, translated = get_progress_calculator().get_progress(translation)
+    """
+    calculator_class = get_setting(setting) or get_setting("PROGRESS_CALCULATOR")
+    if isinstance(calculator_class, str):
+        calculator_class = import_string(calculator_class)
+    return calculator_class()
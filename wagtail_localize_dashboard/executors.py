@@ -0,0 +1,140 @@
+"""
+Progress update executors for wagtail-localize-dashboard.
+
+An executor applies the progress updates the signal handlers queued in a
+committed transaction. The one in use is selected with the
+WAGTAIL_LOCALIZE_DASHBOARD_PROGRESS_UPDATE_EXECUTOR setting, as a dotted path
+to a ``BaseProgressUpdateExecutor`` subclass.
+
+The default applies them in the request that made the changes. The thread
+pool executor moves them off the request, the queue table executor leaves
+them to the ``process_translation_progress_queue`` command, and other task
+backends can be plugged in with a subclass that hands the updates to them.
+"""
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from django.db import connections
+from django.utils.module_loading import import_string
+
+from .settings import get_setting
+from .utils import apply_progress_updates, queue_translation_progress
+
+logger = logging.getLogger(__name__)
+
+# One executor per class, so every flush shares the same thread pool
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+class BaseProgressUpdateExecutor:
+    """
+    Base class for progress update executors.
+
+    Subclasses implement ``submit``, which must eventually call
+    ``apply_progress_updates`` with the updates it was given.
+    """
+
+    def submit(self, updates: Dict[str, Any]) -> Optional[Future]:
+        """
+        Apply queued progress updates, now or later.
+
+        Args:
+            updates: The updates queued by the signal handlers, as taken by
+                ``apply_progress_updates``
+
+        Returns:
+            A Future for updates applied in the background, or None
+        """
+        raise NotImplementedError
+
+
+class SynchronousProgressUpdateExecutor(BaseProgressUpdateExecutor):
+    """Apply updates straight away, in the thread that committed them."""
+
+    def submit(self, updates: Dict[str, Any]) -> None:
+        """Apply the updates in this thread."""
+        apply_progress_updates(updates)
+
+
+class ThreadPoolProgressUpdateExecutor(BaseProgressUpdateExecutor):
+    """
+    Apply updates in a pool of PROGRESS_UPDATE_WORKERS background threads.
+
+    At most PROGRESS_UPDATE_QUEUE_SIZE updates wait for or run in the pool.
+    Beyond that they are applied in the committing thread, which slows the
+    requests down instead of letting the backlog grow without limit.
+    Updates still waiting when the process exits are applied before it does.
+    """
+
+    def __init__(self) -> None:
+        self.pool = ThreadPoolExecutor(
+            max_workers=get_setting("PROGRESS_UPDATE_WORKERS"),
+            thread_name_prefix="wagtail-localize-dashboard",
+        )
+        self.slots = threading.BoundedSemaphore(
+            get_setting("PROGRESS_UPDATE_QUEUE_SIZE")
+        )
+
+    def submit(self, updates: Dict[str, Any]) -> Optional[Future]:
+        """Apply the updates in the pool, or in this thread when it is full."""
+        if not self.slots.acquire(blocking=False):
+            apply_progress_updates(updates)
+            return None
+
+        try:
+            return self.pool.submit(self.run, updates)
+        except Exception:
+            self.slots.release()
+            raise
+
+    def run(self, updates: Dict[str, Any]) -> None:
+        """Apply the updates in a worker thread."""
+        try:
+            apply_progress_updates(updates)
+        except Exception as e:
+            logger.exception(f"Error applying progress updates: {e}")
+        finally:
+            self.slots.release()
+            # Worker threads have their own connections, which Django's
+            # request cycle never closes
+            connections.close_all()
+
+
+class QueueTableProgressUpdateExecutor(BaseProgressUpdateExecutor):
+    """
+    Record updates in the TranslationProgressQueue table.
+
+    All the markers of a transaction are written with one insert once it
+    commits, and a rolled back transaction writes none. Progress is
+    recalculated by the ``process_translation_progress_queue`` command.
+    """
+
+    def submit(self, updates: Dict[str, Any]) -> None:
+        """Queue the updates as markers for the queue processor."""
+        queue_translation_progress(updates)
+
+
+def get_progress_update_executor() -> BaseProgressUpdateExecutor:
+    """
+    Get the executor selected by the PROGRESS_UPDATE_EXECUTOR setting.
+
+    Each executor class is only instantiated once per process.
+
+    Returns:
+        The instance of the configured executor class
+
+    Example:
+        >>> get_progress_update_executor().submit(updates)
+    """
+    executor_class = get_setting("PROGRESS_UPDATE_EXECUTOR")
+    if isinstance(executor_class, str):
+        executor_class = import_string(executor_class)
+
+    with _executors_lock:
+        if executor_class not in _executors:
+            _executors[executor_class] = executor_class()
+        return _executors[executor_class]
@@ -0,0 +1,96 @@
+"""Management command to process the translation progress queue."""
+
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from wagtail_localize_dashboard.utils import process_translation_progress_queue
+
+
+class Command(BaseCommand):
+    """
+    Recalculate the progress of the pages queued in TranslationProgressQueue.
+
+    Several processes can consume the queue at once. Without --loop the
+    command exits once the queue is empty.
+
+    Usage:
+        python manage.py process_translation_progress_queue
+        python manage.py process_translation_progress_queue --batch-size 100
+        python manage.py process_translation_progress_queue --loop
+        python manage.py process_translation_progress_queue --loop --interval 1
+    """
+
+    help = "Recalculate the translation progress queued by the signal handlers"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add command arguments."""
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Number of markers claimed per batch "
+            "(default: WAGTAIL_LOCALIZE_DASHBOARD_QUEUE_BATCH_SIZE)",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep waiting for new markers instead of exiting when empty",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5.0,
+            help="With --loop, seconds to wait when the queue is empty (default: 5)",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Execute the command."""
+        started = time.monotonic()
+        processed = 0
+        batches = 0
+        errors = 0
+
+        try:
+            while True:
+                try:
+                    count = process_translation_progress_queue(options["batch_size"])
+                except Exception as e:
+                    # The failed batch stays queued for the next attempt
+                    errors += 1
+                    self.stderr.write(f"Error processing queue: {e}")
+                    if not options["loop"]:
+                        break
+                    time.sleep(options["interval"])
+                    continue
+
+                if count:
+                    processed += count
+                    batches += 1
+                    self.stdout.write(f"  Processed {count} markers")
+                elif options["loop"]:
+                    time.sleep(options["interval"])
+                else:
+                    break
+        except KeyboardInterrupt:
+            self.stdout.write("\nStopping.")
+
+        elapsed = time.monotonic() - started
+
+        self.stdout.write("\nResults:")
+        self.stdout.write(f"  Markers processed: {processed}")
+        self.stdout.write(f"  Batches: {batches}")
+        self.stdout.write(f"  Errors: {errors}")
+        self.stdout.write(f"  Time elapsed: {elapsed:.2f}s")
+
+        if errors:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"\nCompleted with {errors} errors. Failed batches stay queued."
+                )
+            )
+        else:
+            self.stdout.write(
+                self.style.SUCCESS("\nSuccessfully processed the progress queue!")
+            )
@@ -1,9 +1,35 @@
 """Management command to rebuild translation progress cache."""
 
-from django.core.management.base import BaseCommand, CommandParser
+import hashlib
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict
+from uuid import UUID
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
 from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from wagtail.models import Locale, Page
+
+from wagtail_localize_dashboard.models import RebuildCheckpoint
+from wagtail_localize_dashboard.utils import (
+    clean_orphaned_progress,
+    get_peak_memory_mb,
+    get_progress_drift,
+    get_rebuild_checkpoints,
+    get_rebuild_scope,
+    rebuild_all_progress,
+    rebuild_all_progress_parallel,
+)
 
-from wagtail_localize_dashboard.utils import rebuild_all_progress
+# Name the progress of a full rebuild is checkpointed under. Rebuilds with
+# page filters add a digest of them, so they never share a checkpoint.
+CHECKPOINT_NAME = "rebuild_translation_progress"
+
+# Upper bounds (inclusive) of the --dry-run delta histogram buckets
+DRIFT_BUCKETS = (5, 10, 25, 50, 100)
 
 
 class Command(BaseCommand):
@@ -13,6 +39,17 @@ class Command(BaseCommand):
     Usage:
         python manage.py rebuild_translation_progress
         python manage.py rebuild_translation_progress --clean-orphans
+        python manage.py rebuild_translation_progress --batch-size 1000
+        python manage.py rebuild_translation_progress --workers 4
+        python manage.py rebuild_translation_progress --resume
+        python manage.py rebuild_translation_progress --stale-only
+        python manage.py rebuild_translation_progress --since 2025-01-31T02:00
+        python manage.py rebuild_translation_progress --max-memory 256
+        python manage.py rebuild_translation_progress --locale de
+        python manage.py rebuild_translation_progress --root-page 42
+        python manage.py rebuild_translation_progress --translation-key <uuid>
+        python manage.py rebuild_translation_progress --dry-run --diff
+        python manage.py rebuild_translation_progress --json
     """
 
     help = "Rebuild translation progress cache for all translatable objects"
@@ -24,32 +61,377 @@ class Command(BaseCommand):
             action="store_true",
             help="Clean up orphaned progress records first",
         )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Number of original pages processed per batch "
+            "(default: WAGTAIL_LOCALIZE_DASHBOARD_REBUILD_BATCH_SIZE)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of worker processes to rebuild with (default: 1)",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Continue an interrupted rebuild from its last checkpoint",
+        )
+        parser.add_argument(
+            "--stale-only",
+            action="store_true",
+            help="Only rebuild pages whose inputs changed after their stored progress",
+        )
+        parser.add_argument(
+            "--since",
+            type=self.parse_since,
+            default=None,
+            help="Only rebuild pages whose inputs changed after this date or "
+            "ISO 8601 datetime",
+        )
+        parser.add_argument(
+            "--max-memory",
+            type=float,
+            default=None,
+            help="Warn when the peak memory (RSS) of the rebuild exceeds this many MB",
+        )
+        parser.add_argument(
+            "--locale",
+            default=None,
+            help="Only rebuild the progress of translations in this language code",
+        )
+        parser.add_argument(
+            "--root-page",
+            type=int,
+            default=None,
+            help="Only rebuild pages with a version under this page id",
+        )
+        parser.add_argument(
+            "--translation-key",
+            type=UUID,
+            default=None,
+            help="Only rebuild the page with this translation key",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Compare stored progress with fresh percentages without writing",
+        )
+        parser.add_argument(
+            "--diff",
+            action="store_true",
+            help="With --dry-run, list every missing, stale and extra record",
+        )
+        parser.add_argument(
+            "--json",
+            action="store_true",
+            help="Write the final stats as JSON to stdout; progress goes to stderr",
+        )
+
+    def parse_since(self, value: str) -> datetime:
+        """Parse the --since argument into an aware datetime."""
+        since = parse_datetime(value)
+        if since is None:
+            date = parse_date(value)
+            if date is None:
+                raise CommandError(f"Invalid --since value: {value!r}")
+            since = datetime(date.year, date.month, date.day)
+
+        if timezone.is_naive(since):
+            since = timezone.make_aware(since)
+        return since
 
     def handle(self, *args: any, **options: any) -> None:
         """Execute the command."""
         start_time = timezone.now()
+        self.started = time.monotonic()
 
-        self.stdout.write("Starting translation progress rebuild...")
+        # Keep stdout parseable when the stats are written as JSON
+        self.log = self.stdout
+        if options["json"]:
+            self.log = self.stderr
+            self.stderr.style_func = None
+        self.log.write("Starting translation progress rebuild...")
+
+        # Narrow the rebuild before any progress is calculated
+        filters = {
+            "since": options["since"],
+            "stale_only": options["stale_only"],
+            "locale": None,
+            "root_page": None,
+            "translation_key": options["translation_key"],
+        }
+        if options["locale"]:
+            try:
+                filters["locale"] = Locale.objects.get(language_code=options["locale"])
+            except Locale.DoesNotExist:
+                raise CommandError(f"Locale {options['locale']!r} does not exist")
+        if options["root_page"]:
+            try:
+                filters["root_page"] = Page.objects.get(id=options["root_page"])
+            except Page.DoesNotExist:
+                raise CommandError(f"Page {options['root_page']} does not exist")
+
+        if options["diff"] and not options["dry_run"]:
+            raise CommandError("--diff can only be used with --dry-run")
+
+        if options["dry_run"]:
+            self.report_drift(options, filters, start_time)
+            return
+
+        clean_started = time.monotonic()
+        if options["clean_orphans"]:
+            self.log.write("Cleaning orphaned progress records...")
+            deleted = clean_orphaned_progress()
+            self.log.write(f"  {deleted} orphaned records deleted")
+        clean_seconds = time.monotonic() - clean_started
 
         # Rebuild progress
-        self.stdout.write("Rebuilding progress cache...")
-        stats = rebuild_all_progress()
+        workers = options["workers"]
+        resume = options["resume"]
+        parallel = workers > 1
+        checkpoint_name = self.get_checkpoint_name(filters)
+        if resume:
+            checkpoints = get_rebuild_checkpoints(checkpoint_name)
+            if not checkpoints:
+                self.log.write("No checkpoint found, starting from the beginning.")
+                self.report_other_checkpoints(checkpoint_name)
+            for checkpoint in checkpoints:
+                self.log.write(
+                    f"Resuming {checkpoint.name} from page "
+                    f"{checkpoint.next_page_id or 'the first page'}"
+                )
+                # Unfinished worker ranges are resumed with a process pool
+                if checkpoint.name != checkpoint_name:
+                    parallel = True
+
+        self.report = None
+        self.rebuild_started = time.monotonic()
+        try:
+            if parallel:
+                self.log.write(f"Rebuilding progress cache with {workers} workers...")
+                stats = rebuild_all_progress_parallel(
+                    workers,
+                    batch_size=options["batch_size"],
+                    checkpoint=checkpoint_name,
+                    resume=resume,
+                    progress_callback=self.report_progress,
+                    **filters,
+                )
+            else:
+                self.log.write("Rebuilding progress cache...")
+                stats = rebuild_all_progress(
+                    batch_size=options["batch_size"],
+                    checkpoint=checkpoint_name,
+                    resume=resume,
+                    progress_callback=self.report_progress,
+                    **filters,
+                )
+        except ValueError as e:
+            raise CommandError(str(e))
+        rebuild_seconds = time.monotonic() - self.rebuild_started
 
         # Report results
-        elapsed = (timezone.now() - start_time).total_seconds()
+        elapsed = time.monotonic() - self.started
+
+        self.log.write("\nResults:")
+        self.log.write(f"  Pages processed: {stats['pages']}")
+        self.log.write(f"  Errors: {stats['errors']}")
+        self.log.write(f"  Time elapsed: {elapsed:.2f}s")
+
+        peak_memory = get_peak_memory_mb()
+        if options["json"]:
+            report = self.report or {}
+            timings = {
+                "clean_orphans": clean_seconds,
+                **report.get("timings", {}),
+                "total": elapsed,
+            }
+            self.write_json(
+                {
+                    "started_at": start_time.isoformat(),
+                    "workers": workers if parallel else 1,
+                    "total_pages": report.get("total", 0),
+                    "pages": stats["pages"],
+                    "errors": stats["errors"],
+                    "rows_written": report.get("rows", 0),
+                    "queries": report.get("queries", 0),
+                    **self.get_rates(report, rebuild_seconds),
+                    "elapsed_seconds": round(elapsed, 3),
+                    "timings": {
+                        phase: round(seconds, 3) for phase, seconds in timings.items()
+                    },
+                    "peak_memory_mb": (
+                        round(peak_memory, 1) if peak_memory is not None else None
+                    ),
+                }
+            )
+        if peak_memory is not None:
+            self.log.write(f"  Peak memory: {peak_memory:.1f} MB")
 
-        self.stdout.write("\nResults:")
-        self.stdout.write(f"  Pages processed: {stats['pages']}")
-        self.stdout.write(f"  Errors: {stats['errors']}")
-        self.stdout.write(f"  Time elapsed: {elapsed:.2f}s")
+            if options["max_memory"] and peak_memory > options["max_memory"]:
+                self.log.write(
+                    self.style.WARNING(
+                        f"\nPeak memory exceeded --max-memory "
+                        f"({options['max_memory']:.1f} MB). "
+                        "Try a smaller --batch-size."
+                    )
+                )
 
         if stats["errors"] > 0:
-            self.stdout.write(
+            self.log.write(
                 self.style.WARNING(
                     f"\nCompleted with {stats['errors']} errors. Check logs for details."
                 )
             )
         else:
-            self.stdout.write(
+            self.log.write(
                 self.style.SUCCESS("\nSuccessfully rebuilt translation progress!")
             )
+
+    def get_checkpoint_name(self, filters: Dict[str, Any]) -> str:
+        """Get the checkpoint name of a rebuild with these page filters."""
+        scope = get_rebuild_scope(**filters)
+        if not scope:
+            return CHECKPOINT_NAME
+
+        digest = hashlib.sha256(json.dumps(scope, sort_keys=True).encode()).hexdigest()
+        return f"{CHECKPOINT_NAME}@{digest[:12]}"
+
+    def report_other_checkpoints(self, checkpoint_name: str) -> None:
+        """List interrupted rebuilds that were run with other page filters."""
+        scopes = {
+            json.dumps(checkpoint.scope, sort_keys=True)
+            for checkpoint in RebuildCheckpoint.objects.filter(
+                name__startswith=CHECKPOINT_NAME
+            )
+            if checkpoint.name.split(":")[0] != checkpoint_name
+        }
+        for scope in sorted(scopes):
+            self.log.write(
+                self.style.WARNING(
+                    f"  An interrupted rebuild with other filters can be resumed: "
+                    f"{scope if scope != '{}' else 'no filters'}"
+                )
+            )
+
+    def get_rates(self, report: Dict[str, Any], elapsed: float) -> Dict[str, float]:
+        """Calculate the throughput of a rebuild from a progress report."""
+        done = report.get("pages", 0) + report.get("errors", 0)
+        return {
+            "pages_per_second": round(done / elapsed, 2) if elapsed else 0.0,
+            "rows_per_second": (
+                round(report.get("rows", 0) / elapsed, 2) if elapsed else 0.0
+            ),
+            "queries_per_page": (
+                round(report.get("queries", 0) / done, 2) if done else 0.0
+            ),
+        }
+
+    def report_progress(self, report: Dict[str, Any]) -> None:
+        """Write a progress line with the throughput and ETA of the rebuild."""
+        self.report = report
+        done = report["pages"] + report["errors"]
+        total = report["total"]
+        if not done:
+            self.log.write(f"  {total} pages to rebuild")
+            return
+
+        rates = self.get_rates(report, time.monotonic() - self.rebuild_started)
+        percent = done / total * 100 if total else 100.0
+        if rates["pages_per_second"]:
+            remaining = (total - done) / rates["pages_per_second"]
+            eta = str(timedelta(seconds=round(max(remaining, 0))))
+        else:
+            eta = "unknown"
+
+        self.log.write(
+            f"  {done}/{total} pages ({percent:.1f}%) | "
+            f"{rates['pages_per_second']:.1f} pages/s | "
+            f"{rates['rows_per_second']:.1f} rows/s | "
+            f"{rates['queries_per_page']:.1f} queries/page | ETA {eta}"
+        )
+
+    def write_json(self, data: Dict[str, Any]) -> None:
+        """Write machine-readable stats to stdout."""
+        self.stdout.write(json.dumps(data, indent=2, sort_keys=True))
+
+    def report_drift(self, options: dict, filters: dict, start_time: datetime) -> None:
+        """Report how far the stored progress has drifted, without writing."""
+        self.log.write("Dry run, no progress records will be written.")
+        if options["clean_orphans"] or options["resume"] or options["workers"] > 1:
+            self.log.write(
+                "  --clean-orphans, --resume and --workers are ignored; "
+                "orphaned records are reported as extra."
+            )
+
+        self.log.write("Comparing progress cache...")
+        drift = get_progress_drift(batch_size=options["batch_size"], **filters)
+
+        if options["diff"]:
+            self.log.write("\nDiff:")
+            for source_id, translated_id, percent in drift["missing"]:
+                self.log.write(
+                    f"  missing  source={source_id} translated={translated_id} "
+                    f"fresh={percent}%"
+                )
+            for source_id, translated_id, stored, percent in drift["stale"]:
+                self.log.write(
+                    f"  stale    source={source_id} translated={translated_id} "
+                    f"stored={stored}% fresh={percent}% ({percent - stored:+d})"
+                )
+            for source_id, translated_id, stored in drift["extra"]:
+                self.log.write(
+                    f"  extra    source={source_id} translated={translated_id} "
+                    f"stored={stored}%"
+                )
+
+        elapsed = time.monotonic() - self.started
+
+        self.log.write("\nResults:")
+        self.log.write(f"  Pages compared: {drift['pages']}")
+        self.log.write(f"  Missing records: {len(drift['missing'])}")
+        self.log.write(f"  Stale records: {len(drift['stale'])}")
+        self.log.write(f"  Extra records: {len(drift['extra'])}")
+        self.log.write(f"  Time elapsed: {elapsed:.2f}s")
+
+        if drift["stale"]:
+            self.log.write("\nStale delta histogram (percentage points):")
+            counts = [0] * len(DRIFT_BUCKETS)
+            for _, _, stored, percent in drift["stale"]:
+                delta = abs(percent - stored)
+                bucket = next(
+                    i for i, bound in enumerate(DRIFT_BUCKETS) if delta <= bound
+                )
+                counts[bucket] += 1
+
+            width = max(counts)
+            lower = 1
+            for bound, count in zip(DRIFT_BUCKETS, counts):
+                bar = "#" * round(count / width * 40)
+                self.log.write(f"  {lower:>3}-{bound:<3} {count:>7} {bar}")
+                lower = bound + 1
+
+        if options["json"]:
+            self.write_json(
+                {
+                    "started_at": start_time.isoformat(),
+                    "dry_run": True,
+                    "pages": drift["pages"],
+                    "missing": len(drift["missing"]),
+                    "stale": len(drift["stale"]),
+                    "extra": len(drift["extra"]),
+                    "elapsed_seconds": round(elapsed, 3),
+                }
+            )
+
+        if drift["missing"] or drift["stale"] or drift["extra"]:
+            self.log.write(
+                self.style.WARNING(
+                    "\nProgress cache has drifted. Run without --dry-run to rebuild."
+                )
+            )
+        else:
+            self.log.write(self.style.SUCCESS("\nProgress cache is up to date!"))
@@ -0,0 +1,69 @@
+# Bookkeeping table for resumable progress rebuilds
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("wagtail_localize_dashboard", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RebuildCheckpoint",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        help_text="Name of the rebuild run", max_length=255, unique=True
+                    ),
+                ),
+                (
+                    "min_page_id",
+                    models.IntegerField(
+                        blank=True,
+                        help_text="First original page id of the run",
+                        null=True,
+                    ),
+                ),
+                (
+                    "max_page_id",
+                    models.IntegerField(
+                        blank=True,
+                        help_text="Last original page id of the run",
+                        null=True,
+                    ),
+                ),
+                (
+                    "last_page_id",
+                    models.IntegerField(
+                        blank=True,
+                        help_text="Last original page id processed",
+                        null=True,
+                    ),
+                ),
+                (
+                    "scope",
+                    models.JSONField(
+                        blank=True, default=dict, help_text="Page filters of the run"
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Rebuild Checkpoint",
+                "verbose_name_plural": "Rebuild Checkpoints",
+                "ordering": ["name"],
+            },
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Index of the Translation each translated page was produced from
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("wagtailcore", "0001_initial"),
+        ("wagtail_localize", "0001_initial"),
+        ("wagtail_localize_dashboard", "0002_rebuildcheckpoint"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TranslationSourceLink",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "translated_page",
+                    models.OneToOneField(
+                        help_text="The translated page",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="translation_source_link",
+                        to="wagtailcore.page",
+                    ),
+                ),
+                (
+                    "translation",
+                    models.ForeignKey(
+                        help_text="The Translation the page was produced from",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="wagtail_localize.translation",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Translation Source Link",
+                "verbose_name_plural": "Translation Source Links",
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Segment counts behind each stored percentage
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("wagtail_localize_dashboard", "0003_translationsourcelink"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="translationprogress",
+            name="total_segments",
+            field=models.PositiveIntegerField(
+                default=0, help_text="Number of segments to translate"
+            ),
+        ),
+        migrations.AddField(
+            model_name="translationprogress",
+            name="translated_segments",
+            field=models.PositiveIntegerField(
+                default=0, help_text="Number of segments translated"
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Marks progress records of alias pages
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("wagtail_localize_dashboard", "0004_translationprogress_segment_counts"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="translationprogress",
+            name="is_alias",
+            field=models.BooleanField(
+                default=False, help_text="Whether the translated page is an alias"
+            ),
+        ),
+    ]
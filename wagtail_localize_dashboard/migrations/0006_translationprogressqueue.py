@@ -0,0 +1,84 @@
+# Markers of translation keys and strings waiting for a progress recalculation
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("wagtail_localize", "0001_initial"),
+        ("wagtailcore", "0054_initial_locale"),
+        ("wagtail_localize_dashboard", "0005_translationprogress_is_alias"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TranslationProgressQueue",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "translation_key",
+                    models.UUIDField(
+                        blank=True,
+                        help_text="Translation key of the page to recalculate",
+                        null=True,
+                    ),
+                ),
+                (
+                    "dedupe_key",
+                    models.CharField(
+                        help_text="Key, or string and context, and locale of the marker",
+                        max_length=100,
+                        unique=True,
+                    ),
+                ),
+                ("queued_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "context",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Context of the changed string",
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="wagtail_localize.translationcontext",
+                    ),
+                ),
+                (
+                    "locale",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Only recalculate translations into this locale, or every locale",
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="wagtailcore.locale",
+                    ),
+                ),
+                (
+                    "string",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Changed string whose pages to recalculate",
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="wagtail_localize.string",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Translation Progress Queue",
+                "verbose_name_plural": "Translation Progress Queue",
+                "ordering": ["id"],
+            },
+        ),
+    ]
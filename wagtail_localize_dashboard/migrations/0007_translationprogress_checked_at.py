@@ -0,0 +1,21 @@
+# Records when a rebuild last checked each progress record
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("wagtail_localize_dashboard", "0006_translationprogressqueue"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="translationprogress",
+            name="checked_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="When a rebuild last checked the progress against its inputs",
+                null=True,
+            ),
+        ),
+    ]
@@ -1,6 +1,6 @@
 """Models for storing cached translation progress data."""
 
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from django.db import models
 from django.urls import reverse
@@ -39,6 +39,28 @@ class TranslationProgress(models.Model):
         default=0, help_text="Percentage of segments translated (0-100)"
     )
 
+    # Segment counts the percentage was calculated from, so roll-ups can be
+    # summed in SQL instead of averaging truncated percentages
+    total_segments = models.PositiveIntegerField(
+        default=0, help_text="Number of segments to translate"
+    )
+    translated_segments = models.PositiveIntegerField(
+        default=0, help_text="Number of segments translated"
+    )
+
+    # Alias pages mirror the page they alias, so they are always complete
+    is_alias = models.BooleanField(
+        default=False, help_text="Whether the translated page is an alias"
+    )
+
+    # When a rebuild last confirmed the record matches its inputs, even if
+    # nothing had to be rewritten, so incremental rebuilds can skip it
+    checked_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When a rebuild last checked the progress against its inputs",
+    )
+
     # Metadata
     last_updated = models.DateTimeField(auto_now=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -88,6 +110,9 @@ class TranslationProgress(models.Model):
         return {
             "locale": locale,
             "percent_translated": self.percent_translated,
+            "total_segments": self.total_segments,
+            "translated_segments": self.translated_segments,
+            "is_alias": self.is_alias,
             "edit_url": edit_url,
             "view_url": self.get_view_url,
             "last_updated": self.last_updated,
@@ -108,3 +133,175 @@ class TranslationProgress(models.Model):
         if hasattr(self.translated_page, "get_url"):
             return self.translated_page.get_url()
         return ""
+
+
+class RebuildCheckpoint(models.Model):
+    """
+    Bookkeeping for resumable progress rebuilds.
+
+    Records the last original page committed by a ``rebuild_all_progress``
+    run, so an interrupted run can continue from there. Rows are removed
+    once their run completes.
+    """
+
+    name = models.CharField(
+        max_length=255, unique=True, help_text="Name of the rebuild run"
+    )
+
+    # Range of original page ids covered by the run
+    min_page_id = models.IntegerField(
+        null=True, blank=True, help_text="First original page id of the run"
+    )
+    max_page_id = models.IntegerField(
+        null=True, blank=True, help_text="Last original page id of the run"
+    )
+
+    # Last original page id whose batch has been committed
+    last_page_id = models.IntegerField(
+        null=True, blank=True, help_text="Last original page id processed"
+    )
+
+    # Filters the run selected its pages with, so it is only resumed with them
+    scope = models.JSONField(
+        default=dict, blank=True, help_text="Page filters of the run"
+    )
+
+    # Metadata
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Rebuild Checkpoint"
+        verbose_name_plural = "Rebuild Checkpoints"
+        ordering = ["name"]
+
+    def __str__(self) -> str:
+        """String representation."""
+        return f"{self.name} (last page: {self.last_page_id})"
+
+    @property
+    def next_page_id(self) -> Optional[int]:
+        """Smallest original page id that still needs to be processed."""
+        if self.last_page_id is None:
+            return self.min_page_id
+        return self.last_page_id + 1
+
+
+class TranslationSourceLink(models.Model):
+    """
+    Index of the Translation each translated page was produced from.
+
+    A translated page is usually translated from the original page, but it
+    may be a translation of another translation. Storing which Translation
+    it came from lets progress be calculated with a direct join instead of
+    searching every other translation. Rows are kept current by signals
+    and refreshed by ``rebuild_all_progress``.
+    """
+
+    translated_page = models.OneToOneField(
+        Page,
+        on_delete=models.CASCADE,
+        related_name="translation_source_link",
+        help_text="The translated page",
+    )
+
+    translation = models.ForeignKey(
+        "wagtail_localize.Translation",
+        on_delete=models.CASCADE,
+        related_name="+",
+        help_text="The Translation the page was produced from",
+    )
+
+    # Metadata
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Translation Source Link"
+        verbose_name_plural = "Translation Source Links"
+
+    def __str__(self) -> str:
+        """String representation."""
+        return f"{self.translated_page} <- {self.translation}"
+
+
+class TranslationProgressQueue(models.Model):
+    """
+    Marker of a translation key or string whose progress needs recalculating.
+
+    Written by ``QueueTableProgressUpdateExecutor`` inside the transaction
+    that made the changes, instead of recalculating progress in the request,
+    and consumed in batches by the ``process_translation_progress_queue``
+    command. Changed strings are queued as they are, and only resolved to
+    the pages using them when processed. Markers are only removed once their
+    batch is committed, so they survive crashes.
+    """
+
+    translation_key = models.UUIDField(
+        null=True,
+        blank=True,
+        help_text="Translation key of the page to recalculate",
+    )
+
+    string = models.ForeignKey(
+        "wagtail_localize.String",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="+",
+        help_text="Changed string whose pages to recalculate",
+    )
+
+    context = models.ForeignKey(
+        "wagtail_localize.TranslationContext",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="+",
+        help_text="Context of the changed string",
+    )
+
+    locale = models.ForeignKey(
+        "wagtailcore.Locale",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="+",
+        help_text="Only recalculate translations into this locale, or every locale",
+    )
+
+    # Identifies what the marker queues, so a key, locale or string already
+    # queued is not queued again on every database
+    dedupe_key = models.CharField(
+        max_length=100,
+        unique=True,
+        help_text="Key, or string and context, and locale of the marker",
+    )
+
+    # Metadata
+    queued_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Translation Progress Queue"
+        verbose_name_plural = "Translation Progress Queue"
+
+        ordering = ["id"]
+
+    def __str__(self) -> str:
+        """String representation."""
+        if self.string_id is not None:
+            return f"String {self.string_id} ({self.locale})"
+        return f"{self.translation_key} ({self.locale or 'every locale'})"
+
+    def get_dedupe_key(self) -> str:
+        """
+        Build the ``dedupe_key`` of this marker from what it queues.
+
+        Returns:
+            str: ``string:<string id>:<context id>:<locale id>`` for a changed
+            string, ``key:<translation key>:<locale id>`` otherwise, with an
+            empty locale id for every locale
+        """
+        locale_id = "" if self.locale_id is None else self.locale_id
+        if self.string_id is not None:
+            return f"string:{self.string_id}:{self.context_id}:{locale_id}"
+        return f"key:{self.translation_key}:{locale_id}"
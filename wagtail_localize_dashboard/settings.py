@@ -24,6 +24,32 @@ DEFAULTS = {
     "MENU_ORDER": 100,
     # Items per page in dashboard
     "ITEMS_PER_PAGE": 50,
+    # Number of original pages processed per batch by rebuild_all_progress
+    "REBUILD_BATCH_SIZE": 500,
+    # Dotted path to the class that counts total and translated segments
+    "PROGRESS_CALCULATOR": (
+        "wagtail_localize_dashboard.calculators.DefaultProgressCalculator"
+    ),
+    # Dotted path to the calculator used by rebuilds, or None to use
+    # PROGRESS_CALCULATOR
+    "REBUILD_PROGRESS_CALCULATOR": None,
+    # Cache alias holding the segment totals of each TranslationSource,
+    # or None to not share them between processes
+    "SEGMENT_TOTALS_CACHE": "default",
+    # Segment totals kept in process in front of the cache, or 0 for none.
+    # Totals cached in process are not dropped by other processes
+    "SEGMENT_TOTALS_CACHE_SIZE": 0,
+    # Dotted path to the class that applies the updates queued by the signals
+    "PROGRESS_UPDATE_EXECUTOR": (
+        "wagtail_localize_dashboard.executors.SynchronousProgressUpdateExecutor"
+    ),
+    # Worker threads of ThreadPoolProgressUpdateExecutor
+    "PROGRESS_UPDATE_WORKERS": 2,
+    # Updates ThreadPoolProgressUpdateExecutor holds before applying them in
+    # the committing thread
+    "PROGRESS_UPDATE_QUEUE_SIZE": 100,
+    # Markers claimed per batch by process_translation_progress_queue
+    "QUEUE_BATCH_SIZE": 500,
 }
 
 
@@ -1,144 +1,274 @@
-"""Signal handlers for automatic cache updates."""
+"""
+Signal handlers for automatic cache updates.
+
+One editor action saves a Page, its TranslationSource, Translations and
+many StringTranslations. Rather than recalculating on every signal, the
+handlers queue the translation keys they affect, and the queue is flushed
+once when the transaction commits, so each key is recalculated once.
+``suspend_progress_updates`` holds the queue back for a whole bulk operation.
+"""
 
 import logging
-from typing import Any
+import threading
+import weakref
+from contextlib import contextmanager
+from functools import partial
+from typing import Any, Dict, Iterator, Optional, Tuple
 
 from django.db import transaction
-from django.db.models.signals import post_save, pre_delete
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from wagtail.models import Page
-from wagtail_localize.models import (
-    StringSegment,
-    StringTranslation,
-    Translation,
-    TranslationSource,
-)
+from wagtail.models import Page, get_page_models
+from wagtail_localize.models import StringTranslation, Translation, TranslationSource
 
+from .calculators import invalidate_segment_totals
+from .executors import get_progress_update_executor
 from .settings import get_setting
-from .utils import create_translation_progress
+from .utils import add_translation_key_locales
 
 logger = logging.getLogger(__name__)
 
+# Updates queued by the signal handlers of this thread until the next commit
+_pending = threading.local()
+
+# Page fields whose changes affect progress. Saves limited to other fields,
+# like those of save_revision() or locking a page, are skipped.
+PROGRESS_PAGE_FIELDS = frozenset(
+    ["translation_key", "locale", "locale_id", "alias_of", "alias_of_id"]
+)
+
 
 def should_auto_update() -> bool:
     """Check if auto-update is enabled."""
     return get_setting("ENABLED") and get_setting("AUTO_UPDATE")
 
 
+def get_pending_updates() -> Dict[str, Any]:
+    """
+    Get the updates queued in this thread.
+
+    Returns:
+        dict with the translation keys to ``relink``, the translation keys
+        to recalculate in ``progress`` (mapped to locale ids, or None for
+        every locale) and the changed ``strings`` as (string_id, context_id,
+        locale_id) tuples
+    """
+    if not hasattr(_pending, "updates"):
+        _pending.updates = {"relink": set(), "progress": {}, "strings": set()}
+    return _pending.updates
+
+
+def queue_progress_update(
+    translation_key: object = None,
+    locale_id: Optional[int] = None,
+    relink: bool = False,
+    string_translation: Optional[Tuple[int, int, int]] = None,
+) -> None:
+    """
+    Queue a progress update to run when the current transaction commits.
+
+    Every call registers ``flush_progress_updates`` with
+    ``transaction.on_commit``. The first one to run applies everything queued
+    so far and the others find nothing left to do. Outside a transaction the
+    update runs straight away.
+
+    Args:
+        translation_key: Translation key of the pages whose progress changed
+        locale_id: Only recalculate translations into this locale
+        relink: Refresh the TranslationSourceLink index of the key first
+        string_translation: A changed (string_id, context_id, locale_id),
+            whose pages are looked up when the queue is flushed
+    """
+    suspended = _is_suspended()
+    if not suspended:
+        _drop_rolled_back_updates()
+
+    updates = get_pending_updates()
+
+    if translation_key is not None:
+        if relink:
+            updates["relink"].add(translation_key)
+        add_translation_key_locales(
+            updates["progress"], translation_key, locale_id and {locale_id}
+        )
+
+    if string_translation is not None:
+        updates["strings"].add(string_translation)
+
+    if not suspended:
+        _schedule_flush()
+
+
+class _FlushHook:
+    """
+    ``transaction.on_commit`` hook flushing the queue of this thread.
+
+    Each hook is also tracked in a WeakSet. A rollback drops the hooks
+    registered in the transaction, or savepoint, and with them the last
+    reference to each one, so an empty set means no flush is waiting.
+    """
+
+    def __call__(self) -> None:
+        flush_progress_updates()
+
+
+def _schedule_flush() -> None:
+    """Flush the queue when the transaction commits."""
+    if not hasattr(_pending, "hooks"):
+        _pending.hooks = weakref.WeakSet()
+    hook = _FlushHook()
+    _pending.hooks.add(hook)
+    transaction.on_commit(hook)
+
+
+def _is_suspended() -> bool:
+    """Check if this thread is inside ``suspend_progress_updates``."""
+    return getattr(_pending, "suspended", 0) > 0
+
+
+def _drop_rolled_back_updates() -> None:
+    """Drop the queue if no flush of it is waiting for a commit."""
+    # Anything still queued without a flush belongs to a transaction that was
+    # rolled back. On interpreters without reference counting, the hooks may
+    # outlive the rollback, and the updates are then applied with the next
+    # commit, which recalculates the same progress again.
+    if not getattr(_pending, "hooks", None):
+        _pending.__dict__.pop("updates", None)
+
+
+@contextmanager
+def suspend_progress_updates() -> Iterator[None]:
+    """
+    Hold back progress updates until the end of a bulk operation.
+
+    Inside the block the signal handlers keep queueing the translation keys
+    they affect, without scheduling any recalculation. Leaving the outermost
+    block flushes the queue once, when the surrounding transaction commits,
+    or straight away outside a transaction. Blocks can be nested, and only
+    suspend updates in the current thread.
+
+    Example:
+        >>> with suspend_progress_updates():
+        ...     for page in pages:
+        ...         page.copy_for_translation(locale)
+
+        >>> @suspend_progress_updates()
+        ... def import_pages():
+        ...     ...
+    """
+    if not _is_suspended():
+        _drop_rolled_back_updates()
+
+    _pending.suspended = getattr(_pending, "suspended", 0) + 1
+    try:
+        yield
+    finally:
+        _pending.suspended -= 1
+        if not _pending.suspended:
+            _schedule_flush()
+
+
+def flush_progress_updates() -> None:
+    """
+    Hand the updates queued in this thread to the progress update executor.
+
+    The executor selected by PROGRESS_UPDATE_EXECUTOR applies them with
+    ``apply_progress_updates``, recalculating each key once.
+    """
+    updates = get_pending_updates()
+    if not any(updates.values()):
+        return
+    del _pending.updates
+
+    try:
+        get_progress_update_executor().submit(updates)
+    except Exception as e:
+        logger.exception(f"Error in flush_progress_updates: {e}")
+
+
 @receiver(post_save, sender=Translation)
 def translation_saved_handler(
     sender: type, instance: Translation, created: bool, **kwargs: Any
 ) -> None:
     """Update progress when a Translation is saved."""
-    if not should_auto_update():
+    if not should_auto_update() or not get_setting("TRACK_PAGES"):
+        return
+
+    try:
+        translation_key = instance.source.object_id
+    except Exception as e:
+        logger.exception(f"Error in translation_saved_handler: {e}")
         return
 
-    def update_after_commit() -> None:
-        try:
-            source_instance = instance.source.get_source_instance()
+    # A new Translation may be where a page was produced from, and may be
+    # the source of translations into other locales
+    queue_progress_update(
+        translation_key,
+        locale_id=None if created else instance.target_locale_id,
+        relink=created,
+    )
 
-            # Only track Pages
-            if not isinstance(source_instance, Page):
-                return
 
-            if not get_setting("TRACK_PAGES"):
-                return
+@receiver(post_delete, sender=Translation)
+def translation_deleted_handler(
+    sender: type, instance: Translation, **kwargs: Any
+) -> None:
+    """Relink and update the pages translated from a deleted Translation."""
+    if not should_auto_update() or not get_setting("TRACK_PAGES"):
+        return
 
-            # Get the original page (min ID per translation_key)
-            if hasattr(source_instance, "translation_key"):
-                original_page = (
-                    Page.objects.filter(translation_key=source_instance.translation_key)
-                    .order_by("id")
-                    .first()
-                )
-                if original_page:
-                    create_translation_progress(original_page)
-        except Exception as e:
-            logger.exception(f"Error in translation_saved_handler: {e}")
+    try:
+        translation_key = (
+            TranslationSource.objects.filter(id=instance.source_id)
+            .values_list("object_id", flat=True)
+            .first()
+        )
+    except Exception as e:
+        logger.exception(f"Error in translation_deleted_handler: {e}")
+        return
 
-    transaction.on_commit(update_after_commit)
+    # The whole source was deleted, so there is nothing left to link to
+    if translation_key is None:
+        return
+
+    # The pages' progress was calculated from the deleted Translation
+    queue_progress_update(translation_key, relink=True)
 
 
 @receiver(post_save, sender=StringTranslation)
 def string_translation_saved_handler(
     sender: type, instance: StringTranslation, created: bool, **kwargs: Any
 ) -> None:
-    """Update progress when a StringTranslation is saved."""
-    if not should_auto_update():
+    """Update progress of every page using the string when it is translated."""
+    if not should_auto_update() or not get_setting("TRACK_PAGES"):
         return
 
-    def update_after_commit() -> None:
-        try:
-            # Get the page through the segments
-            # StringTranslation -> StringSegment -> TranslationSource -> Page
-            segment = StringSegment.objects.get(
-                context=instance.context, string=instance.translation_of
-            )
-            source_instance = segment.source.get_source_instance()
-
-            # Only track Pages
-            if not isinstance(source_instance, Page):
-                return
-
-            if not get_setting("TRACK_PAGES"):
-                return
-
-            # Get the original page
-            if hasattr(source_instance, "translation_key"):
-                original_page = (
-                    Page.objects.filter(translation_key=source_instance.translation_key)
-                    .order_by("id")
-                    .first()
-                )
-                if original_page:
-                    create_translation_progress(original_page)
-        except Exception as e:
-            logger.exception(f"Error in string_translation_saved_handler: {e}")
-
-    transaction.on_commit(update_after_commit)
-
-
-@receiver(pre_delete, sender=StringTranslation)
+    # The string may be used by segments of more than one source
+    queue_progress_update(
+        string_translation=(
+            instance.translation_of_id,
+            instance.context_id,
+            instance.locale_id,
+        )
+    )
+
+
+@receiver(post_delete, sender=StringTranslation)
 def string_translation_deleted_handler(
     sender: type, instance: StringTranslation, **kwargs: Any
 ) -> None:
-    """Update progress when a StringTranslation is deleted."""
-    if not should_auto_update():
+    """Update progress of every page using the string when it is deleted."""
+    if not should_auto_update() or not get_setting("TRACK_PAGES"):
         return
 
-    try:
-        # Get the page before deletion
-        segment = StringSegment.objects.get(
-            context=instance.context, string=instance.translation_of
+    queue_progress_update(
+        string_translation=(
+            instance.translation_of_id,
+            instance.context_id,
+            instance.locale_id,
         )
-        source_instance = segment.source.get_source_instance()
-
-        # Only track Pages
-        if not isinstance(source_instance, Page):
-            return
-
-        if not get_setting("TRACK_PAGES"):
-            return
-
-        # Get the original page
-        if hasattr(source_instance, "translation_key"):
-            original_page = (
-                Page.objects.filter(translation_key=source_instance.translation_key)
-                .order_by("id")
-                .first()
-            )
-
-            def update_after_commit() -> None:
-                try:
-                    if original_page:
-                        create_translation_progress(original_page)
-                except Exception as e:
-                    logger.exception(f"Error in update_after_commit: {e}")
-
-            transaction.on_commit(update_after_commit)
-    except Exception as e:
-        logger.exception(f"Error in string_translation_deleted_handler: {e}")
+    )
 
 
 @receiver(post_save, sender=TranslationSource)
@@ -146,65 +276,71 @@ def translation_source_saved_handler(
     sender: type, instance: TranslationSource, created: bool, **kwargs: Any
 ) -> None:
     """Update progress when a TranslationSource is saved."""
-    if not should_auto_update():
-        return
-
-    def update_after_commit() -> None:
-        try:
-            source_instance = instance.get_source_instance()
-
-            # Only track Pages
-            if not isinstance(source_instance, Page):
-                return
+    # Its segments are refreshed after the save, so any total counted before
+    # the sync commits is dropped, once for the whole source
+    transaction.on_commit(
+        partial(invalidate_segment_totals, instance.pk, instance.last_updated_at)
+    )
 
-            if not get_setting("TRACK_PAGES"):
-                return
-
-            # Get the original page
-            if hasattr(source_instance, "translation_key"):
-                original_page = (
-                    Page.objects.filter(translation_key=source_instance.translation_key)
-                    .order_by("id")
-                    .first()
-                )
-                if original_page:
-                    create_translation_progress(original_page)
-        except Exception as e:
-            logger.exception(f"Error in translation_source_saved_handler: {e}")
+    if not should_auto_update() or not get_setting("TRACK_PAGES"):
+        return
 
-    transaction.on_commit(update_after_commit)
+    # The object_id of a source is the translation key of its object
+    queue_progress_update(instance.object_id)
 
 
-@receiver(post_save)
 def page_saved_handler(
-    sender: type, instance: Any, created: bool, **kwargs: Any
+    sender: type, instance: Page, created: bool, **kwargs: Any
 ) -> None:
-    """Update progress when a Page is saved."""
-    if not should_auto_update():
-        return
+    """
+    Update progress when a Page is saved.
 
-    # Only process Pages
-    if not isinstance(instance, Page):
+    Connected to each page model by ``connect_page_signals``.
+    """
+    if not should_auto_update():
         return
 
     # Don't process raw saves (from fixtures, migrations, etc)
     if kwargs.get("raw", False):
         return
 
+    update_fields = kwargs.get("update_fields")
+    if (
+        not created
+        and update_fields is not None
+        and not PROGRESS_PAGE_FIELDS.intersection(update_fields)
+    ):
+        return
+
     if not get_setting("TRACK_PAGES"):
         return
 
-    def update_after_commit() -> None:
-        try:
-            # Get the original page
-            original_page = (
-                Page.objects.filter(translation_key=instance.translation_key)
-                .order_by("id")
-                .first()
-            )
-            if original_page:
-                create_translation_progress(original_page)
-        except Exception as e:
-            logger.exception(f"Error in page_saved_handler: {e}")
-
-    transaction.on_commit(update_after_commit)
+    # A new page may be a translation, or the new original
+    queue_progress_update(instance.translation_key, relink=created)
+
+
+@receiver(post_delete, sender=Page)
+def page_deleted_handler(sender: type, instance: Page, **kwargs: Any) -> None:
+    """Relink and update the remaining translations when a Page is deleted."""
+    if not should_auto_update() or not get_setting("TRACK_PAGES"):
+        return
+
+    # Deleting the original makes another page the original, whose progress
+    # records have to be created as the old ones were deleted with the page
+    queue_progress_update(instance.translation_key, relink=True)
+
+
+def connect_page_signals() -> None:
+    """
+    Connect ``page_saved_handler`` to Page and each of its concrete subclasses.
+
+    post_save is sent with the class of the saved instance, so the handler
+    is connected to every page model rather than to every model of the
+    project. Called from ``DashboardConfig.ready``, once all models are loaded.
+    """
+    for model in get_page_models():
+        post_save.connect(
+            page_saved_handler,
+            sender=model,
+            dispatch_uid=f"wagtail_localize_dashboard_page_saved_{model._meta.label_lower}",
+        )
@@ -1,18 +1,73 @@
 """Utility functions for calculating and managing translation progress."""
 
 import logging
-from typing import Dict, Optional
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+from uuid import UUID
 
-from django.db.models import Min, Model, QuerySet
+from django.db import connection, connections, transaction
+from django.db.models import (
+    Exists,
+    F,
+    Min,
+    Model,
+    OuterRef,
+    Q,
+    QuerySet,
+    Subquery,
+)
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
 
 from wagtail.models import Locale, Page
-from wagtail_localize.models import TranslatableObject, Translation, TranslationSource
+from wagtail_localize.models import (
+    StringSegment,
+    TranslatableObject,
+    Translation,
+    TranslationSource,
+)
 
-from .models import TranslationProgress
+from .calculators import BaseProgressCalculator, get_progress_calculator
+from .models import (
+    RebuildCheckpoint,
+    TranslationProgress,
+    TranslationProgressQueue,
+    TranslationSourceLink,
+)
 from .settings import get_setting
+from .workers import init_rebuild_worker, rebuild_worker
 
 logger = logging.getLogger(__name__)
 
+# Depth of the locale root pages. They and the tree root above them are
+# never tracked, as the dashboard only lists the pages below them.
+LOCALE_ROOT_DEPTH = 2
+
+# Strings looked up per query by get_pages_for_strings, well below the
+# parameter limit of every supported database
+STRINGS_CHUNK_SIZE = 500
+
+
+def calculate_percent(total_segments: int, translated_segments: int) -> int:
+    """
+    Convert segment counts into a percentage.
+
+    Args:
+        total_segments: Number of segments to translate
+        translated_segments: Number of segments translated so far
+
+    Returns:
+        int: Percentage translated (0-100), truncated
+    """
+    if total_segments > 0:
+        return int(translated_segments / total_segments * 100)
+
+    return 100  # No segments = 100% complete
+
 
 def get_translation_percentages(
     source_page: Page, target_locale: Locale
@@ -43,15 +98,12 @@ def get_translation_percentages(
             source=translation_source, target_locale=target_locale
         )
 
-        # Get the actual translation progress using wagtail-localize logic
-        total_segments, translated_segments = translation_record.get_progress()
-
-        if total_segments > 0:
-            percent_translated = int(translated_segments / total_segments * 100)
-        else:
-            percent_translated = 100  # No segments = 100% complete
+        # Get the actual translation progress from the configured calculator
+        total_segments, translated_segments = get_progress_calculator().get_progress(
+            translation_record
+        )
 
-        return percent_translated
+        return calculate_percent(total_segments, translated_segments)
 
     except (
         TranslationSource.DoesNotExist,
@@ -61,12 +113,71 @@ def get_translation_percentages(
         return None
 
 
+def get_translation_percentages_bulk(
+    source_pages: Iterable[Page], target_locales: Iterable[Locale]
+) -> Dict[Tuple[int, int], Optional[int]]:
+    """
+    Calculate translation percentages for many source pages and locales at once.
+
+    This is the bulk equivalent of calling ``get_translation_percentages``
+    for every (page, locale) pair. It runs the same four queries however
+    many pages and locales are given, so it can be used for a whole listing.
+
+    Args:
+        source_pages: The source Page objects. Only ``id``,
+            ``translation_key`` and ``locale_id`` are used.
+        target_locales: The target Locale instances
+
+    Returns:
+        dict mapping every (page_id, locale_id) pair to the percentage
+        translated (0-100), or None if no translation exists
+
+    Example:
+        >>> pages = Page.objects.filter(locale__language_code="en")
+        >>> locales = Locale.objects.exclude(language_code="en")
+        >>> percentages = get_translation_percentages_bulk(pages, locales)
+        >>> print(percentages[(page.id, locale_de.id)])
+    """
+    source_pages = list(source_pages)
+    locale_ids = {locale.pk for locale in target_locales}
+    if not source_pages or not locale_ids:
+        return {}
+
+    # TranslationSource ids keyed by (translation_key, source locale)
+    source_ids = {
+        (object_id, locale_id): source_id
+        for source_id, object_id, locale_id in TranslationSource.objects.filter(
+            object_id__in={page.translation_key for page in source_pages}
+        ).values_list("id", "object_id", "locale_id")
+    }
+
+    translation_pairs = set(
+        Translation.objects.filter(
+            source_id__in=source_ids.values(), target_locale_id__in=locale_ids
+        ).values_list("source_id", "target_locale_id")
+    )
+    segment_counts = get_segment_counts(translation_pairs)
+
+    percentages = {}
+    for page in source_pages:
+        source_id = source_ids.get((page.translation_key, page.locale_id))
+        for locale_id in locale_ids:
+            counts = segment_counts.get((source_id, locale_id))
+            percentages[(page.id, locale_id)] = (
+                calculate_percent(*counts) if counts is not None else None
+            )
+
+    return percentages
+
+
 def create_translation_progress(source_page: Page) -> None:
     """
     Calculate and store translation progress for a source page.
 
     Creates or updates TranslationProgress records for all translations
-    of the given source page.
+    of the given source page. The percentages are calculated with
+    ``get_batch_progress``, so this runs a fixed number of queries however
+    many locales the page is translated into.
 
     Args:
         source_page: The source Page object
@@ -75,58 +186,1099 @@ def create_translation_progress(source_page: Page) -> None:
         >>> page = Page.objects.get(id=123)
         >>> create_translation_progress(page)
     """
-    # Check if tracking is enabled
-    if not get_setting("TRACK_PAGES"):
+    # Check if tracking is enabled, and if the page is tracked at all
+    if not get_setting("TRACK_PAGES") or source_page.depth <= LOCALE_ROOT_DEPTH:
         return
 
     try:
-        # Get all translations of this page
-        translations = source_page.get_translations()
+        # Calculate progress for all translations of this page, including
+        # translations of another translation, and store it in one go
+        save_batch_progress(get_batch_progress([source_page], with_counts=True))
+
+    except (ValueError, AttributeError) as error:
+        # If there's an unexpected error, log it
+        logger.exception(
+            f"Error creating translation progress for {source_page}: {error}",
+            stack_info=True,
+        )
+
+
+def get_pages_for_strings(strings: Iterable[Tuple[int, int]]) -> QuerySet:
+    """
+    Get the original pages whose segments use any of the given strings.
+
+    A StringTranslation is keyed by (String, TranslationContext, Locale), so
+    it completes every segment with that string and context, which can
+    belong to more than one source. The segments are looked up by string,
+    in chunks of STRINGS_CHUNK_SIZE, and matched on their context in Python,
+    so any number of strings takes a fixed number of queries per chunk.
+
+    Args:
+        strings: Iterable of (string_id, context_id) tuples
+
+    Returns:
+        QuerySet of the original pages (min ID per translation_key)
+
+    Example:
+        >>> pages = get_pages_for_strings(
+        ...     [(string_translation.translation_of_id, string_translation.context_id)]
+        ... )
+    """
+    strings = set(strings)
+    if not strings:
+        return Page.objects.none()
+
+    string_ids = sorted({string_id for string_id, _ in strings})
+    translation_keys = set()
+    for start in range(0, len(string_ids), STRINGS_CHUNK_SIZE):
+        segments = (
+            StringSegment.objects.filter(
+                string_id__in=string_ids[start : start + STRINGS_CHUNK_SIZE]
+            )
+            .order_by()
+            .values_list("string_id", "context_id", "source__object_id")
+            .distinct()
+        )
+        translation_keys.update(
+            translation_key
+            for string_id, context_id, translation_key in segments
+            if (string_id, context_id) in strings
+        )
+
+    return Page.objects.filter(id__in=_get_original_page_ids(translation_keys))
+
+
+def get_string_translation_keys(
+    string_translations: Iterable[Tuple[int, int, int]],
+) -> Dict[object, Set[int]]:
+    """
+    Get the pages affected by changed string translations, by translation key.
+
+    Args:
+        string_translations: Iterable of (string_id, context_id, locale_id)
+            tuples, as on a StringTranslation
+
+    Returns:
+        dict mapping the translation key of every page using one of the
+        strings to the ids of the locales the strings were translated into
+    """
+    string_translations = set(string_translations)
+    if not string_translations:
+        return {}
+
+    locale_ids = {locale_id for _, _, locale_id in string_translations}
+    translation_keys = (
+        get_pages_for_strings(
+            (string_id, context_id) for string_id, context_id, _ in string_translations
+        )
+        .order_by()
+        .values_list("translation_key", flat=True)
+    )
+    return {translation_key: set(locale_ids) for translation_key in translation_keys}
+
+
+def update_translation_keys_progress(
+    translation_keys: Dict[object, Optional[Set[int]]],
+) -> int:
+    """
+    Update the progress of the original page of each translation key once.
+
+    Keys limited to some locales are updated together for all of those
+    locales, and the others for every locale, so this takes at most two
+    batches of ``get_batch_progress`` however many keys are given.
+
+    Args:
+        translation_keys: dict mapping translation keys to the ids of the
+            locales to update, or to None for every locale
+
+    Returns:
+        int: Number of progress records created or updated
+
+    Example:
+        >>> update_translation_keys_progress({page.translation_key: None})
+    """
+    if not get_setting("TRACK_PAGES") or not translation_keys:
+        return 0
+
+    # Keys of snippets and other non-page objects have no pages
+    pages = list(
+        Page.objects.filter(id__in=_get_original_page_ids(translation_keys)).only(
+            "id", "translation_key", "locale_id"
+        )
+    )
+
+    every_locale = [
+        page for page in pages if translation_keys[page.translation_key] is None
+    ]
+    some_locales = [
+        page for page in pages if translation_keys[page.translation_key] is not None
+    ]
+
+    rows = 0
+    if every_locale:
+        rows += save_batch_progress(get_batch_progress(every_locale, with_counts=True))
+    if some_locales:
+        locale_ids = set().union(
+            *(translation_keys[page.translation_key] for page in some_locales)
+        )
+        rows += save_batch_progress(
+            get_batch_progress(
+                some_locales,
+                locales=[Locale(pk=locale_id) for locale_id in locale_ids],
+                with_counts=True,
+            )
+        )
+    return rows
+
+
+def update_string_translation_progress(
+    string_translations: Iterable[Tuple[int, int, int]],
+) -> int:
+    """
+    Update the progress of every page affected by changed string translations.
+
+    The affected pages are found with ``get_pages_for_strings`` and updated
+    in one batch, only for the locales of the changed translations.
+
+    Args:
+        string_translations: Iterable of (string_id, context_id, locale_id)
+            tuples, as on a StringTranslation
+
+    Returns:
+        int: Number of progress records created or updated
+
+    Example:
+        >>> update_string_translation_progress(
+        ...     [(st.translation_of_id, st.context_id, st.locale_id)]
+        ... )
+    """
+    if not get_setting("TRACK_PAGES"):
+        return 0
+
+    return update_translation_keys_progress(
+        get_string_translation_keys(string_translations)
+    )
+
+
+def add_translation_key_locales(
+    translation_keys: Dict[object, Optional[Set[int]]],
+    translation_key: object,
+    locale_ids: Optional[Set[int]],
+) -> None:
+    """Merge locales into those of a translation key; None (every locale) wins."""
+    if (
+        translation_key in translation_keys
+        and translation_keys[translation_key] is None
+    ):
+        return
+    if locale_ids is None:
+        translation_keys[translation_key] = None
+    else:
+        translation_keys.setdefault(translation_key, set()).update(locale_ids)
+
+
+def apply_progress_updates(updates: Dict[str, Any]) -> int:
+    """
+    Apply the progress updates queued by the signal handlers.
+
+    The queued keys are relinked first, then the changed strings are
+    resolved to the pages using them and every key is recalculated once
+    with ``update_translation_keys_progress``.
+
+    Args:
+        updates: dict with the translation keys to ``relink``, the
+            translation keys to recalculate in ``progress`` (mapped to locale
+            ids, or None for every locale) and the changed ``strings`` as
+            (string_id, context_id, locale_id) tuples
+
+    Returns:
+        int: Number of progress records created or updated
+
+    Example:
+        >>> apply_progress_updates(
+        ...     {"relink": set(), "progress": {page.translation_key: None}, "strings": set()}
+        ... )
+        1
+    """
+    if updates["relink"]:
+        update_translation_source_links(updates["relink"])
+
+    progress = {
+        translation_key: locale_ids and set(locale_ids)
+        for translation_key, locale_ids in updates["progress"].items()
+    }
+    for translation_key, locale_ids in get_string_translation_keys(
+        updates["strings"]
+    ).items():
+        add_translation_key_locales(progress, translation_key, locale_ids)
+
+    return update_translation_keys_progress(progress)
+
+
+def queue_translation_progress(updates: Dict[str, Any]) -> int:
+    """
+    Record progress updates as TranslationProgressQueue markers.
+
+    Keys to relink are queued for every locale, as processing a marker also
+    relinks its key. The changed strings are queued as they are, without
+    looking up the pages using them, and strings without a context are left
+    out as no page can use them. All markers are written with one insert,
+    which skips the ones already queued.
+
+    Args:
+        updates: The updates queued by the signal handlers, as taken by
+            ``apply_progress_updates``
+
+    Returns:
+        int: Number of markers written or already queued
+
+    Example:
+        >>> queue_translation_progress(
+        ...     {"relink": set(), "progress": {page.translation_key: None}, "strings": set()}
+        ... )
+        1
+    """
+    translation_keys = {
+        translation_key: locale_ids and set(locale_ids)
+        for translation_key, locale_ids in updates["progress"].items()
+    }
+    for translation_key in updates["relink"]:
+        add_translation_key_locales(translation_keys, translation_key, None)
+
+    markers = [
+        TranslationProgressQueue(translation_key=translation_key, locale_id=locale_id)
+        for translation_key, locale_ids in translation_keys.items()
+        for locale_id in (locale_ids or [None])
+    ]
+    markers.extend(
+        TranslationProgressQueue(
+            string_id=string_id, context_id=context_id, locale_id=locale_id
+        )
+        for string_id, context_id, locale_id in updates["strings"]
+        if context_id is not None
+    )
+
+    for marker in markers:
+        marker.dedupe_key = marker.get_dedupe_key()
+    TranslationProgressQueue.objects.bulk_create(markers, ignore_conflicts=True)
+    return len(markers)
+
+
+def process_translation_progress_queue(batch_size: Optional[int] = None) -> int:
+    """
+    Recalculate the progress of a batch of TranslationProgressQueue markers.
+
+    The oldest markers are claimed with ``select_for_update(skip_locked=True)``
+    so several processes can consume the queue at once, each with its own
+    batch. Its markers are deleted before anything is read, then its keys
+    are relinked, its strings resolved to the pages using them, and all of
+    them recalculated together. This all happens in one transaction, so a
+    failed batch stays queued.
+
+    A key queued again while its batch is processed is not dropped as
+    already queued. The insert finds the claimed marker deleted: on
+    PostgreSQL and MySQL it waits for the batch to commit and is written
+    after it, and in the same transaction it is written straight away.
+
+    Args:
+        batch_size: Maximum number of markers to process
+            (default: QUEUE_BATCH_SIZE)
+
+    Returns:
+        int: Number of markers processed, 0 when the queue is empty
+
+    Example:
+        >>> while process_translation_progress_queue():
+        ...     pass
+    """
+    batch_size = batch_size or get_setting("QUEUE_BATCH_SIZE")
+
+    with transaction.atomic():
+        markers = list(
+            TranslationProgressQueue.objects.select_for_update(skip_locked=True)
+            .order_by("id")
+            .values_list(
+                "id", "translation_key", "string_id", "context_id", "locale_id"
+            )[:batch_size]
+        )
+        if not markers:
+            return 0
+
+        TranslationProgressQueue.objects.filter(
+            id__in=[marker[0] for marker in markers]
+        ).delete()
+
+        translation_keys = {}
+        strings = set()
+        for _, translation_key, string_id, context_id, locale_id in markers:
+            if string_id is not None:
+                strings.add((string_id, context_id, locale_id))
+            else:
+                add_translation_key_locales(
+                    translation_keys, translation_key, locale_id and {locale_id}
+                )
+
+        apply_progress_updates(
+            {
+                "relink": set(translation_keys),
+                "progress": translation_keys,
+                "strings": strings,
+            }
+        )
+
+    return len(markers)
+
+
+def get_segment_counts(
+    translation_pairs: Iterable[Tuple[int, int]],
+    calculator: Optional[BaseProgressCalculator] = None,
+) -> Dict[Tuple[int, int], Tuple[int, int]]:
+    """
+    Count total and translated segments for many translations at once.
+
+    This is the set-based equivalent of calling ``Translation.get_progress()``
+    for every (TranslationSource id, target Locale id) pair. The counting is
+    done by the calculator selected with the PROGRESS_CALCULATOR setting,
+    with a fixed number of queries regardless of the number of pairs.
+
+    Args:
+        translation_pairs: Iterable of (translation_source_id, locale_id) tuples
+        calculator: Calculator to use instead of the configured one
 
-        # Loop over all translations
-        for translated_page in translations:
-            # Skip if same as source
-            if translated_page.id == source_page.id:
+    Returns:
+        dict mapping each pair to a (total_segments, translated_segments) tuple
+    """
+    calculator = calculator or get_progress_calculator()
+    return calculator.get_batch_progress(translation_pairs)
+
+
+def _get_pages_by_key(
+    translation_keys: Iterable[object],
+) -> Tuple[Dict[object, List[Tuple[int, int]]], Set[int]]:
+    """
+    Get every page sharing one of the translation keys.
+
+    Returns the pages as (id, locale_id) in id order per key, and the ids of
+    the ones that are aliases.
+    """
+    pages_by_key: Dict[object, List[Tuple[int, int]]] = defaultdict(list)
+    alias_ids = set()
+    for page_id, translation_key, locale_id, alias_of_id in (
+        Page.objects.filter(translation_key__in=translation_keys)
+        .order_by("id")
+        .values_list("id", "translation_key", "locale_id", "alias_of_id")
+    ):
+        pages_by_key[translation_key].append((page_id, locale_id))
+        if alias_of_id is not None:
+            alias_ids.add(page_id)
+    return pages_by_key, alias_ids
+
+
+def _get_translation_graph(
+    translation_keys: Iterable[object], locale_ids: Optional[Set[int]] = None
+) -> Tuple[Dict[Tuple[object, int], int], Dict[Tuple[int, int], int]]:
+    """
+    Get the TranslationSources and Translations of some translation keys.
+
+    Returns:
+        tuple of dicts: TranslationSource ids keyed by (translation_key,
+        source locale id), and Translation ids keyed by (source id, target
+        locale id). With ``locale_ids``, only Translations into those
+        locales are included.
+    """
+    source_ids = {
+        (object_id, locale_id): source_id
+        for source_id, object_id, locale_id in TranslationSource.objects.filter(
+            object_id__in=translation_keys
+        ).values_list("id", "object_id", "locale_id")
+    }
+
+    translations = Translation.objects.filter(source_id__in=source_ids.values())
+    if locale_ids is not None:
+        translations = translations.filter(target_locale_id__in=locale_ids)
+    translation_ids = {
+        (source_id, target_locale_id): translation_id
+        for translation_id, source_id, target_locale_id in translations.values_list(
+            "id", "source_id", "target_locale_id"
+        )
+    }
+
+    return source_ids, translation_ids
+
+
+def _find_translation_pair(
+    translation_key: object,
+    key_pages: List[Tuple[int, int]],
+    source_page: Tuple[int, int],
+    translated_page: Tuple[int, int],
+    source_ids: Dict[Tuple[object, int], int],
+    translation_ids: Dict[Tuple[int, int], int],
+) -> Optional[Tuple[int, int]]:
+    """
+    Find the (source id, target locale id) a translated page was produced from.
+
+    The Translation from the source page is preferred. Otherwise every other
+    page of the translation key is tried as the source, in id order, as the
+    page might be a translation of another translation.
+    """
+    candidate_locale_ids = [source_page[1]] + [
+        locale_id
+        for page_id, locale_id in key_pages
+        if page_id not in (source_page[0], translated_page[0])
+    ]
+    for locale_id in candidate_locale_ids:
+        pair = (source_ids.get((translation_key, locale_id)), translated_page[1])
+        if pair in translation_ids:
+            return pair
+    return None
+
+
+def get_translation_source_links(
+    translation_keys: Iterable[object],
+) -> Dict[int, int]:
+    """
+    Work out the Translation each translated page was produced from.
+
+    The original page (min id per translation_key) is taken as the source
+    of every other page of the key, falling back to the other translations
+    when there is no Translation from the original.
+
+    Args:
+        translation_keys: Translation keys of the pages to link
+
+    Returns:
+        dict mapping translated page ids to Translation ids. Pages that were
+        not produced by a Translation are left out.
+    """
+    translation_keys = set(translation_keys)
+    if not translation_keys:
+        return {}
+
+    pages_by_key, _ = _get_pages_by_key(translation_keys)
+    source_ids, translation_ids = _get_translation_graph(translation_keys)
+
+    links = {}
+    for translation_key, key_pages in pages_by_key.items():
+        original = key_pages[0]
+        for translated_page in key_pages[1:]:
+            pair = _find_translation_pair(
+                translation_key,
+                key_pages,
+                original,
+                translated_page,
+                source_ids,
+                translation_ids,
+            )
+            if pair is not None:
+                links[translated_page[0]] = translation_ids[pair]
+
+    return links
+
+
+def update_translation_source_links(translation_keys: Iterable[object]) -> int:
+    """
+    Refresh the TranslationSourceLink rows of some translation keys.
+
+    Links of pages that are no longer produced by a Translation are deleted,
+    and missing or changed ones are written with a single upsert, in one
+    transaction.
+
+    Args:
+        translation_keys: Translation keys of the pages to refresh
+
+    Returns:
+        int: Number of links created or updated
+
+    Example:
+        >>> update_translation_source_links([page.translation_key])
+    """
+    translation_keys = set(translation_keys)
+    if not translation_keys:
+        return 0
+
+    links = get_translation_source_links(translation_keys)
+    existing = dict(
+        TranslationSourceLink.objects.filter(
+            translated_page__translation_key__in=translation_keys
+        ).values_list("translated_page_id", "translation_id")
+    )
+
+    stale = [page_id for page_id in existing if page_id not in links]
+    changed = [
+        TranslationSourceLink(translated_page_id=page_id, translation_id=translation_id)
+        for page_id, translation_id in links.items()
+        if existing.get(page_id) != translation_id
+    ]
+
+    with transaction.atomic():
+        if stale:
+            TranslationSourceLink.objects.filter(translated_page_id__in=stale).delete()
+        if changed:
+            connection = connections[TranslationSourceLink.objects.db]
+            TranslationSourceLink.objects.bulk_create(
+                changed,
+                update_conflicts=True,
+                # MySQL always uses the table's unique constraints
+                unique_fields=(
+                    ["translated_page"]
+                    if connection.features.supports_update_conflicts_with_target
+                    else None
+                ),
+                update_fields=["translation", "updated_at"],
+            )
+
+    return len(changed)
+
+
+def get_batch_progress(
+    source_pages: Iterable[Page],
+    locales: Optional[Iterable[Locale]] = None,
+    with_counts: bool = False,
+    calculator: Optional[BaseProgressCalculator] = None,
+) -> Dict[Tuple[int, int], Union[int, Tuple]]:
+    """
+    Calculate translation progress for a batch of source pages at once.
+
+    Uses the percentages of ``get_translation_percentages``. For original
+    pages, the Translation each translated page was produced from is read
+    from the TranslationSourceLink index. Otherwise the Translation from the
+    source page is used, or each other translation is tried as its source in
+    page id order, as it might be a translation of another translation. The
+    number of queries per batch is fixed.
+
+    Alias pages have no Translation and always mirror the page they alias,
+    so they are 100% translated without counting any segments.
+
+    Args:
+        source_pages: Pages to calculate progress for. Only ``id``,
+            ``translation_key`` and ``locale_id`` are used.
+        locales: Only calculate progress for translated pages in these locales
+        with_counts: Return the segment counts along with each percentage
+        calculator: Calculator to count segments with instead of the
+            configured one
+
+    Returns:
+        dict mapping (source_page_id, translated_page_id) to percent
+        translated, or with ``with_counts`` to a (percent_translated,
+        total_segments, translated_segments) tuple. Pages with no Translation
+        to calculate from get 0% of 0 segments.
+
+    Example:
+        >>> pages = get_original_objects(Page)[:500]
+        >>> progress = get_batch_progress(pages)
+    """
+    source_pages = list(source_pages)
+    translation_keys = {page.translation_key for page in source_pages}
+    if not translation_keys:
+        return {}
+
+    locale_ids = None
+    if locales is not None:
+        locale_ids = {locale.pk for locale in locales}
+
+    # All pages sharing a translation key with the batch, as (id, locale_id)
+    pages_by_key, alias_ids = _get_pages_by_key(translation_keys)
+
+    # Indexed sources of the translated pages, as (source id, target locale id)
+    linked_pairs = {
+        page_id: (source_id, target_locale_id)
+        for page_id, source_id, target_locale_id in (
+            TranslationSourceLink.objects.filter(
+                translated_page__translation_key__in=translation_keys
+            ).values_list(
+                "translated_page_id",
+                "translation__source_id",
+                "translation__target_locale_id",
+            )
+        )
+    }
+
+    # (source page, translated page) pairs, with the indexed source if the
+    # source page is the original the index was built from
+    wanted = []
+    for source_page in source_pages:
+        key_pages = pages_by_key[source_page.translation_key]
+        is_original = bool(key_pages) and key_pages[0][0] == source_page.id
+        for translated_page in key_pages:
+            page_id, locale_id = translated_page
+            if page_id == source_page.id:
+                continue
+            if locale_ids is not None and locale_id not in locale_ids:
                 continue
 
-            # Try to get translation percentage from source to this translation
-            percent_translated = get_translation_percentages(
-                source_page, translated_page.locale
+            pair = linked_pairs.get(page_id) if is_original else None
+            if pair is not None and pair[1] != locale_id:
+                pair = None
+            wanted.append((source_page, translated_page, pair))
+
+    # Search the sources of the pages the index does not cover. Every
+    # candidate source of a translated page targets that page's locale, so
+    # filtering by locale does not affect the search.
+    unlinked = [
+        item for item in wanted if item[2] is None and item[1][0] not in alias_ids
+    ]
+    if unlinked:
+        source_ids, translation_ids = _get_translation_graph(
+            {source_page.translation_key for source_page, _, _ in unlinked},
+            locale_ids,
+        )
+        wanted = [
+            (
+                source_page,
+                translated_page,
+                pair
+                or (
+                    None
+                    if translated_page[0] in alias_ids
+                    else _find_translation_pair(
+                        source_page.translation_key,
+                        pages_by_key[source_page.translation_key],
+                        (source_page.id, source_page.locale_id),
+                        translated_page,
+                        source_ids,
+                        translation_ids,
+                    )
+                ),
+            )
+            for source_page, translated_page, pair in wanted
+        ]
+
+    # Aliases are never counted, whatever they are linked to
+    wanted = [
+        (
+            source_page,
+            translated_page,
+            None if translated_page[0] in alias_ids else pair,
+        )
+        for source_page, translated_page, pair in wanted
+    ]
+
+    segment_counts = get_segment_counts(
+        (pair for _, _, pair in wanted if pair is not None), calculator=calculator
+    )
+
+    progress = {}
+    for source_page, translated_page, pair in wanted:
+        if pair is not None:
+            counts = segment_counts[pair]
+            percent_translated = calculate_percent(*counts)
+        else:
+            counts = (0, 0)
+            percent_translated = 100 if translated_page[0] in alias_ids else 0
+
+        if with_counts:
+            value = (percent_translated, *counts)
+        else:
+            value = percent_translated
+        progress[(source_page.id, translated_page[0])] = value
+
+    return progress
+
+
+def save_batch_progress(
+    progress: Dict[Tuple[int, int], Union[int, Tuple]],
+) -> int:
+    """
+    Store calculated percentages, skipping the ones that did not change.
+
+    Existing records are read in one query. Records whose values changed
+    (or that don't exist yet) are written with a single upsert per kind of
+    value, in one transaction. Unchanged records are not touched, so their
+    ``last_updated`` keeps the time the percentage last changed.
+
+    Args:
+        progress: dict mapping (source_page_id, translated_page_id) to
+            percent, or to a (percent_translated, total_segments,
+            translated_segments) tuple as returned by
+            ``get_batch_progress(..., with_counts=True)``. The segment
+            counts of records given a plain percent are left as they are.
+            Records given counts that changed have whether they are aliases
+            looked up along with them.
+
+    Returns:
+        int: Number of records created or updated
+    """
+    if not progress:
+        return 0
+
+    existing = {
+        (source_page_id, translated_page_id): tuple(values)
+        for source_page_id, translated_page_id, *values in (
+            TranslationProgress.objects.filter(
+                source_page_id__in={source_page_id for source_page_id, _ in progress}
+            ).values_list(
+                "source_page_id",
+                "translated_page_id",
+                "percent_translated",
+                "total_segments",
+                "translated_segments",
+            )
+        )
+    }
+
+    # Counts that have to be written need their alias flag looked up
+    alias_ids = set()
+    changed_ids = [
+        translated_page_id
+        for (source_page_id, translated_page_id), value in progress.items()
+        if isinstance(value, tuple)
+        and existing.get((source_page_id, translated_page_id)) != value
+    ]
+    if changed_ids:
+        alias_ids = set(
+            Page.objects.filter(pk__in=changed_ids, alias_of__isnull=False).values_list(
+                "pk", flat=True
             )
+        )
 
-            # If we can't get data from source to translation,
-            # the translation might be a translation of another translation.
-            # Try other translations as sources.
-            if percent_translated is None:
-                for other_translation in translations:
-                    if other_translation.id == translated_page.id:
-                        continue
+    changed_percents = []
+    changed_counts = []
+    for (source_page_id, translated_page_id), value in progress.items():
+        current = existing.get((source_page_id, translated_page_id))
+        if isinstance(value, tuple):
+            if current == value:
+                continue
+            percent_translated, total_segments, translated_segments = value
+            changed_counts.append(
+                TranslationProgress(
+                    source_page_id=source_page_id,
+                    translated_page_id=translated_page_id,
+                    percent_translated=percent_translated,
+                    total_segments=total_segments,
+                    translated_segments=translated_segments,
+                    is_alias=translated_page_id in alias_ids,
+                )
+            )
+        else:
+            if current is not None and current[0] == value:
+                continue
+            changed_percents.append(
+                TranslationProgress(
+                    source_page_id=source_page_id,
+                    translated_page_id=translated_page_id,
+                    percent_translated=value,
+                )
+            )
 
-                    percent_translated = get_translation_percentages(
-                        other_translation, translated_page.locale
+    if changed_percents or changed_counts:
+        connection = connections[TranslationProgress.objects.db]
+        # MySQL always uses the table's unique constraints
+        unique_fields = (
+            ["source_page", "translated_page"]
+            if connection.features.supports_update_conflicts_with_target
+            else None
+        )
+        # Nothing in here is retried, so no savepoint is needed
+        with transaction.atomic(savepoint=False):
+            for changed, update_fields in [
+                (
+                    changed_percents,
+                    ["percent_translated", "last_updated"],
+                ),
+                (
+                    changed_counts,
+                    [
+                        "percent_translated",
+                        "total_segments",
+                        "translated_segments",
+                        "is_alias",
+                        "last_updated",
+                    ],
+                ),
+            ]:
+                if changed:
+                    TranslationProgress.objects.bulk_create(
+                        changed,
+                        update_conflicts=True,
+                        unique_fields=unique_fields,
+                        update_fields=update_fields,
                     )
 
-                    if percent_translated is not None:
-                        break
+    return len(changed_percents) + len(changed_counts)
+
+
+def get_stale_original_pages(since: Optional[datetime] = None) -> QuerySet:
+    """
+    Get original pages whose progress inputs changed since it was calculated.
+
+    A page is stale when, after the oldest time one of its TranslationProgress
+    records was last written (``last_updated``) or checked by a rebuild
+    (``checked_at``), or after ``since`` when given:
+
+    - one of its TranslationSources was updated (``last_updated_at``)
+    - one of its Translations was created or synced
+      (``translations_last_updated_at``/``destination_last_updated_at``)
+    - a StringTranslation for one of its segments was modified (``updated_at``)
+
+    Pages with a translation that has no progress record are always stale.
+    Rebuilds set ``checked_at`` on every record they check, including the
+    ones that did not need rewriting, so a page is not stale again until one
+    of its inputs changes.
+    Deleted StringTranslations leave no timestamp behind, so they are only
+    picked up by the signal handlers or a full rebuild.
+
+    Args:
+        since: Fixed cut-off time. If None, each page is compared with its
+            own stored progress.
+
+    Returns:
+        QuerySet of original Page objects
+    """
+    original_pages = get_original_objects(Page)
 
-            # Create or update progress record
-            TranslationProgress.objects.update_or_create(
-                source_page=source_page,
-                translated_page=translated_page,
-                defaults={
-                    "percent_translated": percent_translated or 0,
-                },
+    if since is None:
+        original_pages = original_pages.annotate(
+            progress_updated=Subquery(
+                TranslationProgress.objects.filter(source_page_id=OuterRef("pk"))
+                # Greatest() is NULL if any argument is, on SQLite and MySQL
+                .annotate(
+                    current_at=Greatest(
+                        "last_updated", Coalesce("checked_at", "last_updated")
+                    )
+                )
+                .order_by("current_at")
+                .values("current_at")[:1]
             )
+        )
+        changed_after = OuterRef("progress_updated")
+    else:
+        changed_after = since
 
-    except (ValueError, AttributeError) as error:
-        # If there's an unexpected error, log it
-        logger.exception(
-            f"Error creating translation progress for {source_page}: {error}",
-            stack_info=True,
+    source_changed = TranslationSource.objects.filter(
+        object_id=OuterRef("translation_key"), last_updated_at__gt=changed_after
+    )
+    translation_changed = Translation.objects.filter(
+        Q(created_at__gt=changed_after)
+        | Q(translations_last_updated_at__gt=changed_after)
+        | Q(destination_last_updated_at__gt=changed_after),
+        source__object_id=OuterRef("translation_key"),
+    )
+    strings_changed = StringSegment.objects.filter(
+        source__object_id=OuterRef("translation_key"),
+        string__translations__context_id=F("context_id"),
+        string__translations__updated_at__gt=changed_after,
+    )
+    progress_missing = (
+        Page.objects.filter(translation_key=OuterRef("translation_key"))
+        .exclude(pk=OuterRef("pk"))
+        .exclude(
+            Exists(
+                TranslationProgress.objects.filter(
+                    source_page_id=OuterRef(OuterRef("pk")),
+                    translated_page_id=OuterRef("pk"),
+                )
+            )
+        )
+    )
+
+    return original_pages.filter(
+        Exists(source_changed)
+        | Exists(translation_changed)
+        | Exists(strings_changed)
+        | Exists(progress_missing)
+    )
+
+
+def mark_progress_checked(
+    source_page_ids: List[int],
+    checked_at: datetime,
+    locale: Optional[Locale] = None,
+) -> int:
+    """
+    Record that the progress of some original pages matches its inputs.
+
+    Sets ``checked_at`` on their TranslationProgress records in one query,
+    so ``get_stale_original_pages`` leaves them out until an input changes
+    after ``checked_at``.
+
+    Args:
+        source_page_ids: Ids of the original pages that were checked
+        checked_at: Time before their inputs were read
+        locale: Only mark the records of translations in this locale
+
+    Returns:
+        int: Number of records marked
+    """
+    records = TranslationProgress.objects.filter(source_page_id__in=source_page_ids)
+    if locale is not None:
+        records = records.filter(translated_page__locale=locale)
+    return records.update(checked_at=checked_at)
+
+
+def get_pages_to_rebuild(
+    min_page_id: Optional[int] = None,
+    max_page_id: Optional[int] = None,
+    since: Optional[datetime] = None,
+    stale_only: bool = False,
+    locale: Optional[Locale] = None,
+    root_page: Optional[Page] = None,
+    translation_key: Optional[Union[str, UUID]] = None,
+) -> QuerySet:
+    """
+    Get the original pages selected for a rebuild, ordered by id.
+
+    Args:
+        min_page_id: Only include original pages with an id >= this value
+        max_page_id: Only include original pages with an id <= this value
+        since: Only include pages whose inputs changed after this time
+        stale_only: Only include pages whose inputs changed after their
+            stored progress was calculated
+        locale: Only include pages that have a translation in this locale
+        root_page: Only include pages that have a version (the original or
+            a translation) in the subtree of this page, itself included
+        translation_key: Only include the page with this translation key
+
+    Returns:
+        QuerySet of original Page objects
+    """
+    if since is not None or stale_only:
+        original_pages = get_stale_original_pages(since)
+    else:
+        original_pages = get_original_objects(Page)
+
+    if min_page_id is not None:
+        original_pages = original_pages.filter(id__gte=min_page_id)
+    if max_page_id is not None:
+        original_pages = original_pages.filter(id__lte=max_page_id)
+    if translation_key is not None:
+        original_pages = original_pages.filter(translation_key=translation_key)
+    if locale is not None:
+        # An original in this locale cannot have a translation in it
+        original_pages = original_pages.exclude(locale=locale).filter(
+            translation_key__in=Page.objects.filter(locale=locale).values(
+                "translation_key"
+            )
+        )
+    if root_page is not None:
+        # Treebeard paths of descendants start with the root's path
+        original_pages = original_pages.filter(
+            translation_key__in=Page.objects.filter(
+                path__startswith=root_page.path
+            ).values("translation_key")
         )
 
+    return original_pages.order_by("id")
 
-def rebuild_all_progress() -> Dict[str, int]:
+
+def get_rebuild_checkpoints(name: str) -> QuerySet:
+    """
+    Get the checkpoints recorded under a rebuild name.
+
+    Includes the checkpoint of a single-process run (``name``) as well as
+    those of parallel workers (``name:<index>``).
+
+    Args:
+        name: Checkpoint name passed to ``rebuild_all_progress``
+
+    Returns:
+        QuerySet of RebuildCheckpoint objects
+    """
+    return RebuildCheckpoint.objects.filter(
+        Q(name=name) | Q(name__startswith=f"{name}:")
+    )
+
+
+def get_rebuild_scope(
+    since: Optional[datetime] = None,
+    stale_only: bool = False,
+    locale: Optional[Locale] = None,
+    root_page: Optional[Page] = None,
+    translation_key: Optional[Union[str, UUID]] = None,
+) -> Dict[str, Any]:
+    """
+    Describe the page filters of a rebuild, as stored on its checkpoints.
+
+    Args:
+        since: ``since`` passed to the rebuild
+        stale_only: ``stale_only`` passed to the rebuild
+        locale: ``locale`` passed to the rebuild
+        root_page: ``root_page`` passed to the rebuild
+        translation_key: ``translation_key`` passed to the rebuild
+
+    Returns:
+        dict with the JSON-serializable value of every filter that is set,
+        empty for a full rebuild
+    """
+    scope = {
+        "since": since.isoformat() if since is not None else None,
+        "stale_only": stale_only or None,
+        "locale": locale.language_code if locale is not None else None,
+        "root_page": root_page.pk if root_page is not None else None,
+        "translation_key": (
+            str(translation_key) if translation_key is not None else None
+        ),
+    }
+    return {name: value for name, value in scope.items() if value is not None}
+
+
+def _check_checkpoint_scope(
+    checkpoint: RebuildCheckpoint, scope: Dict[str, Any]
+) -> None:
+    """Refuse to reuse the checkpoint of a rebuild with other page filters."""
+    if checkpoint.scope != scope:
+        raise ValueError(
+            f"Checkpoint {checkpoint.name!r} belongs to an interrupted rebuild "
+            f"with other filters ({checkpoint.scope or 'none'}). Resume it with "
+            "the same filters, or use another checkpoint name."
+        )
+
+
+def _start_checkpoint(
+    name: str,
+    resume: bool,
+    min_page_id: Optional[int],
+    max_page_id: Optional[int],
+    scope: Dict[str, Any],
+) -> RebuildCheckpoint:
+    """Get the checkpoint to resume from, or start a new one."""
+    checkpoint = RebuildCheckpoint.objects.filter(name=name).first()
+    if checkpoint is not None:
+        _check_checkpoint_scope(checkpoint, scope)
+        if resume:
+            return checkpoint
+
+    checkpoint, _ = RebuildCheckpoint.objects.update_or_create(
+        name=name,
+        defaults={
+            "min_page_id": min_page_id,
+            "max_page_id": max_page_id,
+            "last_page_id": None,
+            "scope": scope,
+        },
+    )
+    return checkpoint
+
+
+def _iter_page_batches(page_ids: List[int], batch_size: int) -> Iterable[List[Page]]:
+    """
+    Load pages in batches with just the columns get_batch_progress needs.
+
+    Pages deleted since their ids were read are skipped, as are batches
+    that end up empty.
+    """
+    for start in range(0, len(page_ids), batch_size):
+        batch = list(
+            Page.objects.filter(id__in=page_ids[start : start + batch_size])
+            .only("id", "translation_key", "locale_id")
+            .order_by("id")
+        )
+        if batch:
+            yield batch
+
+
+def rebuild_all_progress(
+    batch_size: Optional[int] = None,
+    min_page_id: Optional[int] = None,
+    max_page_id: Optional[int] = None,
+    checkpoint: Optional[str] = None,
+    resume: bool = False,
+    since: Optional[datetime] = None,
+    stale_only: bool = False,
+    locale: Optional[Locale] = None,
+    root_page: Optional[Page] = None,
+    translation_key: Optional[Union[str, UUID]] = None,
+    progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, int]:
     """
     Rebuild translation progress for all pages.
 
@@ -135,11 +1287,52 @@ def rebuild_all_progress() -> Dict[str, int]:
     - After bulk imports
     - Fixing inconsistencies
 
+    Original pages are processed in batches using ``get_batch_progress``, so
+    the number of queries depends on the number of batches rather than on
+    pages x locales. The TranslationSourceLink index of each batch is
+    refreshed first. If a batch fails, its pages are retried one by one so
+    errors are reported per page. Only the ids of the selected pages are kept
+    for the whole run, so memory use stays bounded by the batch size.
+    Segments are counted by the REBUILD_PROGRESS_CALCULATOR, which defaults
+    to the PROGRESS_CALCULATOR.
+
+    When ``checkpoint`` is given, the id of the last original page of each
+    committed batch is stored in a RebuildCheckpoint with that name, in the
+    same transaction as the batch, along with the page filters of the run
+    (see ``get_rebuild_scope``). The checkpoint is removed once the run
+    completes; with ``resume=True`` an existing checkpoint is continued
+    instead of starting over. A checkpoint recorded with other page filters
+    is never resumed or replaced: ValueError is raised instead.
+
+    With ``since`` or ``stale_only``, only original pages whose inputs
+    changed are recalculated (see ``get_stale_original_pages``).
+    ``locale``, ``root_page`` and ``translation_key`` narrow the rebuild
+    further; with ``locale`` only the records of translations in that
+    locale are written.
+
+    Args:
+        batch_size: Number of original pages per batch
+            (default: the REBUILD_BATCH_SIZE setting)
+        min_page_id: Only rebuild original pages with an id >= this value
+        max_page_id: Only rebuild original pages with an id <= this value
+        checkpoint: Name to record progress under, to allow resuming
+        resume: Continue from the checkpoint instead of starting over. The
+            page range stored in the checkpoint takes precedence.
+        since: Only rebuild pages whose inputs changed after this time
+        stale_only: Only rebuild pages whose inputs changed after their
+            stored progress was calculated
+        locale: Only rebuild the progress of translations in this locale
+        root_page: Only rebuild pages with a version in this page's subtree
+        translation_key: Only rebuild the page with this translation key
+        progress_callback: Called once the pages are selected and after every
+            batch, with a report (see ``_new_rebuild_report``) of the run
+            so far
+
     Returns:
         dict with counts of processed pages and errors
 
     Example:
-        >>> stats = rebuild_all_progress()
+        >>> stats = rebuild_all_progress(checkpoint="nightly", resume=True)
         >>> print(f"Processed {stats['pages']} pages")
     """
     stats = {
@@ -149,19 +1342,555 @@ def rebuild_all_progress() -> Dict[str, int]:
 
     # Process pages
     if get_setting("TRACK_PAGES"):
-        original_pages = get_original_objects(Page)
+        batch_size = batch_size or get_setting("REBUILD_BATCH_SIZE")
+
+        checkpoint_record = None
+        if checkpoint:
+            checkpoint_record = _start_checkpoint(
+                checkpoint,
+                resume,
+                min_page_id,
+                max_page_id,
+                get_rebuild_scope(
+                    since, stale_only, locale, root_page, translation_key
+                ),
+            )
+            min_page_id = checkpoint_record.next_page_id
+            max_page_id = checkpoint_record.max_page_id
+
+        report = _new_rebuild_report()
+
+        def count_query(execute, sql, params, many, context):
+            report["queries"] += 1
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(count_query):
+            # Only hold the ids of every page; each batch loads just the columns
+            # get_batch_progress needs and is released before the next one.
+            mark = time.monotonic()
+            page_ids = list(
+                get_pages_to_rebuild(
+                    min_page_id,
+                    max_page_id,
+                    since,
+                    stale_only,
+                    locale,
+                    root_page,
+                    translation_key,
+                ).values_list("id", flat=True)
+            )
+            report["total"] = len(page_ids)
+            _add_timing(report, "select", mark)
+            if progress_callback:
+                progress_callback(report)
+            mark = time.monotonic()
+
+            calculator = get_progress_calculator("REBUILD_PROGRESS_CALCULATOR")
+            for batch in _iter_page_batches(page_ids, batch_size):
+                _rebuild_batch(
+                    batch,
+                    locale,
+                    checkpoint_record,
+                    stats,
+                    report,
+                    mark,
+                    calculator,
+                )
+                report["pages"] = stats["pages"]
+                report["errors"] = stats["errors"]
+                if progress_callback:
+                    progress_callback(report)
+                mark = time.monotonic()
+
+        # The run is complete, there is nothing left to resume
+        if checkpoint_record:
+            checkpoint_record.delete()
+
+    return stats
+
+
+def _new_rebuild_report() -> Dict[str, Any]:
+    """
+    Create the report passed to rebuild progress callbacks.
 
-        for page in original_pages:
+    The report holds the totals of the run so far: ``total`` pages selected,
+    ``pages`` processed, ``errors``, progress ``rows`` written, database
+    ``queries`` and the seconds spent per phase in ``timings``: selecting
+    the pages, loading and calculating batches, and writing them.
+    """
+    return {
+        "total": 0,
+        "pages": 0,
+        "errors": 0,
+        "rows": 0,
+        "queries": 0,
+        "timings": {"select": 0.0, "calculate": 0.0, "write": 0.0},
+    }
+
+
+def _add_timing(report: Dict[str, Any], phase: str, start: float) -> float:
+    """Add the time since ``start`` to a report phase and return the time now."""
+    now = time.monotonic()
+    report["timings"][phase] += now - start
+    return now
+
+
+def _rebuild_batch(
+    batch: List[Page],
+    locale: Optional[Locale],
+    checkpoint_record: Optional[RebuildCheckpoint],
+    stats: Dict[str, int],
+    report: Dict[str, Any],
+    mark: float,
+    calculator: Optional[BaseProgressCalculator] = None,
+) -> None:
+    """
+    Rebuild one batch of original pages for rebuild_all_progress.
+
+    If the batch fails, its pages are retried one by one so errors are
+    reported per page. The retries keep the locale scope. The records of
+    every page processed are marked as checked (see ``mark_progress_checked``)
+    with the time before their inputs were read.
+    """
+    locales = [locale] if locale is not None else None
+    try:
+        checked_at = timezone.now()
+        # Heal the source index before it is used
+        update_translation_source_links({page.translation_key for page in batch})
+        progress = get_batch_progress(
+            batch,
+            locales=locales,
+            with_counts=True,
+            calculator=calculator,
+        )
+        mark = _add_timing(report, "calculate", mark)
+        with transaction.atomic():
+            report["rows"] += save_batch_progress(progress)
+            mark_progress_checked([page.id for page in batch], checked_at, locale)
+            if checkpoint_record:
+                checkpoint_record.last_page_id = batch[-1].id
+                checkpoint_record.save()
+        _add_timing(report, "write", mark)
+        stats["pages"] += len(batch)
+    except Exception as e:
+        logger.exception(f"Error processing batch, retrying per page: {e}")
+        for page in batch:
             try:
-                create_translation_progress(page)
+                checked_at = timezone.now()
+                with transaction.atomic():
+                    save_batch_progress(
+                        get_batch_progress(
+                            [page],
+                            locales=locales,
+                            with_counts=True,
+                            calculator=calculator,
+                        )
+                    )
+                    mark_progress_checked([page.id], checked_at, locale)
                 stats["pages"] += 1
             except Exception as e:
                 logger.exception(f"Error processing page {page.id}: {e}")
                 stats["errors"] += 1
 
+        if checkpoint_record:
+            checkpoint_record.last_page_id = batch[-1].id
+            checkpoint_record.save()
+        _add_timing(report, "write", mark)
+
+
+def get_progress_drift(
+    batch_size: Optional[int] = None,
+    since: Optional[datetime] = None,
+    stale_only: bool = False,
+    locale: Optional[Locale] = None,
+    root_page: Optional[Page] = None,
+    translation_key: Optional[Union[str, UUID]] = None,
+) -> Dict[str, Any]:
+    """
+    Compare stored progress records with freshly calculated percentages.
+
+    Nothing is written, so this can be run against production to measure
+    how far the signal-driven updates have drifted before deciding whether
+    a full rebuild is needed. Pages are selected and processed in batches
+    exactly like ``rebuild_all_progress``.
+
+    Records are reported as:
+    - missing: a translation has no record yet
+    - stale: the stored percentage differs from the fresh one
+    - extra: a record no longer describes an original/translation pair.
+      Unscoped runs include every orphan ``clean_orphaned_progress`` would
+      delete.
+
+    Args:
+        batch_size: Number of original pages per batch
+            (default: the REBUILD_BATCH_SIZE setting)
+        since: Only compare pages whose inputs changed after this time
+        stale_only: Only compare pages whose inputs changed after their
+            stored progress was calculated
+        locale: Only compare the progress of translations in this locale
+        root_page: Only compare pages with a version in this page's subtree
+        translation_key: Only compare the page with this translation key
+
+    Returns:
+        dict with the number of compared pages, and lists of
+        ``(source_page_id, translated_page_id, ...)`` tuples:
+        ``missing`` with the fresh percentage, ``stale`` with the stored and
+        fresh percentages, and ``extra`` with the stored percentage
+
+    Example:
+        >>> drift = get_progress_drift()
+        >>> print(f"{len(drift['stale'])} stale records")
+    """
+    drift = {"pages": 0, "missing": [], "stale": [], "extra": []}
+    if not get_setting("TRACK_PAGES"):
+        return drift
+
+    calculator = get_progress_calculator("REBUILD_PROGRESS_CALCULATOR")
+    batch_size = batch_size or get_setting("REBUILD_BATCH_SIZE")
+    page_ids = list(
+        get_pages_to_rebuild(
+            since=since,
+            stale_only=stale_only,
+            locale=locale,
+            root_page=root_page,
+            translation_key=translation_key,
+        ).values_list("id", flat=True)
+    )
+
+    extra = {}
+    for batch in _iter_page_batches(page_ids, batch_size):
+        progress = get_batch_progress(
+            batch,
+            locales=[locale] if locale is not None else None,
+            calculator=calculator,
+        )
+
+        stored_records = TranslationProgress.objects.filter(
+            source_page_id__in=[page.id for page in batch]
+        )
+        if locale is not None:
+            stored_records = stored_records.filter(translated_page__locale=locale)
+        stored = {
+            (source_id, translated_id): percent
+            for source_id, translated_id, percent in stored_records.values_list(
+                "source_page_id", "translated_page_id", "percent_translated"
+            )
+        }
+
+        for key, percent in progress.items():
+            if key not in stored:
+                drift["missing"].append((*key, percent))
+            elif stored[key] != percent:
+                drift["stale"].append((*key, stored[key], percent))
+        for key, percent in stored.items():
+            if key not in progress:
+                extra[key] = percent
+
+        drift["pages"] += len(batch)
+
+    # Records of pages that are no longer originals are never selected above
+    if not any([since, stale_only, locale, root_page, translation_key]):
+        for source_id, translated_id, percent in _get_orphaned_progress().values_list(
+            "source_page_id", "translated_page_id", "percent_translated"
+        ):
+            extra[(source_id, translated_id)] = percent
+
+    drift["extra"] = [(*key, percent) for key, percent in sorted(extra.items())]
+    return drift
+
+
+def get_peak_memory_mb() -> Optional[float]:
+    """
+    Get the peak resident set size of this process and its finished children.
+
+    Children are included so the peak of ``rebuild_all_progress_parallel``
+    workers is reported too.
+
+    Returns:
+        float: Peak RSS in megabytes, or None where the ``resource`` module
+        is not available (Windows)
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def get_original_page_ranges(
+    parts: int, **page_filters: Any
+) -> List[Tuple[int, int, int]]:
+    """
+    Split the original pages into contiguous id ranges of similar size.
+
+    Args:
+        parts: Number of ranges to split the original pages into
+        **page_filters: Keyword arguments for ``get_pages_to_rebuild``
+
+    Returns:
+        list of (min_page_id, max_page_id, page_count) tuples, ordered by id
+    """
+    page_ids = list(get_pages_to_rebuild(**page_filters).values_list("id", flat=True))
+    if not page_ids:
+        return []
+
+    parts = max(1, min(parts, len(page_ids)))
+    chunk_size, remainder = divmod(len(page_ids), parts)
+
+    page_ranges = []
+    start = 0
+    for index in range(parts):
+        end = start + chunk_size + (1 if index < remainder else 0)
+        chunk = page_ids[start:end]
+        page_ranges.append((chunk[0], chunk[-1], len(chunk)))
+        start = end
+
+    return page_ranges
+
+
+def _get_worker_tasks(
+    workers: int,
+    checkpoint: Optional[str],
+    resume: bool,
+    page_filters: Dict[str, Any],
+) -> List[Tuple[Dict[str, Any], Optional[str], int]]:
+    """
+    Get the (page_filters, checkpoint, page_count) of each worker.
+
+    Worker checkpoints are created up front, so a worker that dies before
+    committing its first batch can still be resumed. Checkpoints recorded
+    with other page filters raise ValueError.
+    """
+    scope = get_rebuild_scope(**page_filters)
+    if checkpoint:
+        for existing in get_rebuild_checkpoints(checkpoint):
+            _check_checkpoint_scope(existing, scope)
+
+    min_page_id = max_page_id = None
+    if checkpoint and resume:
+        worker_checkpoints = RebuildCheckpoint.objects.filter(
+            name__startswith=f"{checkpoint}:"
+        )
+        if worker_checkpoints:
+            tasks = []
+            for worker_checkpoint in worker_checkpoints:
+                worker_filters = {
+                    **page_filters,
+                    "min_page_id": worker_checkpoint.next_page_id,
+                    "max_page_id": worker_checkpoint.max_page_id,
+                }
+                page_count = get_pages_to_rebuild(**worker_filters).count()
+                tasks.append((worker_filters, worker_checkpoint.name, page_count))
+            return tasks
+
+        # Split what is left of an interrupted single-process run
+        single_checkpoint = RebuildCheckpoint.objects.filter(name=checkpoint).first()
+        if single_checkpoint:
+            min_page_id = single_checkpoint.next_page_id
+            max_page_id = single_checkpoint.max_page_id
+
+    page_ranges = get_original_page_ranges(
+        workers, min_page_id=min_page_id, max_page_id=max_page_id, **page_filters
+    )
+    tasks = [
+        (
+            {**page_filters, "min_page_id": min_page_id, "max_page_id": max_page_id},
+            f"{checkpoint}:{index}" if checkpoint else None,
+            page_count,
+        )
+        for index, (min_page_id, max_page_id, page_count) in enumerate(page_ranges)
+    ]
+
+    if checkpoint:
+        get_rebuild_checkpoints(checkpoint).delete()
+        RebuildCheckpoint.objects.bulk_create(
+            [
+                RebuildCheckpoint(
+                    name=worker_checkpoint,
+                    min_page_id=worker_filters["min_page_id"],
+                    max_page_id=worker_filters["max_page_id"],
+                    scope=scope,
+                )
+                for worker_filters, worker_checkpoint, _ in tasks
+            ]
+        )
+
+    return tasks
+
+
+def rebuild_all_progress_parallel(
+    workers: int,
+    batch_size: Optional[int] = None,
+    checkpoint: Optional[str] = None,
+    resume: bool = False,
+    since: Optional[datetime] = None,
+    stale_only: bool = False,
+    locale: Optional[Locale] = None,
+    root_page: Optional[Page] = None,
+    translation_key: Optional[Union[str, UUID]] = None,
+    progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, int]:
+    """
+    Rebuild translation progress for all pages using a pool of processes.
+
+    Original pages are split into one id range per worker. Each worker opens
+    its own database connection and runs ``rebuild_all_progress`` for its
+    range; the returned stats are merged.
+
+    With ``checkpoint``, each range records its progress in a checkpoint
+    named ``<checkpoint>:<index>``. With ``resume=True`` the unfinished
+    ranges of a previous parallel run are continued. As with
+    ``rebuild_all_progress``, checkpoints recorded with other page filters
+    raise ValueError.
+
+    Args:
+        workers: Number of worker processes
+        batch_size: Number of original pages per batch in each worker
+        checkpoint: Name to record progress under, to allow resuming
+        resume: Continue the unfinished ranges instead of starting over
+        since: Only rebuild pages whose inputs changed after this time
+        stale_only: Only rebuild pages whose inputs changed after their
+            stored progress was calculated
+        locale: Only rebuild the progress of translations in this locale
+        root_page: Only rebuild pages with a version in this page's subtree
+        translation_key: Only rebuild the page with this translation key
+        progress_callback: Called each time a worker finishes, with the
+            merged report of the finished workers. Timings are summed over
+            workers, so they can exceed the wall-clock time.
+
+    Returns:
+        dict with counts of processed pages and errors
+
+    Example:
+        >>> stats = rebuild_all_progress_parallel(workers=4)
+        >>> print(f"Processed {stats['pages']} pages")
+    """
+    stats = {
+        "pages": 0,
+        "errors": 0,
+    }
+
+    if not get_setting("TRACK_PAGES"):
+        return stats
+
+    page_filters = {
+        "since": since,
+        "stale_only": stale_only,
+        "locale": locale,
+        "root_page": root_page,
+        "translation_key": translation_key,
+    }
+    tasks = _get_worker_tasks(workers, checkpoint, resume, page_filters)
+    if not tasks:
+        return stats
+
+    # Connections must not be shared with forked children
+    connections.close_all()
+
+    report = _new_rebuild_report()
+    report["total"] = sum(page_count for _, _, page_count in tasks)
+
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(tasks)), initializer=init_rebuild_worker
+    ) as executor:
+        futures = {
+            executor.submit(
+                rebuild_worker, batch_size, worker_checkpoint, worker_filters
+            ): (worker_filters, page_count)
+            for worker_filters, worker_checkpoint, page_count in tasks
+        }
+
+        for future in as_completed(futures):
+            worker_filters, page_count = futures[future]
+            try:
+                worker_stats = future.result()
+            except Exception as e:
+                logger.exception(
+                    f"Error rebuilding pages {worker_filters['min_page_id']}-"
+                    f"{worker_filters['max_page_id']}: {e}"
+                )
+                stats["errors"] += page_count
+            else:
+                for key in stats:
+                    stats[key] += worker_stats.get(key, 0)
+
+                worker_report = worker_stats.get("report")
+                if worker_report:
+                    report["rows"] += worker_report["rows"]
+                    report["queries"] += worker_report["queries"]
+                    for phase, seconds in worker_report["timings"].items():
+                        report["timings"][phase] += seconds
+
+            report["pages"] = stats["pages"]
+            report["errors"] = stats["errors"]
+            if progress_callback:
+                progress_callback(report)
+
     return stats
 
 
+def _get_orphaned_progress() -> QuerySet:
+    """Get the progress records clean_orphaned_progress would delete."""
+    return TranslationProgress.objects.filter(
+        ~Q(translated_page__translation_key=F("source_page__translation_key"))
+        | ~Q(source_page_id__in=get_original_objects(Page).values("id"))
+        | Q(translated_page_id=F("source_page_id"))
+    )
+
+
+def clean_orphaned_progress(chunk_size: int = 1000) -> int:
+    """
+    Delete progress records that no longer describe an original/translation pair.
+
+    A record is orphaned when:
+    - its translated page no longer shares the source page's translation_key
+    - its source page is no longer the original (min id per translation_key)
+    - its source and translated page are the same page
+
+    Orphans are deleted in chunks of ``chunk_size`` ids, each chunk in its
+    own short DELETE, so the table is never locked for long. Each chunk is
+    selected after the last id of the previous one, so every record is only
+    examined once.
+
+    Args:
+        chunk_size: Maximum number of records deleted per statement
+
+    Returns:
+        int: Number of records deleted
+
+    Example:
+        >>> deleted = clean_orphaned_progress()
+        >>> print(f"Deleted {deleted} orphaned records")
+    """
+    orphans = _get_orphaned_progress()
+
+    deleted = 0
+    last_id = 0
+    while True:
+        orphan_ids = list(
+            orphans.filter(id__gt=last_id)
+            .order_by("id")
+            .values_list("id", flat=True)[:chunk_size]
+        )
+        if not orphan_ids:
+            break
+
+        TranslationProgress.objects.filter(id__in=orphan_ids).delete()
+        deleted += len(orphan_ids)
+        last_id = orphan_ids[-1]
+
+    return deleted
+
+
 def get_original_objects(model: type[Model]) -> QuerySet:
     """
     Get original objects for a model (min ID per translation_key).
@@ -172,11 +1901,10 @@ def get_original_objects(model: type[Model]) -> QuerySet:
     Returns:
         QuerySet of original objects
     """
-    all_objects = model.objects.all()
-
-    # For Pages, filter out root pages (depth <= 2)
     if issubclass(model, Page):
-        all_objects = all_objects.filter(depth__gt=2)
+        return model.objects.filter(id__in=_get_original_page_ids())
+
+    all_objects = model.objects.all()
 
     if not hasattr(model, "translation_key"):
         return all_objects
@@ -190,3 +1918,32 @@ def get_original_objects(model: type[Model]) -> QuerySet:
     )
 
     return model.objects.filter(id__in=original_ids)
+
+
+def _get_original_page_ids(
+    translation_keys: Optional[Iterable[object]] = None,
+) -> QuerySet:
+    """
+    Get the ids of the original pages (min ID per translation_key).
+
+    This is the one definition of an original page used by the signal
+    handlers, rebuilds and the drift and orphan checks. Only pages below the
+    locale root pages are tracked, so the home pages, and the aliases of them
+    wagtail-localize creates in every locale, never have progress records.
+
+    Args:
+        translation_keys: Only get the original pages of these keys
+
+    Returns:
+        QuerySet of ids, to filter pages with
+    """
+    pages = Page.objects.filter(depth__gt=LOCALE_ROOT_DEPTH)
+    if translation_keys is not None:
+        pages = pages.filter(translation_key__in=translation_keys)
+
+    return (
+        pages.order_by()
+        .values("translation_key")
+        .annotate(min_id=Min("id"))
+        .values("min_id")
+    )
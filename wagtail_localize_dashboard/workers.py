@@ -0,0 +1,50 @@
+"""
+Worker process entrypoints for ``rebuild_all_progress_parallel``.
+
+Processes started with the "spawn" or "forkserver" start methods import this
+module before Django is configured, to unpickle the functions they run. It
+must therefore not import any models at the top level; they are imported
+once ``init_rebuild_worker`` has set Django up.
+"""
+
+from typing import Any, Dict, Optional
+
+from django.db import connections
+
+
+def init_rebuild_worker() -> None:
+    """Prepare a worker process started by ``rebuild_all_progress_parallel``."""
+    import django
+    from django.apps import apps
+
+    # Processes started with "spawn" or "forkserver" need Django configured again
+    if not apps.ready:
+        django.setup()
+
+    # Never reuse a connection inherited from the parent process
+    connections.close_all()
+
+
+def rebuild_worker(
+    batch_size: Optional[int], checkpoint: Optional[str], page_filters: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Rebuild one range of original pages inside a worker process.
+
+    The final report of the range is returned with the stats, under
+    ``report``.
+    """
+    from .utils import rebuild_all_progress
+
+    reports = []
+    try:
+        stats = rebuild_all_progress(
+            batch_size=batch_size,
+            checkpoint=checkpoint,
+            resume=True,
+            progress_callback=reports.append,
+            **page_filters,
+        )
+        return {**stats, "report": reports[-1] if reports else None}
+    finally:
+        connections.close_all()